@@ -0,0 +1,135 @@
+# evaluation/benchmark_agent_tools.py
+"""
+ReAct 에이전트 툴 방식 비교
+- synthesis: QueryEngineTool, 툴마다 gpt-4o-mini 요약
+- retrieval: 청크 원문 반환
+
+평가 데이터셋 질문마다 라우팅 + 병렬 검색을 한 뒤, 결과 충분성과 관계없이 ReAct 정보 수집(agent.chat)을
+툴 방식별로 실행해
+- 에이전트 경로 LLM 호출 수 (ReAct 추론 + 툴 내부 요약)
+- 툴 호출 수 (multi_search는 1회로 계산)
+- 정보 수집 지연 (p50, 평균)
+- 수집 결과 길이 (최종 답변 프롬프트에 들어갈 Agent 정보)
+를 출력한다. Qdrant + OPENAI_API_KEY가 필요하다.
+
+사용법:
+    python -m evaluation.benchmark_agent_tools
+    python -m evaluation.benchmark_agent_tools --limit 5
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+from llama_index.core import Settings  # noqa: E402
+from llama_index.core.callbacks import (  # noqa: E402
+    CallbackManager,
+    CBEventType,
+    LlamaDebugHandler,
+)
+
+from evaluation.test_dataset import get_dataset  # noqa: E402
+from utils.agent import FDAAgent  # noqa: E402
+from utils.engine import FDAEngine  # noqa: E402
+from utils.orchestrator import SimpleOrchestrator  # noqa: E402
+from utils.tools import create_fda_tools  # noqa: E402
+
+MODES = ("synthesis", "retrieval")
+
+
+def _run_mode(
+    mode: str, dataset: list, orchestrator: SimpleOrchestrator, debug: LlamaDebugHandler
+) -> list:
+    engine = FDAEngine(
+        use_answer_cache=False,
+        use_llm_cache=False,
+        fallback_mode="react",
+        orchestrator=orchestrator,
+        tools=create_fda_tools(orchestrator, mode=mode),
+    )
+    rows = []
+    for case in dataset:
+        agent = FDAAgent(engine=engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            route = agent._route_query(case["question"])
+            ranked = orchestrator.merge_and_rank(
+                orchestrator.parallel_search(
+                    route["search_query"], route["collections"], route["decomposition"]
+                )
+            )
+            debug.flush_event_logs()
+            start = time.perf_counter()
+            response = agent.agent.chat(
+                agent._build_agent_query(case["question"], route, ranked)
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        rows.append(
+            {
+                "id": case["id"],
+                "agent_ms": elapsed_ms,
+                "llm_calls": len(debug.get_event_pairs(CBEventType.LLM)),
+                "tool_calls": len(response.sources),
+                "info_chars": len(str(response)),
+            }
+        )
+        print(
+            f"  [{mode}] {case['id']}: {elapsed_ms:,.0f}ms, LLM "
+            f"{rows[-1]['llm_calls']}회, "
+            f"툴 {rows[-1]['tool_calls']}회"
+        )
+    engine.executor.shutdown(wait=True)  # 오케스트레이터는 두 방식이 공유 (run_benchmark에서 정리)
+    return rows
+
+
+def run_benchmark(limit: int = None):
+    dataset = get_dataset()[:limit] if limit else get_dataset()
+
+    # 툴 내부 요약 LLM까지 세려면 엔진/툴 생성 전에 전역 콜백을 설정해야 함
+    debug = LlamaDebugHandler(print_trace_on_end=False)
+    Settings.callback_manager = CallbackManager([debug])
+    orchestrator = SimpleOrchestrator()
+
+    print("=" * 90)
+    print(f"🛠️ ReAct 툴 방식 비교 ({len(dataset)}개 질문): synthesis vs retrieval")
+    print("=" * 90)
+    results = {mode: _run_mode(mode, dataset, orchestrator, debug) for mode in MODES}
+
+    print("\n" + "-" * 90)
+    print(
+        f"{'mode':>10} {'LLM 호출':>9} {'툴 호출':>8} {'p50(ms)':>9} {'평균(ms)':>10} "
+        f"{'정보 길이':>10}"
+    )
+    for mode, rows in results.items():
+        agent_ms = [r["agent_ms"] for r in rows]
+        print(
+            f"{mode:>10} {statistics.mean(r['llm_calls'] for r in rows):>9.1f} "
+            f"{statistics.mean(r['tool_calls'] for r in rows):>8.1f} "
+            f"{statistics.median(agent_ms):>9.0f} {statistics.mean(agent_ms):>10.0f} "
+            f"{statistics.mean(r['info_chars'] for r in rows):>10.0f}"
+        )
+
+    before = statistics.mean(r["llm_calls"] for r in results["synthesis"])
+    after = statistics.mean(r["llm_calls"] for r in results["retrieval"])
+    if before:
+        print(
+            f"\n⚡ 질문당 에이전트 LLM 호출: {before:.1f} → {after:.1f} "
+            f"({1 - after / before:.0%} 감소)"
+        )
+    print("=" * 90)
+    orchestrator.close()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ReAct 툴 방식 비교 (요약 vs 검색 청크)")
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N개 질문만 실행")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.limit)
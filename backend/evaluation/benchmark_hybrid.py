@@ -0,0 +1,165 @@
+# evaluation/benchmark_hybrid.py
+"""
+밀집 검색 vs 하이브리드(BM25 + 밀집, RRF) 검색 비교
+
+라우팅 데이터셋(get_routing_dataset) 질문을 같은 QdrantService로
+- dense: FDA_RETRIEVAL_MODE=dense (기존)
+- hybrid: FDA_RETRIEVAL_MODE=hybrid
+두 방식으로 검색해 merge_and_rank → _is_parallel_result_sufficient 결과를 비교한다.
+충분성 평가에 실패한 질문은 실제 서버에서 ReAct 에이전트로 폴백되므로
+(1 - 통과율)이 ReAct 폴백률이다.
+
+- 검색 쿼리: 질문 원문 (LLM 보강 없이)
+- 컬렉션: expected_collections, 없으면 규칙 라우터 결과, 그것도 없으면 기본 컬렉션
+- BM25 인덱스는 측정 전에 동기로 생성 (생성 시간 별도 출력)
+
+사용법:
+    python -m evaluation.benchmark_hybrid            # Qdrant + OPENAI_API_KEY 필요
+    python -m evaluation.benchmark_hybrid --verbose  # 질문별 결과
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+from evaluation.stubs import make_stub_engine  # noqa: E402
+from evaluation.test_dataset import get_routing_dataset  # noqa: E402
+from utils.agent import FDAAgent  # noqa: E402
+from utils.bm25_index import identifier_tokens  # noqa: E402
+from utils.fast_router import FastRouter  # noqa: E402
+from utils.orchestrator import SimpleOrchestrator  # noqa: E402
+from utils.qdrant_client import QdrantService  # noqa: E402
+
+
+def _collections(case: dict, router: FastRouter) -> list:
+    if case["expected_collections"]:
+        return case["expected_collections"]
+    analysis = router.route(case["question"])
+    if analysis and analysis.collections:
+        return analysis.collections
+    return FDAAgent.default_collections
+
+
+def _run(
+    orchestrator: SimpleOrchestrator, judge: FDAAgent, question: str, collections: list
+) -> dict:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = orchestrator.merge_and_rank(
+            orchestrator.parallel_search(question, collections)
+        )
+        sufficient = judge._is_parallel_result_sufficient(results, {})
+    return {
+        "sufficient": sufficient,
+        "results": len(results),
+        "exact": sum(1 for r in results if r.get("exact_match")),
+        "bm25_only": sum(1 for r in results if r.get("retrieval") == "bm25"),
+        "latency_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def run_benchmark(verbose: bool = False):
+    dataset = get_routing_dataset()
+    router = FastRouter()
+    # 충분성 평가만 사용하므로 네트워크 호출 없는 스텁 엔진의 에이전트로 판정
+    judge = FDAAgent(engine=make_stub_engine())
+
+    service = QdrantService()
+    dense = SimpleOrchestrator(qdrant_service=service, retrieval_mode="dense")
+    hybrid = SimpleOrchestrator(qdrant_service=service, retrieval_mode="hybrid")
+
+    cases = [(case, _collections(case, router)) for case in dataset]
+    needed = sorted({c for _, collections in cases for c in collections})
+
+    print("=" * 100)
+    print(f"🔀 밀집 vs 하이브리드 검색 비교 ({len(cases)}개 질문, 컬렉션 {needed})")
+    print("=" * 100)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for collection in needed:
+            hybrid.bm25.build(collection)
+    stats = hybrid.bm25.stats()
+    print(
+        f"📇 BM25 인덱스 생성: {sum(s['docs'] for s in stats.values())}개 문서, "
+        f"{time.perf_counter() - start:.1f}초"
+    )
+
+    rows = []
+    for case, collections in cases:
+        rows.append(
+            {
+                "case": case,
+                "identifiers": identifier_tokens(case["question"]),
+                "dense": _run(dense, judge, case["question"], collections),
+                "hybrid": _run(hybrid, judge, case["question"], collections),
+            }
+        )
+
+    if verbose:
+        print(
+            f"\n{'id':<15} {'dense':<7} {'hybrid':<7} {'exact':>5} {'bm25':>5}  "
+            "identifiers"
+        )
+        for row in rows:
+            d, h = row["dense"], row["hybrid"]
+            print(
+                f"{row['case']['id']:<15} {'✅' if d['sufficient'] else '❌':<7} "
+                f"{'✅' if h['sufficient'] else '❌':<7} "
+                f"{h['exact']:>5} {h['bm25_only']:>5}  {row['identifiers']}"
+            )
+
+    print("\n" + "-" * 100)
+    print(
+        f"{'mode':>8} {'통과율':>8} {'ReAct 폴백률':>12} {'평균 결과 수':>12} {'지연 p50(ms)':>13}"
+    )
+    for mode in ("dense", "hybrid"):
+        passed = sum(1 for r in rows if r[mode]["sufficient"])
+        print(
+            f"{mode:>8} {passed / len(rows):>8.0%} {1 - passed / len(rows):>12.0%} "
+            f"{statistics.mean(r[mode]['results'] for r in rows):>12.1f} "
+            f"{statistics.median(r[mode]['latency_ms'] for r in rows):>13.0f}"
+        )
+
+    with_ids = [r for r in rows if r["identifiers"]]
+    if with_ids:
+        dense_pass = sum(1 for r in with_ids if r["dense"]["sufficient"])
+        hybrid_pass = sum(1 for r in with_ids if r["hybrid"]["sufficient"])
+        print(
+            f"\n🔢 식별자 포함 질문 {len(with_ids)}개: 통과 dense {dense_pass} → hybrid "
+            f"{hybrid_pass}"
+        )
+    rescued = [
+        r["case"]["id"]
+        for r in rows
+        if r["hybrid"]["sufficient"] and not r["dense"]["sufficient"]
+    ]
+    lost = [
+        r["case"]["id"]
+        for r in rows
+        if r["dense"]["sufficient"] and not r["hybrid"]["sufficient"]
+    ]
+    print(f"🛟 하이브리드로 폴백을 피한 질문: {rescued or '-'}")
+    if lost:
+        print(f"⚠️ 하이브리드에서만 실패한 질문: {lost}")
+    print("=" * 100)
+
+    dense.close()
+    hybrid.close()
+    judge.engine.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="밀집 vs 하이브리드 검색 비교")
+    parser.add_argument("--verbose", action="store_true", help="질문별 결과 출력")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.verbose)
@@ -0,0 +1,164 @@
+# evaluation/benchmark_request_overhead.py
+"""
+요청당 오케스트레이터 오버헤드 벤치마크
+
+로컬 HTTP 서버가 Qdrant REST 응답(search/batch)을 흉내 내고,
+쿼리 임베딩은 임베딩 캐시에 미리 넣어 OpenAI 호출 없이 아래 두 방식을 비교한다.
+
+- before: 요청마다 SimpleOrchestrator() 생성 (새 QdrantService, 새 HTTP 커넥션, 새 스레드 풀)
+- after: 엔진이 가진 오케스트레이터 하나를 재사용 (keep-alive 커넥션 풀)
+
+사용법:
+    python -m evaluation.benchmark_request_overhead --requests 200
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append("..")
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+COLLECTIONS = ["ecfr", "fsvp", "guidance"]
+QUERY = (
+    "FSVP requirements\n\nEnhanced search query: foreign supplier verification importer"
+)
+
+
+class _FakeQdrantHandler(BaseHTTPRequestHandler):
+    """Qdrant REST API 중 벤치마크에 필요한 부분만 응답 (keep-alive 지원)"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK 대기 방지
+    connections = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: dict):
+        _FakeQdrantHandler.connections.add(self.client_address)
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._send({"title": "qdrant - vector search engine", "version": "1.15.1"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        requests = json.loads(self.rfile.read(length) or b"{}").get("searches", [{}])
+        points = [
+            {
+                "id": i,
+                "version": 0,
+                "score": 0.8 - i * 0.02,
+                "payload": {"text": f"doc {i}", "title": f"doc {i}"},
+            }
+            for i in range(5)
+        ]
+        self._send(
+            {"result": [points for _ in requests], "status": "ok", "time": 0.0001}
+        )
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeQdrantHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _prefill_embeddings(orchestrator):
+    """컬렉션별 쿼리 임베딩을 캐시에 넣어 OpenAI 호출을 없앰"""
+    from utils.embedding_cache import get_embedding_cache
+    from utils.qdrant_client import EMBEDDING_MODEL
+
+    queries = orchestrator._generate_optimized_queries(COLLECTIONS, None, QUERY)
+    get_embedding_cache().put_many(
+        EMBEDDING_MODEL, {q: [0.1] * 1536 for q in queries.values()}
+    )
+
+
+def _run(label: str, search, requests: int) -> dict:
+    samples = []
+    _FakeQdrantHandler.connections = set()
+    for _ in range(requests):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = search()
+        samples.append((time.perf_counter() - start) * 1000)
+        assert all(result["results_by_collection"][c] for c in COLLECTIONS), "검색 결과 없음"
+    return {
+        "label": label,
+        "p50": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "max": max(samples),
+        "connections": len(_FakeQdrantHandler.connections),
+    }
+
+
+def run_benchmark(requests: int):
+    server = _start_server()
+    os.environ["QDRANT_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.pop("QDRANT_API_KEY", None)
+
+    from utils.orchestrator import SimpleOrchestrator
+
+    shared = SimpleOrchestrator()
+    _prefill_embeddings(shared)
+
+    def before():
+        # 이전 방식: 요청마다 오케스트레이터 생성 (스레드 풀은 __del__에서만 정리)
+        orchestrator = SimpleOrchestrator()
+        return orchestrator.parallel_search(QUERY, COLLECTIONS)
+
+    def after():
+        return shared.parallel_search(QUERY, COLLECTIONS)
+
+    print("=" * 80)
+    print(f"🧪 요청당 오케스트레이터 오버헤드 ({requests}회, 컬렉션 {len(COLLECTIONS)}개, 로컬 가짜 Qdrant)")
+    print("=" * 80)
+
+    results = [_run("before", before, requests)]
+    gc.collect()
+    results.append(_run("after", after, requests))
+
+    print(
+        f"{'mode':>8} {'p50(ms)':>9} {'mean(ms)':>9} {'max(ms)':>9} {'TCP conns':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['label']:>8} {r['p50']:>9.2f} {r['mean']:>9.2f} {r['max']:>9.2f} "
+            f"{r['connections']:>10}"
+        )
+    print(
+        f"\n📈 요청당 오버헤드 감소: {results[0]['mean'] - results[1]['mean']:.2f}ms "
+        f"(x{results[0]['mean'] / results[1]['mean']:.1f})"
+    )
+    print("=" * 80)
+
+    shared.close()
+    server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="요청당 오케스트레이터 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=200, help="방식별 요청 수")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.requests)
@@ -0,0 +1,129 @@
+# evaluation/benchmark_rerank.py
+"""
+CrossEncoder 재순위화 벤치마크
+
+라우팅 데이터셋 질문을 실제 Qdrant에서 검색(merge_and_rank)한 뒤 재순위화해
+- 답변 프롬프트로 보내는 문서 수 / 문자 수 (재순위화 전 → 후)
+- 재순위화 지연 (첫 계산, 캐시 히트)
+- 재순위화 후에도 기대 컬렉션 문서가 남아 있는 비율
+을 출력한다. sentence-transformers와 Qdrant, OPENAI_API_KEY(질문 임베딩)가 필요하다.
+
+사용법:
+    python -m evaluation.benchmark_rerank
+    python -m evaluation.benchmark_rerank --top-k 4 --budget-ms 1500
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+from evaluation.test_dataset import get_routing_dataset  # noqa: E402
+from utils.agent import FDAAgent  # noqa: E402
+from utils.orchestrator import SimpleOrchestrator  # noqa: E402
+from utils.reranker import CrossEncoderReranker  # noqa: E402
+
+
+def _percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _coverage(case: dict, results: list) -> float:
+    expected = case["expected_collections"]
+    if not expected:
+        return 1.0
+    return len(set(expected) & {r["collection"] for r in results}) / len(expected)
+
+
+def run_benchmark(model_name: str = None, top_k: int = None, budget_ms: float = None):
+    reranker = CrossEncoderReranker(
+        model_name=model_name, top_k=top_k, budget_ms=budget_ms
+    )
+    start = time.perf_counter()
+    reranker._load()
+    if not reranker.ready:
+        print("❌ 재순위화 모델을 로드할 수 없습니다 (sentence-transformers 설치 확인)")
+        return None
+    print(f"🎯 모델 로드: {reranker.model_name} ({time.perf_counter() - start:.1f}초)")
+
+    orchestrator = SimpleOrchestrator()
+    rows = []
+    for case in get_routing_dataset():
+        collections = case["expected_collections"] or FDAAgent.default_collections
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = orchestrator.merge_and_rank(
+                orchestrator.parallel_search(case["question"], collections)
+            )
+            if len(results) <= 1:
+                continue
+            first = time.perf_counter()
+            reranked = reranker.rerank(case["question"], results)
+            first_ms = (time.perf_counter() - first) * 1000
+            cached = time.perf_counter()
+            reranker.rerank(case["question"], results)
+            cached_ms = (time.perf_counter() - cached) * 1000
+        rows.append(
+            {
+                "docs": (len(results), len(reranked)),
+                "chars": (
+                    sum(len(r["text"]) for r in results),
+                    sum(len(r["text"]) for r in reranked),
+                ),
+                "coverage": (_coverage(case, results), _coverage(case, reranked)),
+                "first_ms": first_ms,
+                "cached_ms": cached_ms,
+            }
+        )
+    orchestrator.close()
+
+    print("=" * 80)
+    print(
+        f"🎯 재순위화 벤치마크 ({len(rows)}개 질문, top_k={reranker.top_k}, 후보 "
+        f"{reranker.candidates}개, "
+        f"예산 {reranker.budget_ms:.0f}ms)"
+    )
+    print("=" * 80)
+    docs_before = statistics.mean(r["docs"][0] for r in rows)
+    docs_after = statistics.mean(r["docs"][1] for r in rows)
+    chars_before = statistics.mean(r["chars"][0] for r in rows)
+    chars_after = statistics.mean(r["chars"][1] for r in rows)
+    print(f"📄 문서 수: {docs_before:.1f} → {docs_after:.1f}")
+    print(
+        f"✂️ 프롬프트 문서 문자 수: {chars_before:,.0f} → {chars_after:,.0f} "
+        f"({1 - chars_after / chars_before:.0%} 감소)"
+    )
+    print(
+        f"📚 기대 컬렉션 포함률: {statistics.mean(r['coverage'][0] for r in rows):.2f} → "
+        f"{statistics.mean(r['coverage'][1] for r in rows):.2f}"
+    )
+    first = [r["first_ms"] for r in rows]
+    cached = [r["cached_ms"] for r in rows]
+    print(
+        f"⏱️ 재순위화 지연: p50 {statistics.median(first):.0f}ms, p95 "
+        f"{_percentile(first, 0.95):.0f}ms "
+        f"(캐시 히트 p50 {statistics.median(cached):.1f}ms)"
+    )
+    stats = reranker.stats()
+    print(f"   예산 초과로 원래 순서 사용: {stats['over_budget']}회")
+    print("=" * 80)
+    reranker.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CrossEncoder 재순위화 벤치마크")
+    parser.add_argument(
+        "--model", default=None, help="CrossEncoder 모델 (기본: FDA_RERANK_MODEL)"
+    )
+    parser.add_argument("--top-k", type=int, default=None, help="재순위화 후 남길 문서 수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="재순위화 지연 예산(ms)")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.model, args.top_k, args.budget_ms)
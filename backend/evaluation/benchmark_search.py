@@ -0,0 +1,208 @@
+# evaluation/benchmark_search.py
+"""
+다중 컬렉션 검색 방식 벤치마크 (로컬 in-memory Qdrant)
+
+OpenAI 임베딩 없이 무작위 벡터로 컬렉션을 채우고,
+같은 쿼리 벡터로 아래 방식들의 검색 시간을 비교한다.
+
+- legacy: 컬렉션마다 스레드 + 새 이벤트 루프에서 동기 search (이전 오케스트레이터)
+- sequential: 컬렉션을 순서대로 search (이전 search_multiple_collections)
+- threads: 스레드 풀에서 컬렉션별 search (FDA_SEARCH_MODE=threads)
+- batch: 스레드 풀에서 컬렉션별 search_batch (FDA_SEARCH_MODE=batch, 동기 chat)
+- async: AsyncQdrantClient search_batch + asyncio.gather (achat)
+
+사용법:
+    python -m evaluation.benchmark_search --points 2000 --rounds 50
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+from qdrant_client import AsyncQdrantClient, QdrantClient  # noqa: E402
+from qdrant_client.models import Distance, PointStruct, VectorParams  # noqa: E402
+
+from utils.orchestrator import SimpleOrchestrator  # noqa: E402
+from utils.qdrant_client import QdrantService  # noqa: E402
+
+COLLECTIONS = ["dwpe", "ecfr", "fsvp", "gras", "guidance", "usc"]
+
+
+def _random_vector(rng: random.Random, dim: int):
+    return [rng.random() - 0.5 for _ in range(dim)]
+
+
+def _populate(client, points: int, dim: int, seed: int):
+    rng = random.Random(seed)
+    for collection in COLLECTIONS:
+        client.create_collection(
+            collection, vectors_config=VectorParams(size=dim, distance=Distance.COSINE)
+        )
+        client.upsert(
+            collection,
+            points=[
+                PointStruct(
+                    id=i,
+                    vector=_random_vector(rng, dim),
+                    payload={"text": f"{collection} doc {i}"},
+                )
+                for i in range(points)
+            ],
+        )
+
+
+async def _apopulate(client, points: int, dim: int, seed: int):
+    rng = random.Random(seed)
+    for collection in COLLECTIONS:
+        await client.create_collection(
+            collection, vectors_config=VectorParams(size=dim, distance=Distance.COSINE)
+        )
+        await client.upsert(
+            collection,
+            points=[
+                PointStruct(
+                    id=i,
+                    vector=_random_vector(rng, dim),
+                    payload={"text": f"{collection} doc {i}"},
+                )
+                for i in range(points)
+            ],
+        )
+
+
+def _legacy(service: QdrantService, orchestrator: SimpleOrchestrator, vectors: dict):
+    """이전 방식: 스레드마다 이벤트 루프를 만들어 검색 코루틴 실행"""
+
+    async def search(collection):
+        return service.qdrant_client.search(
+            collection_name=collection, query_vector=vectors[collection], limit=5
+        )
+
+    def run_in_new_loop(collection):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(search(collection))
+        finally:
+            loop.close()
+
+    futures = [orchestrator.executor.submit(run_in_new_loop, c) for c in COLLECTIONS]
+    return [f.result() for f in futures]
+
+
+def _sequential(service: QdrantService, vectors: dict):
+    return [service.search_collection(c, "", 5, vectors[c]) for c in COLLECTIONS]
+
+
+def _threads(service: QdrantService, orchestrator: SimpleOrchestrator, vectors: dict):
+    futures = [
+        orchestrator.executor.submit(service.search_collection, c, "", 5, vectors[c])
+        for c in COLLECTIONS
+    ]
+    return [f.result() for f in futures]
+
+
+def _batch(service: QdrantService, orchestrator: SimpleOrchestrator, vectors: dict):
+    futures = [
+        orchestrator.executor.submit(service.search_batch, c, [vectors[c]], 5)
+        for c in COLLECTIONS
+    ]
+    return [f.result()[0] for f in futures]
+
+
+async def _async(service: QdrantService, vectors: dict):
+    batches = await asyncio.gather(
+        *[service.asearch_batch(c, [vectors[c]], 5) for c in COLLECTIONS]
+    )
+    return [b[0] for b in batches]
+
+
+def _measure(fn, rounds: int):
+    fn()  # 워밍업
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_benchmark(points: int, dim: int, rounds: int, seed: int = 42):
+    print("=" * 80)
+    print(
+        f"🧪 다중 컬렉션 검색 벤치마크 (in-memory Qdrant, 컬렉션 {len(COLLECTIONS)}개 × {points}개, "
+        f"dim={dim})"
+    )
+    print("=" * 80)
+
+    client = QdrantClient(":memory:")
+    async_client = AsyncQdrantClient(":memory:")
+
+    start = time.perf_counter()
+    _populate(client, points, dim, seed)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(_apopulate(async_client, points, dim, seed))
+    print(f"📦 컬렉션 적재: {time.perf_counter() - start:.1f}초")
+
+    service = QdrantService(qdrant_client=client, async_qdrant_client=async_client)
+    orchestrator = SimpleOrchestrator(qdrant_service=service)
+
+    rng = random.Random(seed + 1)
+    vectors = {c: _random_vector(rng, dim) for c in COLLECTIONS}
+
+    modes = {
+        "legacy": lambda: _legacy(service, orchestrator, vectors),
+        "sequential": lambda: _sequential(service, vectors),
+        "threads": lambda: _threads(service, orchestrator, vectors),
+        "batch": lambda: _batch(service, orchestrator, vectors),
+        "async": lambda: loop.run_until_complete(_async(service, vectors)),
+    }
+
+    # 모든 방식이 같은 결과를 내는지 확인
+    reference = [[p.id for p in r] for r in modes["sequential"]()]
+    for name, fn in modes.items():
+        if [[p.id for p in r] for r in fn()] != reference:
+            print(f"⚠️ {name}: 결과가 sequential과 다릅니다")
+
+    print(f"\n{'mode':>12} {'p50(ms)':>9} {'mean(ms)':>9} {'max(ms)':>9}")
+    results = {}
+    for name, fn in modes.items():
+        samples = _measure(fn, rounds)
+        results[name] = samples
+        print(
+            f"{name:>12} {statistics.median(samples):>9.2f} "
+            f"{statistics.mean(samples):>9.2f} {max(samples):>9.2f}"
+        )
+
+    base = statistics.median(results["legacy"])
+    print(
+        "\n📈 legacy 대비: "
+        + ", ".join(
+            f"{name} x{base / statistics.median(samples):.2f}"
+            for name, samples in results.items()
+        )
+    )
+    print("=" * 80)
+
+    loop.close()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="다중 컬렉션 검색 방식 벤치마크")
+    parser.add_argument("--points", type=int, default=2000, help="컬렉션당 포인트 수")
+    parser.add_argument("--dim", type=int, default=256, help="벡터 차원")
+    parser.add_argument("--rounds", type=int, default=30, help="방식별 반복 횟수")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.points, args.dim, args.rounds)
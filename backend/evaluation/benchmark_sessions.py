@@ -0,0 +1,111 @@
+# evaluation/benchmark_sessions.py
+"""
+프로젝트 세션 생성 비용 벤치마크
+
+- 엔진(툴/인덱스/LLM/오케스트레이터) 1회 생성 비용
+- 세션(FDAAgent) 생성 비용과 1,000개 세션당 RSS 증가량
+- ReAct 채팅 상태까지 만든 세션의 비용
+
+사용법:
+    python -m evaluation.benchmark_sessions            # 실제 엔진 (.env 필요)
+    python -m evaluation.benchmark_sessions --stub     # 스텁 엔진 (네트워크 없음)
+"""
+
+import gc
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.append("..")
+
+from dotenv import load_dotenv  # noqa: E402
+
+from utils.agent import FDAAgent  # noqa: E402
+from utils.engine import FDAEngine  # noqa: E402
+
+load_dotenv()
+
+
+def _rss_mb() -> float:
+    """현재 RSS (MB). /proc 미지원 환경은 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def _measure_sessions(engine: FDAEngine, count: int, with_react: bool) -> dict:
+    gc.collect()
+    rss_before = _rss_mb()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    sessions = []
+    for _ in range(count):
+        session = FDAAgent(engine=engine)
+        if with_react:
+            session.agent  # ReAct 채팅 상태 생성
+        sessions.append(session)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    rss_after = _rss_mb()
+
+    return {
+        "sessions": count,
+        "total_s": elapsed,
+        "per_session_us": elapsed / count * 1e6,
+        "traced_peak_mb": peak / (1024 * 1024),
+        "rss_delta_mb": rss_after - rss_before,
+        "rss_per_1000_mb": (rss_after - rss_before) / count * 1000,
+    }
+
+
+def run_benchmark(count: int = 1000, stub: bool = False):
+    print("=" * 80)
+    print(f"🧪 세션 생성 벤치마크 ({'stub' if stub else 'real'} engine, {count} sessions)")
+    print("=" * 80)
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    if stub:
+        from evaluation.stubs import make_stub_engine
+
+        engine = make_stub_engine()
+    else:
+        engine = FDAEngine()
+    engine_s = time.perf_counter() - start
+    print(
+        f"\n🏗️  엔진 생성 (기존: 프로젝트마다 발생): {engine_s * 1000:.1f}ms, "
+        f"RSS +{_rss_mb() - rss_start:.1f}MB"
+    )
+
+    for with_react in (False, True):
+        label = "세션 + ReAct 상태" if with_react else "세션 (메모리만)"
+        stats = _measure_sessions(engine, count, with_react)
+        print(f"\n📦 {label}")
+        print(f"   - 세션당 생성 시간:   {stats['per_session_us']:.1f}µs")
+        print(f"   - 1,000 세션당 RSS:   {stats['rss_per_1000_mb']:.2f}MB")
+        print(f"   - tracemalloc peak:   {stats['traced_peak_mb']:.2f}MB")
+
+    print("\n" + "=" * 80)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="세션 생성 비용 벤치마크")
+    parser.add_argument("--count", type=int, default=1000, help="생성할 세션 수")
+    parser.add_argument("--stub", action="store_true", help="스텁 엔진 사용 (네트워크 없음)")
+
+    args = parser.parse_args()
+
+    run_benchmark(args.count, stub=args.stub)
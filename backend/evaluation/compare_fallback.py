@@ -0,0 +1,124 @@
+# evaluation/compare_fallback.py
+"""
+폴백 방식 지연 비교: ReAct 에이전트 vs 보강 검색(gap-fill)
+
+평가 데이터셋(get_dataset) 질문을 FDA_FALLBACK_MODE=react / gapfill 엔진으로 각각 실행해
+- 폴백 경로를 탄 질문 수 (충분성 평가 실패)
+- 전체 / 폴백 질문의 응답 지연 (p50, p95, 최대)
+- 폴백 단계 자체의 지연 (react_agent vs gap_fill)
+- expected_keywords 포함률 (답변 품질 대략 비교)
+을 출력한다. 답변 캐시와 라우팅 LLM 캐시는 두 방식 모두 끈다.
+
+사용법:
+    python -m evaluation.compare_fallback            # Qdrant + OPENAI_API_KEY 필요
+    python -m evaluation.compare_fallback --limit 5
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+
+sys.path.append("..")
+
+from evaluation.test_dataset import get_dataset  # noqa: E402
+from utils.agent import FDAAgent  # noqa: E402
+from utils.engine import FDAEngine  # noqa: E402
+
+MODES = ("react", "gapfill")
+
+
+def _percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _keyword_coverage(case: dict, answer: str) -> float:
+    keywords = case.get("expected_keywords") or []
+    if not keywords:
+        return 1.0
+    lowered = answer.lower()
+    return sum(1 for k in keywords if k.lower() in lowered) / len(keywords)
+
+
+def _run_mode(mode: str, dataset: list) -> list:
+    engine = FDAEngine(use_answer_cache=False, use_llm_cache=False, fallback_mode=mode)
+    rows = []
+    for case in dataset:
+        # 질문마다 새 세션 (이전 대화 맥락 영향 제거)
+        agent = FDAAgent(engine=engine)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = agent.chat(case["question"])
+        timings = result.get("timings", {})
+        fallback_ms = timings.get("react_agent", 0.0) + timings.get("gap_fill", 0.0)
+        rows.append(
+            {
+                "id": case["id"],
+                "total_ms": timings.get("total", 0.0),
+                "fallback": "react_agent" in timings or "gap_fill" in timings,
+                "react": "react_agent" in timings,
+                "fallback_ms": fallback_ms,
+                "keywords": _keyword_coverage(case, result.get("content", "")),
+            }
+        )
+        print(
+            f"  [{mode}] {case['id']}: {rows[-1]['total_ms']:.0f}ms"
+            f"{' (폴백 %.0fms)' % fallback_ms if rows[-1]['fallback'] else ''}"
+        )
+    engine.close()
+    return rows
+
+
+def run_comparison(limit: int = None):
+    dataset = get_dataset()[:limit] if limit else get_dataset()
+    print("=" * 90)
+    print(f"🧩 폴백 방식 비교 ({len(dataset)}개 질문): ReAct vs 보강 검색")
+    print("=" * 90)
+
+    results = {mode: _run_mode(mode, dataset) for mode in MODES}
+
+    print("\n" + "-" * 90)
+    print(
+        f"{'mode':>8} {'폴백':>6} {'ReAct':>6} {'p50(ms)':>9} {'p95(ms)':>9} "
+        f"{'max(ms)':>9} "
+        f"{'폴백 p50':>10} {'키워드':>7}"
+    )
+    for mode, rows in results.items():
+        totals = [r["total_ms"] for r in rows]
+        fallback = [r["fallback_ms"] for r in rows if r["fallback"]]
+        print(
+            f"{mode:>8} {len(fallback):>6} {sum(r['react'] for r in rows):>6} "
+            f"{statistics.median(totals):>9.0f} {_percentile(totals, 0.95):>9.0f} "
+            f"{max(totals):>9.0f} "
+            f"{statistics.median(fallback) if fallback else 0:>10.0f} "
+            f"{statistics.mean(r['keywords'] for r in rows):>7.2f}"
+        )
+
+    # 두 방식 모두 폴백한 질문끼리 비교
+    react_rows = {r["id"]: r for r in results["react"]}
+    both = [
+        r
+        for r in results["gapfill"]
+        if r["fallback"] and react_rows[r["id"]]["fallback"]
+    ]
+    if both:
+        react_ms = statistics.mean(react_rows[r["id"]]["total_ms"] for r in both)
+        gap_ms = statistics.mean(r["total_ms"] for r in both)
+        print(
+            f"\n⚡ 폴백 질문 {len(both)}개 평균 응답 지연: ReAct {react_ms:,.0f}ms → 보강 검색 "
+            f"{gap_ms:,.0f}ms "
+            f"({1 - gap_ms / react_ms:.0%} 감소)"
+        )
+    print("=" * 90)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="폴백 방식 지연 비교 (ReAct vs 보강 검색)")
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 N개 질문만 실행")
+
+    args = parser.parse_args()
+
+    run_comparison(args.limit)
@@ -0,0 +1,168 @@
+# evaluation/context_token_report.py
+"""
+답변 프롬프트 토큰 리포트 (컨텍스트 압축 전/후)
+
+평가 데이터셋(get_dataset) 질문마다 실제 검색 결과로 최종 답변 프롬프트를
+- 기존 방식 (FDA_CONTEXT_PACKING=0: 결과 10개 × 10,000자 + Agent 정보 전체 + 들여쓴 제품 분해 JSON)
+- 압축 방식 (ContextBuilder: 토큰 예산, 중복 제거, 질문 관련 문장 선택)
+두 가지로 만들어 프롬프트 토큰 수와, 압축 후에도 expected_keywords가 컨텍스트에 남아 있는 비율을 비교한다.
+
+- 기본: 검색만 실제로 수행 (Qdrant + 질문 임베딩용 OPENAI_API_KEY), 직접 답변 프롬프트 기준
+- --react: 전체 엔진으로 라우팅 + ReAct 정보 수집까지 실행해 Agent 정보 포함 프롬프트도 비교 (LLM 호출 비용 발생)
+
+사용법:
+    python -m evaluation.context_token_report
+    python -m evaluation.context_token_report --budget 8000 --react
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+
+sys.path.append("..")
+
+from evaluation.stubs import make_stub_engine  # noqa: E402
+from evaluation.test_dataset import get_dataset  # noqa: E402
+from utils.agent import FDAAgent  # noqa: E402
+from utils.context_builder import ContextBuilder, get_token_counter  # noqa: E402
+from utils.orchestrator import SimpleOrchestrator  # noqa: E402
+
+
+def _keyword_coverage(case: dict, prompt: str) -> float:
+    keywords = case.get("expected_keywords") or []
+    if not keywords:
+        return 1.0
+    lowered = prompt.lower()
+    return sum(1 for k in keywords if k.lower() in lowered) / len(keywords)
+
+
+def _build_prompts(
+    agent: FDAAgent,
+    builder: ContextBuilder,
+    question: str,
+    route: dict,
+    results: list,
+    agent_info: str,
+):
+    """(기존 프롬프트, 압축 프롬프트)"""
+    prompts = []
+    for context_builder in (None, builder):
+        agent.engine.context_builder = context_builder
+        with contextlib.redirect_stdout(io.StringIO()):
+            if agent_info is None:
+                prompt, _ = agent._build_direct_prompt(
+                    question, results, route["decomposition"], route["search_query"]
+                )
+            else:
+                prompt, _ = agent._build_agent_info_prompt(
+                    question,
+                    results,
+                    agent_info,
+                    route["decomposition"],
+                    route["search_query"],
+                )
+        prompts.append(prompt)
+    return prompts
+
+
+def run_report(budget: int = None, with_react: bool = False):
+    counter = get_token_counter()
+    builder = ContextBuilder(budget_tokens=budget)
+
+    if with_react:
+        from utils.engine import FDAEngine
+
+        engine = FDAEngine(use_answer_cache=False)
+    else:
+        # 프롬프트 구성만 필요하므로 LLM은 스텁, 검색만 실제 Qdrant
+        engine = make_stub_engine()
+        engine.orchestrator = SimpleOrchestrator()
+    agent = FDAAgent(engine=engine)
+
+    rows = []
+    for case in get_dataset():
+        question = case["question"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            if with_react:
+                route = agent._route_query(question)
+            else:
+                route = {
+                    "search_query": question,
+                    "collections": case["expected_collections"],
+                    "decomposition": None,
+                }
+            parallel = engine.orchestrator.parallel_search(
+                route["search_query"], route["collections"], route["decomposition"]
+            )
+            results = engine.orchestrator.merge_and_rank(parallel)
+            agent_info = None
+            if with_react:
+                agent_info = str(
+                    agent.agent.chat(agent._build_agent_query(question, route, results))
+                )
+        legacy, packed = _build_prompts(
+            agent, builder, question, route, results, agent_info
+        )
+        rows.append(
+            {
+                "id": case["id"],
+                "tokens": (counter.count(legacy), counter.count(packed)),
+                "keywords": (
+                    _keyword_coverage(case, legacy),
+                    _keyword_coverage(case, packed),
+                ),
+            }
+        )
+
+    print("=" * 90)
+    mode = "Agent 정보 포함 프롬프트" if with_react else "직접 답변 프롬프트"
+    exact = "tiktoken" if counter.exact else "문자 수 추정"
+    print(
+        f"🧮 컨텍스트 토큰 리포트 ({len(rows)}개 질문, {mode}, 예산 {builder.budget_tokens}토큰, "
+        f"{exact})"
+    )
+    print("=" * 90)
+    print(f"{'id':<18} {'기존':>8} {'압축':>8} {'감소':>6}  키워드 포함률")
+    for row in rows:
+        before, after = row["tokens"]
+        print(
+            f"{row['id']:<18} {before:>8,} {after:>8,} {1 - after / before:>6.0%}  "
+            f"{row['keywords'][0]:.2f} → {row['keywords'][1]:.2f}"
+        )
+
+    before = [r["tokens"][0] for r in rows]
+    after = [r["tokens"][1] for r in rows]
+    print("-" * 90)
+    print(
+        f"📊 프롬프트 토큰 평균: {statistics.mean(before):,.0f} → {statistics.mean(after):,.0f} "
+        f"({1 - sum(after) / sum(before):.0%} 감소), 최대 {max(before):,} → {max(after):,}"
+    )
+    print(
+        "🔑 expected_keywords 포함률: "
+        f"{statistics.mean(r['keywords'][0] for r in rows):.2f} → "
+        f"{statistics.mean(r['keywords'][1] for r in rows):.2f}"
+    )
+    print("=" * 90)
+
+    engine.context_builder = builder
+    engine.close()
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="답변 프롬프트 토큰 리포트 (컨텍스트 압축 전/후)")
+    parser.add_argument(
+        "--budget", type=int, default=None, help="컨텍스트 토큰 예산 (기본: FDA_CONTEXT_BUDGET)"
+    )
+    parser.add_argument(
+        "--react",
+        action="store_true",
+        help="라우팅 + ReAct 정보 수집까지 실행 (OPENAI_API_KEY 필요)",
+    )
+
+    args = parser.parse_args()
+
+    run_report(args.budget, args.react)
@@ -17,7 +17,7 @@ from llama_index.core.evaluation import (
 )
 from llama_index.core import Settings
 from llama_index.llms.openai import OpenAI
-from llama_index.embeddings.openai import OpenAIEmbedding 
+from utils.embedding_cache import CachedOpenAIEmbedding
 
 
 class FDAEvaluator:
@@ -31,7 +31,7 @@ class FDAEvaluator:
             api_key=os.getenv("OPENAI_API_KEY")
         )
 
-        self.eval_embed_model = OpenAIEmbedding(
+        self.eval_embed_model = CachedOpenAIEmbedding(
             model="text-embedding-3-small",
             api_key=os.getenv("OPENAI_API_KEY")
         )
@@ -138,6 +138,7 @@ class FDAEvaluator:
             "generation": generation_metrics,
             
             # 메타
+            "timings": agent_response.get("timings", {}),
             "timestamp": datetime.now().isoformat(),
             "agent_response": agent_response.get("content", "")[:500]  # 처음 500자만
         }
@@ -354,6 +355,20 @@ class FDAEvaluator:
                 "faithfulness": safe_avg(gen_metrics, 'faithfulness'),
             }
         
+        # 단계별 평균 지연 (ms)
+        stage_names = []
+        for result in self.results:
+            for stage in result.get("timings", {}):
+                if stage not in stage_names:
+                    stage_names.append(stage)
+        stage_timings = {
+            stage: safe_avg(
+                [r["timings"] for r in self.results if stage in r.get("timings", {})],
+                stage,
+            )
+            for stage in stage_names
+        }
+
         return {
             "summary": {
                 "total_tests": len(self.results),
@@ -361,6 +376,7 @@ class FDAEvaluator:
             },
             "overall_metrics": overall_metrics,
             "by_category": category_performance,
+            "stage_timings": stage_timings,
             "detailed_results": self.results
         }
     
@@ -377,4 +393,4 @@ class FDAEvaluator:
         
         print(f"\n💾 리포트 저장: {filepath}")
         
-        return filepath
\ No newline at end of file
+        return filepath
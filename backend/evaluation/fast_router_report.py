@@ -0,0 +1,183 @@
+# evaluation/fast_router_report.py
+"""
+규칙 기반 빠른 라우터 정확도/지연 리포트
+
+evaluation/test_dataset.py의 라우팅 데이터셋(평가 질문 + 라우팅 전용 케이스)에 대해
+- 적용률: 규칙 라우터가 확신해 LLM 분석을 건너뛴 질문 비율
+- 정확도: 확신한 질문 중 제품명/컬렉션이 기대값과 맞은 비율
+- 지연: 질문당 라우팅 시간 (µs)
+을 출력한다. --llm을 주면 같은 질문을 통합 LLM 분석(_analyze_query)으로도 라우팅해 비교한다.
+
+사용법:
+    python -m evaluation.fast_router_report
+    python -m evaluation.fast_router_report --llm   # OPENAI_API_KEY 필요
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+from evaluation.test_dataset import get_routing_dataset  # noqa: E402
+from utils.decomposition_cache import normalize_product_name  # noqa: E402
+from utils.fast_router import FastRouter  # noqa: E402
+
+
+def _judge(case: dict, product, collections) -> bool:
+    """제품 질문은 제품명, 일반 질문은 1순위 컬렉션이 기대 컬렉션에 포함되는지로 판정"""
+    expected_product = case["expected_product"]
+    if expected_product or product:
+        return bool(product) and normalize_product_name(
+            product
+        ) == normalize_product_name(expected_product or "")
+    return bool(collections) and collections[0] in case["expected_collections"]
+
+
+def _recall(case: dict, collections) -> float:
+    expected = case["expected_collections"]
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(collections or [])) / len(expected)
+
+
+def _time_route(router: FastRouter, question: str, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        router.route(question)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def _llm_routes(dataset: list) -> dict:
+    """통합 LLM 분석으로 라우팅 (비교용)"""
+    import contextlib
+    import io
+
+    from utils.agent import FDAAgent
+    from utils.engine import FDAEngine
+
+    engine = FDAEngine(tools=[], use_answer_cache=False, use_llm_cache=False)
+    engine.fast_router = None
+    agent = FDAAgent(engine=engine, query_analysis="combined")
+
+    routes = {}
+    for case in dataset:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            analysis = agent._analyze_query(case["question"])
+        elapsed = (time.perf_counter() - start) * 1000
+        if analysis is None:
+            routes[case["id"]] = (None, [], elapsed)
+        else:
+            classification = agent._classification_from_analysis(analysis)
+            routes[case["id"]] = (
+                analysis.product_name,
+                classification["collections"],
+                elapsed,
+            )
+    engine.close()
+    return routes
+
+
+def run_report(repeats: int = 200, with_llm: bool = False):
+    dataset = get_routing_dataset()
+    router = FastRouter()
+
+    rows = []
+    for case in dataset:
+        analysis = router.route(case["question"])
+        rows.append(
+            {
+                "case": case,
+                "confident": analysis is not None,
+                "product": analysis.product_name if analysis else None,
+                "collections": analysis.collections if analysis else [],
+                "latency_us": _time_route(router, case["question"], repeats),
+            }
+        )
+
+    print("=" * 100)
+    print(f"⚡ 규칙 라우터 리포트 ({len(dataset)}개 질문, 임계값 {router.threshold})")
+    print("=" * 100)
+    print(
+        f"{'id':<15} {'route':<8} {'ok':<4} {'µs':>7}  product / collections  ←  "
+        "expected"
+    )
+    for row in rows:
+        case = row["case"]
+        if row["confident"]:
+            route = "rule"
+            ok = "✅" if _judge(case, row["product"], row["collections"]) else "❌"
+            got = row["product"] or row["collections"]
+        else:
+            route, ok, got = "LLM", "-", "(폴백)"
+        expected = case["expected_product"] or case["expected_collections"]
+        print(
+            f"{case['id']:<15} {route:<8} {ok:<4} {row['latency_us']:>7.1f}  {got}  ←  "
+            f"{expected}"
+        )
+
+    confident = [r for r in rows if r["confident"]]
+    correct = [
+        r for r in confident if _judge(r["case"], r["product"], r["collections"])
+    ]
+    general = [
+        r for r in confident if not r["product"] and not r["case"]["expected_product"]
+    ]
+    latencies = [r["latency_us"] for r in rows]
+
+    print("\n" + "-" * 100)
+    print(
+        f"📊 적용률: {len(confident)}/{len(rows)} ({len(confident) / len(rows):.0%}) 질문이 "
+        "LLM 라우팅 없이 처리"
+    )
+    if confident:
+        print(
+            f"🎯 정확도 (규칙 라우팅된 질문): {len(correct)}/{len(confident)} "
+            f"({len(correct) / len(confident):.0%})"
+        )
+    if general:
+        recall = statistics.mean(_recall(r["case"], r["collections"]) for r in general)
+        print(f"📚 기대 컬렉션 재현율 (일반 질문): {recall:.2f}")
+    print(
+        f"⏱️ 규칙 라우팅 지연: 중앙값 {statistics.median(latencies):.1f}µs, 최대 "
+        f"{max(latencies):.1f}µs"
+    )
+
+    if with_llm:
+        llm = _llm_routes(dataset)
+        llm_correct = sum(
+            1 for c in dataset if _judge(c, llm[c["id"]][0], llm[c["id"]][1])
+        )
+        llm_latency = [v[2] for v in llm.values()]
+        print(
+            f"\n🤖 통합 LLM 분석: 정확도 {llm_correct}/{len(dataset)} "
+            f"({llm_correct / len(dataset):.0%}), "
+            f"지연 중앙값 {statistics.median(llm_latency):.0f}ms"
+        )
+        agree = sum(
+            1 for r in confident if _judge(r["case"], *llm[r["case"]["id"]][:2])
+        )
+        print(f"   규칙 라우팅된 질문 중 LLM도 맞힌 질문: {agree}/{len(confident)}")
+
+    print("=" * 100)
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="규칙 기반 빠른 라우터 정확도/지연 리포트")
+    parser.add_argument("--repeats", type=int, default=200, help="질문당 지연 측정 반복 횟수")
+    parser.add_argument(
+        "--llm", action="store_true", help="통합 LLM 분석과 비교 (OPENAI_API_KEY 필요)"
+    )
+
+    args = parser.parse_args()
+
+    run_report(args.repeats, args.llm)
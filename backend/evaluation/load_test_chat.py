@@ -0,0 +1,130 @@
+# evaluation/load_test_chat.py
+"""
+/api/chat 동시성 부하 테스트 (스텁 LLM/Qdrant 백엔드)
+
+N개의 동시 클라이언트가 각자 다른 project_id로 요청을 보내고
+처리량(req/s)과 지연 시간이 클라이언트 수에 따라 어떻게 변하는지 측정한다.
+
+사용법:
+    python -m evaluation.load_test_chat --clients 1 2 4 8 16 --requests 4
+    FDA_CHAT_MODE=thread python -m evaluation.load_test_chat   # 워커 풀 방식 비교
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+import httpx  # noqa: E402
+
+from evaluation.stubs import make_stub_engine  # noqa: E402
+from utils.engine import set_engine  # noqa: E402
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    project_id: int,
+    requests: int,
+    latencies: list,
+    errors: list,
+):
+    for _ in range(requests):
+        start = time.perf_counter()
+        resp = await http.post(
+            "/api/chat",
+            json={"message": "FSVP 요구사항이 뭔가요?", "project_id": project_id},
+        )
+        latencies.append(time.perf_counter() - start)
+        if resp.status_code != 200:
+            errors.append(resp.status_code)
+
+
+async def _run_level(app, clients: int, requests: int) -> dict:
+    latencies, errors = [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test", timeout=300
+    ) as http:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[
+                _client(http, project_id, requests, latencies, errors)
+                for project_id in range(1, clients + 1)
+            ]
+        )
+        elapsed = time.perf_counter() - start
+
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "max": max(latencies),
+        "errors": len(errors),
+    }
+
+
+def run_load_test(
+    client_levels, requests: int, llm_latency: float, search_latency: float
+):
+    # 스텁 엔진을 먼저 등록한 뒤 main을 import (main은 import 시 공유 엔진을 가져감)
+    set_engine(make_stub_engine(llm_latency=llm_latency, search_latency=search_latency))
+    import main
+
+    print("=" * 80)
+    print(
+        f"🧪 /api/chat 부하 테스트 (LLM {llm_latency * 1000:.0f}ms, 검색 "
+        f"{search_latency * 1000:.0f}ms, "
+        f"mode={main.CHAT_MODE}, workers={main.chat_dispatcher.max_workers})"
+    )
+    print("=" * 80)
+    print(
+        f"{'clients':>8} {'reqs':>6} {'elapsed':>9} {'req/s':>8} {'p50':>8} {'max':>8} "
+        f"{'errors':>7}"
+    )
+
+    results = []
+    for clients in client_levels:
+        # 파이프라인 디버그 출력은 버림
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = asyncio.run(_run_level(main.app, clients, requests))
+        results.append(stats)
+        print(
+            f"{stats['clients']:>8} {stats['requests']:>6} {stats['elapsed']:>8.2f}s "
+            f"{stats['throughput']:>8.2f} {stats['p50']:>7.2f}s {stats['max']:>7.2f}s "
+            f"{stats['errors']:>7}"
+        )
+
+    base = results[0]["throughput"]
+    print(
+        f"\n📈 처리량 배율 (기준 {client_levels[0]} clients): "
+        + ", ".join(f"{r['clients']}→x{r['throughput'] / base:.1f}" for r in results)
+    )
+    print("=" * 80)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="/api/chat 동시성 부하 테스트")
+    parser.add_argument(
+        "--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="동시 클라이언트 수 목록"
+    )
+    parser.add_argument("--requests", type=int, default=3, help="클라이언트당 요청 수")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.2, help="스텁 LLM 호출 지연(초)"
+    )
+    parser.add_argument("--search-latency", type=float, default=0.1, help="스텁 검색 지연(초)")
+
+    args = parser.parse_args()
+
+    run_load_test(args.clients, args.requests, args.llm_latency, args.search_latency)
@@ -0,0 +1,149 @@
+# evaluation/measure_ttft.py
+"""
+/api/chat vs /api/chat/stream 첫 응답 시간 비교 (스텁 LLM/Qdrant 백엔드)
+
+- /api/chat: 전체 답변이 완성된 뒤 한 번에 응답 → 첫 글자까지 = 전체 시간
+- /api/chat/stream: 첫 progress 이벤트, 첫 답변 토큰(TTFT), 완료 시점을 각각 측정
+
+httpx ASGITransport는 응답 본문을 모아서 돌려주므로 로컬 uvicorn 서버를 띄워 측정한다.
+
+사용법:
+    python -m evaluation.measure_ttft --token-latency 0.02 --runs 3
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append("..")
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from evaluation.stubs import make_stub_engine  # noqa: E402
+from utils.engine import set_engine  # noqa: E402
+
+QUESTION = "FSVP 요구사항이 뭔가요?"
+
+
+async def _measure_chat(http: httpx.AsyncClient) -> dict:
+    start = time.perf_counter()
+    resp = await http.post("/api/chat", json={"message": QUESTION})
+    elapsed = time.perf_counter() - start
+    resp.raise_for_status()
+    return {"first_event": elapsed, "first_token": elapsed, "total": elapsed}
+
+
+async def _measure_stream(http: httpx.AsyncClient) -> dict:
+    stats = {}
+    start = time.perf_counter()
+    async with http.stream(
+        "POST", "/api/chat/stream", json={"message": QUESTION}
+    ) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line.startswith("event: "):
+                continue
+            event = line[len("event: ") :]
+            now = time.perf_counter() - start
+            stats.setdefault("first_event", now)
+            if event == "token":
+                stats.setdefault("first_token", now)
+            elif event == "done":
+                stats["total"] = now
+    return stats
+
+
+async def _run(base_url: str, runs: int) -> dict:
+    results = {"chat": [], "stream": []}
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as http:
+        for _ in range(runs):
+            results["chat"].append(await _measure_chat(http))
+            results["stream"].append(await _measure_stream(http))
+    return results
+
+
+def _start_server(app) -> tuple:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def run_measurement(
+    runs: int, llm_latency: float, token_latency: float, search_latency: float
+):
+    set_engine(
+        make_stub_engine(
+            llm_latency=llm_latency,
+            search_latency=search_latency,
+            token_latency=token_latency,
+        )
+    )
+    import main
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        server, thread, base_url = _start_server(main.app)
+        try:
+            results = asyncio.run(_run(base_url, runs))
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    print("=" * 80)
+    print(
+        f"🧪 첫 응답 시간 비교 (LLM 첫 토큰 {llm_latency * 1000:.0f}ms, 토큰당 "
+        f"{token_latency * 1000:.0f}ms, "
+        f"검색 {search_latency * 1000:.0f}ms, {runs}회 중앙값)"
+    )
+    print("=" * 80)
+    print(f"{'endpoint':>18} {'first event':>12} {'first token':>12} {'total':>9}")
+    for name, label in (("chat", "/api/chat"), ("stream", "/api/chat/stream")):
+        samples = results[name]
+        med = {
+            k: statistics.median(s[k] for s in samples)
+            for k in ("first_event", "first_token", "total")
+        }
+        print(
+            f"{label:>18} {med['first_event']:>11.2f}s {med['first_token']:>11.2f}s "
+            f"{med['total']:>8.2f}s"
+        )
+    print("=" * 80)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="/api/chat vs /api/chat/stream 첫 응답 시간 비교"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="엔드포인트별 반복 횟수")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.3, help="스텁 LLM 첫 토큰 지연(초)"
+    )
+    parser.add_argument(
+        "--token-latency", type=float, default=0.02, help="스텁 LLM 토큰당 생성 시간(초)"
+    )
+    parser.add_argument("--search-latency", type=float, default=0.1, help="스텁 검색 지연(초)")
+
+    args = parser.parse_args()
+
+    run_measurement(
+        args.runs, args.llm_latency, args.token_latency, args.search_latency
+    )
@@ -16,17 +16,22 @@ import os
 from dotenv import load_dotenv
 from llama_index.core import Settings
 from llama_index.llms.openai import OpenAI
-from llama_index.embeddings.openai import OpenAIEmbedding
+from utils.embedding_cache import CachedOpenAIEmbedding  # noqa: E402
 
 load_dotenv()
 
 
-def run_evaluation(version_name: str = "baseline", deterministic: bool = True):
+def run_evaluation(
+    version_name: str = "baseline",
+    deterministic: bool = True,
+    query_analysis: str = None,
+):
     """평가 실행
     
     Args:
         version_name: 버전 이름
         deterministic: True이면 temperature=0으로 설정하여 일관된 결과 보장
+        query_analysis: 질문 분석 방식 (combined / legacy, None이면 FDA_QUERY_ANALYSIS)
     """
     
     print("="*80)
@@ -41,7 +46,7 @@ def run_evaluation(version_name: str = "baseline", deterministic: bool = True):
             temperature=0,  # ⬅️ 0으로 설정!
             api_key=os.getenv("OPENAI_API_KEY")
         )
-        Settings.embed_model = OpenAIEmbedding(
+        Settings.embed_model = CachedOpenAIEmbedding(
             model="text-embedding-3-small", 
             api_key=os.getenv("OPENAI_API_KEY")
         )
@@ -49,7 +54,8 @@ def run_evaluation(version_name: str = "baseline", deterministic: bool = True):
         print("🔧 실제 챗봇 모드: temperature=0.1 (약간의 변동성)")
     
     # Agent 초기화
-    agent = FDAAgent()
+    agent = FDAAgent(query_analysis=query_analysis)
+    print(f"🔧 질문 분석 방식: {agent.query_analysis_mode}")
     evaluator = FDAEvaluator()
     
     # ⭐ 메모리 초기화
@@ -157,7 +163,12 @@ def run_evaluation(version_name: str = "baseline", deterministic: bool = True):
         print(f"\n  📌 {cat} ({metrics['count']}개 테스트)")
         print(f"     - Correctness:  {metrics['correctness']:.3f}")
         print(f"     - Faithfulness: {metrics['faithfulness']:.3f}")
-    
+
+    if report.get("stage_timings"):
+        print("\n⏱️ 단계별 평균 지연 (ms):")
+        for stage, ms in report["stage_timings"].items():
+            print(f"  - {stage:<16} {ms:>9.1f}")
+
     print(f"\n💾 상세 결과 저장: {filepath}")
     print(f"📁 파일 위치: backend/evaluation/results/")
     print("\n" + "="*80)
@@ -180,7 +191,11 @@ if __name__ == "__main__":
         action='store_true',
         help='실제 챗봇처럼 동작 (temperature=0.1, 약간의 변동성 있음)'
     )
+    parser.add_argument(
+        "--query-analysis",
+        choices=["combined", "legacy"],
+        default=None,
+        help="질문 분석 방식 (combined: 통합 1회 호출, legacy: 단계별 3회 호출)",
+    )
     
     args = parser.parse_args()
-    
-    run_evaluation(args.version, deterministic=not args.real_chatbot)
\ No newline at end of file
@@ -0,0 +1,261 @@
+# evaluation/stubs.py
+"""
+벤치마크/부하 테스트용 스텁 백엔드 (OpenAI, Qdrant 호출 없이 파이프라인 실행)
+"""
+
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+from llama_index.core.llms import (
+    CompletionResponse,
+    CompletionResponseAsyncGen,
+    CompletionResponseGen,
+    CustomLLM,
+    LLMMetadata,
+)
+from llama_index.core.llms.callbacks import llm_completion_callback
+
+
+def _stub_answer(prompt: str) -> str:
+    """프롬프트 종류에 맞는 고정 응답 반환"""
+    if "augmented_query" in prompt:
+        question = re.search(r'Question: "(.*?)"', prompt)
+        is_product = bool(question and "김치" in question.group(1))
+        return json.dumps(
+            {
+                "product_name": "김치" if is_product else None,
+                "augmented_query": "food import requirements regulations compliance",
+                "category": "PRODUCT" if is_product else "COMPLIANCE",
+                "collections": ["guidance", "ecfr"],
+                "reason": "stub",
+            }
+        )
+    if "contains a FOOD PRODUCT name" in prompt:
+        query = re.search(r'Query: "(.*?)"', prompt)
+        return "김치" if query and "김치" in query.group(1) else "None"
+    if "routes FDA-related questions" in prompt:
+        return json.dumps(
+            {
+                "category": "COMPLIANCE",
+                "collections": ["guidance", "ecfr"],
+                "reason": "stub",
+            }
+        )
+    if "Return a JSON object with EXACTLY these fields" in prompt:
+        return json.dumps(
+            {
+                "ingredients": ["cabbage", "chili powder", "garlic"],
+                "processes": ["fermentation"],
+                "allergens": [],
+                "origin": "Korea",
+                "category": "ethnic food",
+            }
+        )
+    if "검색 쿼리를 생성하세요" in prompt:
+        return "food import requirements regulations compliance"
+    # 최종 답변: 실제 답변 길이(500단어 안팎)를 흉내 냄
+    return " ".join(["스텁 답변입니다[1]."] * 300)
+
+
+class StubLLM(CustomLLM):
+    """고정 지연 후 프롬프트별 고정 응답을 돌려주는 LLM"""
+
+    latency: float = 0.0
+    token_latency: float = 0.0  # 답변 토큰 하나당 생성 시간 (complete는 전체 토큰 시간만큼 대기)
+    model_name: str = "stub-llm"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(model_name=self.model_name)
+
+    @llm_completion_callback()
+    def complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        text = _stub_answer(prompt)
+        time.sleep(self.latency + self.token_latency * len(text.split(" ")))
+        return CompletionResponse(text=text)
+
+    @llm_completion_callback()
+    async def acomplete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponse:
+        text = _stub_answer(prompt)
+        await asyncio.sleep(self.latency + self.token_latency * len(text.split(" ")))
+        return CompletionResponse(text=text)
+
+    @llm_completion_callback()
+    def stream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseGen:
+        time.sleep(self.latency)
+        text = _stub_answer(prompt)
+
+        def gen() -> CompletionResponseGen:
+            acc = ""
+            for token in text.split(" "):
+                time.sleep(self.token_latency)
+                delta = token + " "
+                acc += delta
+                yield CompletionResponse(text=acc, delta=delta)
+
+        return gen()
+
+    @llm_completion_callback()
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseAsyncGen:
+        await asyncio.sleep(self.latency)
+        text = _stub_answer(prompt)
+
+        async def gen() -> CompletionResponseAsyncGen:
+            acc = ""
+            for token in text.split(" "):
+                await asyncio.sleep(self.token_latency)
+                delta = token + " "
+                acc += delta
+                yield CompletionResponse(text=acc, delta=delta)
+
+        return gen()
+
+
+class StubQdrantService:
+    """고정 지연 후 점수가 충분한 가짜 검색 결과를 돌려주는 QdrantService 대체"""
+
+    def __init__(self, latency: float = 0.0, limit: int = 5):
+        self.latency = latency
+        self.limit = limit
+        self.version = 1  # 컬렉션 데이터 버전 (답변 캐시 무효화 테스트용)
+
+    def _points(self, collection: str, limit: int) -> List[SimpleNamespace]:
+        return [
+            SimpleNamespace(
+                id=f"{collection}-{i}",
+                score=0.80 - i * 0.02,
+                payload={
+                    "text": (
+                        f"{collection} stub document {i} about food import requirements"
+                    ),
+                    "title": f"{collection.upper()} stub {i}",
+                    "url": "",
+                },
+            )
+            for i in range(min(limit, self.limit))
+        ]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return [0.0] * 1536
+
+    def embed_many(self, texts: List[str]):
+        unique = list(dict.fromkeys(texts))
+        batch = {
+            "texts": len(texts),
+            "unique_texts": len(unique),
+            "cache_hits": 0,
+            "api_calls": 1 if unique else 0,
+            "calls_saved": len(texts) - (1 if unique else 0),
+        }
+        return {text: [0.0] * 1536 for text in unique}, batch
+
+    async def aembed_many(self, texts: List[str]):
+        return self.embed_many(texts)
+
+    def search_collection(
+        self, collection_name: str, query: str, limit: int = 5, query_vector=None
+    ):
+        time.sleep(self.latency)  # 실제 클라이언트처럼 동기 I/O로 블로킹
+        return self._points(collection_name, limit)
+
+    async def asearch_collection(
+        self, collection_name: str, query: str, limit: int = 5, query_vector=None
+    ):
+        await asyncio.sleep(self.latency)
+        return self._points(collection_name, limit)
+
+    def collection_versions(self, collections: List[str]):
+        return {c: self.version for c in collections}
+
+    async def acollection_versions(self, collections: List[str]):
+        return self.collection_versions(collections)
+
+    def search_batch(
+        self, collection_name: str, query_vectors: List[List[float]], limit: int = 5
+    ):
+        time.sleep(self.latency)
+        return [self._points(collection_name, limit) for _ in query_vectors]
+
+    async def asearch_batch(
+        self, collection_name: str, query_vectors: List[List[float]], limit: int = 5
+    ):
+        await asyncio.sleep(self.latency)
+        return [self._points(collection_name, limit) for _ in query_vectors]
+
+    def _identifier_point(self, collection: str) -> SimpleNamespace:
+        """밀집 점수는 낮지만 식별자(21 CFR 101.4)가 그대로 있는 문서 (하이브리드 검색 테스트용)"""
+        return SimpleNamespace(
+            id=f"{collection}-cfr",
+            score=0.55,
+            payload={
+                "text": f"{collection} 21 CFR 101.4 food designation of ingredients",
+                "title": f"{collection.upper()} 101.4",
+                "url": "",
+            },
+        )
+
+    def scroll_payloads(self, collection_name: str, batch_size: int = 512):
+        for point in self._points(collection_name, self.limit) + [
+            self._identifier_point(collection_name)
+        ]:
+            yield point.id, point.payload
+
+    def score_points(self, collection_name: str, query_vector: List[float], ids: List):
+        time.sleep(self.latency)
+        points = {
+            p.id: p
+            for p in self._points(collection_name, self.limit)
+            + [self._identifier_point(collection_name)]
+        }
+        return [points[i] for i in ids if i in points]
+
+    async def ascore_points(
+        self, collection_name: str, query_vector: List[float], ids: List
+    ):
+        await asyncio.sleep(self.latency)
+        return self.score_points(collection_name, query_vector, ids)
+
+
+def make_stub_engine(
+    llm_latency: float = 0.0,
+    search_latency: float = 0.0,
+    token_latency: float = 0.0,
+    use_answer_cache: bool = False,
+    use_llm_cache: bool = False,
+    fallback_mode: str = None,
+):
+    """스텁 LLM + 스텁 Qdrant + 빈 툴 목록으로 엔진 생성 (네트워크 호출 없음)
+
+    부하 테스트가 같은 질문을 반복하므로 답변 캐시와 LLM 호출 캐시는 기본적으로 끈다.
+    """
+    from llama_index.core.embeddings import MockEmbedding
+
+    from utils.engine import FDAEngine
+    from utils.orchestrator import SimpleOrchestrator
+
+    llm = StubLLM(latency=llm_latency, token_latency=token_latency)
+    return FDAEngine(
+        llm=llm,
+        classifier_llm=llm,
+        analysis_llm=llm,
+        embed_model=MockEmbedding(embed_dim=1536),
+        tools=[],
+        orchestrator=SimpleOrchestrator(
+            qdrant_service=StubQdrantService(latency=search_latency)
+        ),
+        use_answer_cache=use_answer_cache,
+        use_llm_cache=use_llm_cache,
+        fallback_mode=fallback_mode,
+    )
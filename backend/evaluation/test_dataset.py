@@ -95,7 +95,182 @@ FDA_TEST_DATASET = [
         "expected_collections": ["guidance", "ecfr", "fsvp"],
         "expected_answer_type": "comprehensive",
         "context_required": ["product decomposition", "multiple regulations"],
-        "notes": "Korean product - should decompose and search comprehensively"
+        "notes": "Korean product - should decompose and search comprehensively",
+        "expected_product": "김치",
+    },
+]
+
+
+# 라우팅 전용 케이스 (제품 감지 + 컬렉션 선택만 평가, 답변 품질은 평가하지 않음)
+# expected_product: 한글 대표명 또는 None, expected_collections: 반드시 포함되어야 할 컬렉션
+ROUTING_TEST_CASES = [
+    {
+        "id": "route_001",
+        "question": "21 CFR 117 요구사항 알려줘",
+        "expected_product": None,
+        "expected_collections": ["ecfr"],
+    },
+    {
+        "id": "route_002",
+        "question": "What does 21 CFR 101.4 say about ingredient lists?",
+        "expected_product": None,
+        "expected_collections": ["ecfr"],
+    },
+    {
+        "id": "route_003",
+        "question": "GRN 1023 승인 상태는?",
+        "expected_product": None,
+        "expected_collections": ["gras"],
+    },
+    {
+        "id": "route_004",
+        "question": "Is stevia GRAS for beverages?",
+        "expected_product": None,
+        "expected_collections": ["gras"],
+    },
+    {
+        "id": "route_005",
+        "question": "Import Alert 16-120 대상 품목은?",
+        "expected_product": None,
+        "expected_collections": ["dwpe"],
+    },
+    {
+        "id": "route_006",
+        "question": "한국 회사가 수입 경보 레드리스트에 오르면 어떻게 되나요?",
+        "expected_product": None,
+        "expected_collections": ["dwpe"],
+    },
+    {
+        "id": "route_007",
+        "question": "FSVP 수입자는 어떤 서류를 보관해야 하나요?",
+        "expected_product": None,
+        "expected_collections": ["fsvp"],
+    },
+    {
+        "id": "route_008",
+        "question": "How often must an importer verify a foreign supplier under FSVP?",
+        "expected_product": None,
+        "expected_collections": ["fsvp"],
+    },
+    {
+        "id": "route_009",
+        "question": "개인용으로 우편 발송하면 통관 절차가 다른가요?",
+        "expected_product": None,
+        "expected_collections": ["rpm"],
+    },
+    {
+        "id": "route_010",
+        "question": "What is the 3-month supply rule for personal importation?",
+        "expected_product": None,
+        "expected_collections": ["rpm"],
+    },
+    {
+        "id": "route_011",
+        "question": "HACCP 계획이 필수인가요?",
+        "expected_product": None,
+        "expected_collections": ["ecfr"],
+    },
+    {
+        "id": "route_012",
+        "question": "What are the penalties for misbranding under 21 USC 333?",
+        "expected_product": None,
+        "expected_collections": ["usc"],
+    },
+    {
+        "id": "route_013",
+        "question": "FD&C Act Section 403 요약",
+        "expected_product": None,
+        "expected_collections": ["usc"],
+    },
+    {
+        "id": "route_014",
+        "question": "영양성분표 라벨 글자 크기 규정",
+        "expected_product": None,
+        "expected_collections": ["guidance"],
+    },
+    {
+        "id": "route_015",
+        "question": "식품 시설 등록은 어떻게 하나요?",
+        "expected_product": None,
+        "expected_collections": ["ecfr"],
+    },
+    {
+        "id": "route_016",
+        "question": "미국 수출 시 필요한 서류가 뭔가요?",
+        "expected_product": None,
+        "expected_collections": ["guidance"],
+    },
+    {
+        "id": "route_017",
+        "question": "떡볶이를 미국에 수출하려면 뭐가 필요해?",
+        "expected_product": "떡볶이",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_018",
+        "question": "냉동만두 수출 규정",
+        "expected_product": "냉동만두",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_019",
+        "question": "Can I export kimchi to the US?",
+        "expected_product": "김치",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_020",
+        "question": "고추장 FDA 등록 필요한가요?",
+        "expected_product": "고추장",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_021",
+        "question": "조미김을 미국에 팔려면?",
+        "expected_product": "김",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_022",
+        "question": "불고기 소스 알레르기 표시",
+        "expected_product": "불고기",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_023",
+        "question": "bibimbap frozen meal labeling",
+        "expected_product": "비빔밥",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_024",
+        "question": "유자차 수출 시 산성식품 등록이 필요한가요?",
+        "expected_product": "유자차",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_025",
+        "question": "라면 스프에 들어간 색소 규정",
+        "expected_product": "라면",
+        "expected_collections": [],
+    },
+    {
+        "id": "route_026",
+        "question": "김 대표님이 물어본 FSVP 질문",
+        "expected_product": None,
+        "expected_collections": ["fsvp"],
+    },
+    {
+        "id": "route_027",
+        "question": "What is the difference between major and nonmajor allergens?",
+        "expected_product": None,
+        "expected_collections": ["guidance"],
+    },
+    {
+        "id": "route_028",
+        "question": "Who enforces food safety rules at the border?",
+        "expected_product": None,
+        "expected_collections": ["rpm"],
     },
 ]
 
@@ -105,6 +280,20 @@ def get_dataset() -> List[Dict[str, Any]]:
     return FDA_TEST_DATASET
 
 
+def get_routing_dataset() -> List[Dict[str, Any]]:
+    """라우팅 평가용 데이터셋 (평가 데이터셋 질문 + 라우팅 전용 케이스)"""
+    routing = [
+        {
+            "id": item["id"],
+            "question": item["question"],
+            "expected_product": item.get("expected_product"),
+            "expected_collections": item["expected_collections"],
+        }
+        for item in FDA_TEST_DATASET
+    ]
+    return routing + ROUTING_TEST_CASES
+
+
 def get_dataset_by_category(category: str) -> List[Dict[str, Any]]:
     """카테고리별 데이터셋 반환"""
     return [item for item in FDA_TEST_DATASET if item['category'] == category]
@@ -20,17 +20,22 @@ import os
 from dotenv import load_dotenv
 from llama_index.core import Settings
 from llama_index.llms.openai import OpenAI
-from llama_index.embeddings.openai import OpenAIEmbedding
+from utils.embedding_cache import CachedOpenAIEmbedding  # noqa: E402
 
 load_dotenv()
 
 
-def test_single_case(test_id: str = "definition_001", deterministic: bool = True):
+def test_single_case(
+    test_id: str = "definition_001",
+    deterministic: bool = True,
+    query_analysis: str = None,
+):
     """단일 테스트 케이스 실행
     
     Args:
         test_id: 테스트 케이스 ID
         deterministic: True이면 temperature=0으로 설정하여 일관된 결과 보장
+        query_analysis: 질문 분석 방식 (combined / legacy, None이면 FDA_QUERY_ANALYSIS)
     """
     
     print("="*80)
@@ -45,7 +50,7 @@ def test_single_case(test_id: str = "definition_001", deterministic: bool = True
             temperature=0,  # ⬅️ 0으로 설정!
             api_key=os.getenv("OPENAI_API_KEY")
         )
-        Settings.embed_model = OpenAIEmbedding(
+        Settings.embed_model = CachedOpenAIEmbedding(
             model="text-embedding-3-small", 
             api_key=os.getenv("OPENAI_API_KEY")
         )
@@ -53,7 +58,7 @@ def test_single_case(test_id: str = "definition_001", deterministic: bool = True
         print("🔧 실제 챗봇 모드: temperature=0.1 (약간의 변동성)")
     
     # Agent 및 Evaluator 초기화
-    agent = FDAAgent()
+    agent = FDAAgent(query_analysis=query_analysis)
     evaluator = FDAEvaluator()
     
     # ⭐ 메모리 초기화 (실제 챗봇처럼 깨끗한 상태에서 시작)
@@ -156,9 +161,17 @@ if __name__ == "__main__":
         action='store_true',
         help='실제 챗봇처럼 동작 (temperature=0.1, 약간의 변동성 있음)'
     )
+    parser.add_argument(
+        "--query-analysis",
+        choices=["combined", "legacy"],
+        default=None,
+        help="질문 분석 방식 (combined: 통합 1회 호출, legacy: 단계별 3회 호출)",
+    )
     
     args = parser.parse_args()
     
     # --real-chatbot 플래그가 있으면 deterministic=False
-    test_single_case(args.id, deterministic=not args.real_chatbot)
+    test_single_case(
+        args.id, deterministic=not args.real_chatbot, query_analysis=args.query_analysis
+    )
 
@@ -0,0 +1,173 @@
+# evaluation/train_local_router.py
+"""
+로컬 질문 분류기 학습 (utils/local_router.py)
+
+학습 데이터
+- test_dataset.get_routing_dataset()의 expected_collections (정답 레이블, 로그보다 우선)
+- FDA_ROUTING_LOG에 쌓인 LLM 분류 결과 (classifier / analysis)
+
+교차 검증으로 1순위 정확도, 기대 컬렉션 재현율, 임계값별 적용률/정확도와
+질문당 추론 시간을 출력한 뒤 전체 데이터로 학습한 모델을 저장한다.
+서버는 FDA_LOCAL_ROUTER_PATH에 모델이 있으면 시작 시 로드한다.
+
+사용법:
+    python -m evaluation.train_local_router \\
+        --log data/routing_log.jsonl --output data/local_router.joblib
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.append("..")
+
+from sklearn.model_selection import KFold  # noqa: E402
+
+from evaluation.test_dataset import get_routing_dataset  # noqa: E402
+from utils.answer_cache import normalize_query  # noqa: E402
+from utils.local_router import LocalRouter, RoutingLog  # noqa: E402
+
+SWEEP_THRESHOLDS = (0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9)
+
+
+def load_training_data(log_paths: list) -> tuple:
+    """(질문 목록, 레이블 목록, 출처별 개수) - 같은 질문은 정답 데이터셋 > 최신 로그 순으로 사용"""
+    samples = {}
+    counts = {}
+    for path in log_paths:
+        if not os.path.exists(path):
+            print(f"⚠️ 로그 파일 없음: {path}")
+            continue
+        for record in RoutingLog.read(path):
+            samples[normalize_query(record["query"])] = (
+                record["query"],
+                record["collections"],
+                f"log:{record.get('source', 'llm')}",
+            )
+
+    for case in get_routing_dataset():
+        if case["expected_collections"]:
+            samples[normalize_query(case["question"])] = (
+                case["question"],
+                case["expected_collections"],
+                "dataset",
+            )
+
+    for _, _, source in samples.values():
+        counts[source] = counts.get(source, 0) + 1
+    queries = [q for q, _, _ in samples.values()]
+    labels = [l for _, l, _ in samples.values()]
+    return queries, labels, counts
+
+
+def cross_validate(queries: list, labels: list, threshold: float, folds: int) -> dict:
+    """held-out 예측별 (확신도, 1순위 정답, 기대 컬렉션 전부 포함)으로 지표 계산"""
+    top1, recalls, held_out = [], [], []
+    splitter = KFold(n_splits=min(folds, len(queries)), shuffle=True, random_state=42)
+    for train_idx, test_idx in splitter.split(queries):
+        router = LocalRouter(threshold=threshold).fit(
+            [queries[i] for i in train_idx], [labels[i] for i in train_idx]
+        )
+        for i in test_idx:
+            prediction = router.predict(queries[i])
+            correct = prediction["collections"][0] in labels[i]
+            covered = set(labels[i]) <= set(prediction["collections"])
+            top1.append(correct)
+            recalls.append(
+                len(set(labels[i]) & set(prediction["collections"])) / len(labels[i])
+            )
+            held_out.append((prediction["confidence"], correct, covered))
+    return {
+        "top1": sum(top1) / len(top1),
+        "recall": statistics.mean(recalls),
+        **threshold_metrics(held_out, threshold),
+        "held_out": held_out,
+    }
+
+
+def threshold_metrics(held_out: list, threshold: float) -> dict:
+    """임계값 이상 적용률과 적용된 질문의 1순위 정확도/기대 컬렉션 포함률"""
+    confident = [
+        (correct, covered)
+        for confidence, correct, covered in held_out
+        if confidence >= threshold
+    ]
+    count = len(confident) or 1
+    return {
+        "coverage": len(confident) / len(held_out),
+        "confident_accuracy": sum(c for c, _ in confident) / count,
+        "confident_covered": sum(c for _, c in confident) / count,
+    }
+
+
+def train(log_paths: list, output: str, threshold: float, folds: int):
+    queries, labels, counts = load_training_data(log_paths)
+    n_labels = len({c for label in labels for c in label})
+
+    print("=" * 80)
+    print(f"🧠 로컬 분류기 학습 ({len(queries)}개 질문, 컬렉션 {n_labels}개, 출처 {counts})")
+    print("=" * 80)
+
+    if len(queries) < 10 or n_labels < 2:
+        print("❌ 학습 데이터 부족: FDA_ROUTING_LOG로 LLM 분류 결과를 더 모은 뒤 다시 실행하세요.")
+        return None
+
+    metrics = cross_validate(queries, labels, threshold, folds)
+    print(f"📊 {folds}-fold 교차 검증")
+    print(f"   1순위 컬렉션 정확도: {metrics['top1']:.0%}")
+    print(f"   기대 컬렉션 재현율:  {metrics['recall']:.2f}")
+    print("   임계값별 적용률 (적용된 질문의 1순위 정확도 / 기대 컬렉션 포함률)")
+    for value in sorted(set(SWEEP_THRESHOLDS) | {threshold}):
+        swept = threshold_metrics(metrics["held_out"], value)
+        marker = " ← 사용" if value == threshold else ""
+        accuracy, covered = swept["confident_accuracy"], swept["confident_covered"]
+        print(
+            f"   {value:.2f}: {swept['coverage']:.0%} "
+            f"({accuracy:.0%} / {covered:.0%}){marker}"
+        )
+
+    router = LocalRouter(threshold=threshold).fit(queries, labels)
+
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        router.classify(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"⏱️ 추론 시간: 중앙값 {statistics.median(samples):.2f}ms, 최대 {max(samples):.2f}ms")
+
+    router.save(output)
+    print(f"💾 모델 저장: {output} (FDA_LOCAL_ROUTER_PATH={output} 로 사용)")
+    print("=" * 80)
+    return metrics
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 질문 분류기 학습")
+    parser.add_argument(
+        "--log",
+        action="append",
+        default=None,
+        help="LLM 분류 로그(JSONL), 여러 번 지정 가능 (기본: FDA_ROUTING_LOG)",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.getenv("FDA_LOCAL_ROUTER_PATH") or "data/local_router.joblib",
+        help="모델 저장 경로",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("FDA_LOCAL_ROUTER_THRESHOLD", "0.7")),
+        help="LLM 분류 대신 사용할 최소 확신도",
+    )
+    parser.add_argument("--folds", type=int, default=5, help="교차 검증 fold 수")
+
+    args = parser.parse_args()
+
+    logs = args.log or (
+        [os.getenv("FDA_ROUTING_LOG")] if os.getenv("FDA_ROUTING_LOG") else []
+    )
+    train(logs, args.output, args.threshold, args.folds)
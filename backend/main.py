@@ -1,21 +1,47 @@
 # main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Optional, List
 import os
+import json
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import logging
 
 from utils.agent import FDAAgent
+from utils.engine import get_engine
+from utils.session_store import SessionStore
+from utils.dispatcher import ChatDispatcher, DispatcherBusy
+from utils.decomposition_cache import get_decomposition_cache
+from utils.embedding_cache import get_embedding_cache
+from utils.llm_cache import get_llm_cache
+from utils import tracing
+from utils.log import request_scope, setup as setup_logging
+from utils.metrics import get_metrics
 import time
 from datetime import datetime
 
 load_dotenv()
-logging.basicConfig(level=logging.INFO)
+setup_logging()  # FDA_LOG_LEVEL / FDA_LOG_FORMAT
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="FDA Export Assistant API - ReAct Agent")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료: 진행 중인 요청 완료 후 워커 풀, 커넥션 풀, 디스크 캐시 정리
+    logger.info("Shutting down: draining chat workers and closing connections.")
+    chat_dispatcher.shutdown(wait=True)
+    if engine is not None:
+        await engine.aclose()
+    get_embedding_cache().close()
+    get_decomposition_cache().close()
+    get_llm_cache().close()
+
+
+app = FastAPI(title="FDA Export Assistant API - ReAct Agent", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,23 +49,67 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
-# [기존 유지] 기본 FDA Agent (fallback용)
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """요청 ID(X-Request-ID 헤더, 없으면 생성)를 로그/trace 컨텍스트에 설정하고 응답 헤더로 돌려준다"""
+    with request_scope(
+        request.headers.get("x-request-id", "")[:64] or None
+    ) as request_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+# 툴/인덱스/LLM은 공유 엔진에서 한 번만 생성하고, 에이전트는 경량 세션으로 사용
 try:
-    fda_agent = FDAAgent()
+    engine = get_engine()
     logger.info("FDA ReAct Agent initialized successfully.")
 except Exception as e:
-    logger.error(f"Failed to initialize FDA Agent: {e}")
-    fda_agent = None
+    logger.error("Failed to initialize FDA Agent: %s", e)
+    engine = None
 
-# [추가] 프로젝트별 에이전트 딕셔너리
-project_agents: Dict[int, FDAAgent] = {}
+# 에이전트 파이프라인 실행 방식
+# - async (기본): achat()을 이벤트 루프에서 직접 await
+# - thread: 동기 chat()을 이벤트 루프 밖의 제한된 워커 풀에서 실행
+# 두 방식 모두 대기 요청 상한 초과 시 503, 같은 프로젝트 요청은 직렬 처리
+CHAT_MODE = os.getenv("FDA_CHAT_MODE", "async")
+chat_dispatcher = ChatDispatcher(
+    max_workers=int(os.getenv("FDA_CHAT_WORKERS", "8")),
+    max_pending=int(os.getenv("FDA_CHAT_MAX_PENDING", "32")),
+)
+
+# [추가] 프로젝트별 세션 저장소 (메모리 + ReAct 채팅 상태만 보유)
+# LRU 퇴출 + 유휴 TTL, 스필 디렉토리를 지정하면 퇴출된 대화를 디스크에 보관했다가 복원
+project_agents = SessionStore(
+    factory=lambda: FDAAgent(engine=engine),
+    max_sessions=int(os.getenv("FDA_SESSION_MAX", "500")),
+    idle_ttl=float(os.getenv("FDA_SESSION_IDLE_TTL", "3600")),
+    spill_dir=os.getenv("FDA_SESSION_SPILL_DIR") or None,
+)
+
+# Prometheus 메트릭 (요청 trace 집계 + 스크랩 시점 stats, FDA_METRICS=0이면 비활성화)
+metrics = get_metrics()
+if metrics is not None:
+    metrics.bind_stats(
+        sessions=project_agents.stats,
+        caches=lambda: _cache_stats(),
+        dispatcher=chat_dispatcher.stats,
+        pools=lambda: {
+            "chat": chat_dispatcher.executor,
+            "routing": engine.executor if engine else None,
+            "search": engine.orchestrator.executor if engine else None,
+        },
+    )
 
 class ChatRequest(BaseModel):
     message: str
     project_id: Optional[int] = None
     language: Optional[str] = None
+    debug_timings: bool = False  # True면 요청 단계별 span 목록을 응답에 포함
 
 class ChatResponse(BaseModel):
     content: str
@@ -50,6 +120,10 @@ class ChatResponse(BaseModel):
     # 시간 정보
     responseTime: float = 0
     agentResponseTime: float = 0
+    stageTimings: Dict[str, float] = {}  # 파이프라인 단계별 소요 시간(ms)
+    debug_timings: Optional[Dict] = (
+        None  # 요청 trace (request.debug_timings=True일 때만)
+    )
     timestamp: str = ""
 
 @app.get("/")
@@ -84,28 +158,34 @@ async def chat(request: ChatRequest):
     # 요청 시작 시간
     request_start_time = time.time()
 
-    if not fda_agent:
+    if not engine:
         raise HTTPException(status_code=500, detail="Agent is not available.")
     
     try:
         project_id = request.project_id
         
-        # 프로젝트 ID가 있으면 프로젝트별 에이전트 사용, 없으면 기본 에이전트 사용
+        # 프로젝트 ID가 있으면 프로젝트별 에이전트 사용, 없으면 일회용 세션 사용
         if project_id:
-            if project_id not in project_agents:
-                project_agents[project_id] = FDAAgent()
-                logger.info(f"새 프로젝트 에이전트 생성: {project_id}")
-            
-            agent = project_agents[project_id]
-            logger.info(f"프로젝트 {project_id}에서 질문 처리: {request.message}")
+            agent = project_agents.acquire(project_id)  # 처리 중에는 퇴출/스필하지 않음
+            logger.info(
+                "프로젝트 %s에서 질문 처리: %.200s", project_id, request.message
+            )
         else:
-            # 기존 방식: 전역 에이전트 사용 (하위 호환성)
-            agent = fda_agent
-            logger.info(f"기본 에이전트로 질문 처리: {request.message}")
+            # 세션 생성 비용이 작으므로 요청마다 새 세션 (요청 간 ReAct 상태 공유 방지)
+            agent = FDAAgent(engine=engine)
+            logger.info("기본 에이전트로 질문 처리: %.200s", request.message)
         
-        # 에이전트 실행 시간 측정
+        # 에이전트 실행 시간 측정 (프로젝트별 직렬화)
         agent_start_time = time.time()
-        agent_response = agent.chat(request.message)
+        with tracing.collect(debug=request.debug_timings) as collected:
+            if CHAT_MODE == "thread":
+                agent_response = await chat_dispatcher.run(
+                    project_id, agent.chat, request.message
+                )
+            else:
+                agent_response = await chat_dispatcher.run_async(
+                    project_id, agent.achat, request.message
+                )
         agent_end_time = time.time()
         
         logger.info("Agent generated a response.")
@@ -134,13 +214,31 @@ async def chat(request: ChatRequest):
             citations=agent_response.get("citations", []),  # ← 이 줄 추가!
             responseTime=total_response_time,
             agentResponseTime=agent_response_time,
+            stageTimings=(
+                agent_response.get("timings", {})
+                if isinstance(agent_response, dict)
+                else {}
+            ),
+            debug_timings=(
+                collected.trace.to_dict()
+                if request.debug_timings and collected.trace
+                else None
+            ),
             timestamp=datetime.now().isoformat(),
         )
         
+    except DispatcherBusy as e:
+        logger.warning("Chat request rejected: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
     except ValueError as e:
         # 에러 발생 시에도 시간 기록
         error_response_time = (time.time() - request_start_time) * 1000
-        logger.warning(f"Handled error in agent: {e}")
+        logger.warning("Handled error in agent: %s", e)
         return ChatResponse(
             content=str(e),
             responseTime=error_response_time,
@@ -149,7 +247,7 @@ async def chat(request: ChatRequest):
         
     except Exception as e:
         error_response_time = (time.time() - request_start_time) * 1000
-        logger.error(f"Error processing agent chat request: {e}", exc_info=True)
+        logger.error("Error processing agent chat request: %s", e, exc_info=True)
         
         # 사용자 친화적 에러 메시지
         error_message = "죄송합니다. 요청 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
@@ -159,27 +257,152 @@ async def chat(request: ChatRequest):
             timestamp=datetime.now().isoformat(),
         )
 
+    finally:
+        if project_id:
+            project_agents.release(project_id)
+
+
+def _sse(event: str, data: Dict) -> str:
+    """Server-Sent Events 프레임"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """/api/chat의 SSE 스트리밍 버전
+
+    progress(라우팅/검색/에이전트 단계) → token(최종 답변 조각) → citations → done 순서로 전송
+    """
+    if not engine:
+        raise HTTPException(status_code=500, detail="Agent is not available.")
+
+    project_id = request.project_id
+    if project_id:
+        logger.info(
+            "프로젝트 %s에서 스트리밍 질문 처리: %.200s", project_id, request.message
+        )
+
+        async def project_stream(message: str):
+            # 세션은 본문 전송이 실제로 시작된 뒤에 잡는다. 응답 시작 전에 클라이언트가
+            # 끊기면 제너레이터가 아예 실행되지 않아 finally의 release도 없기 때문
+            session = project_agents.acquire(project_id)
+            try:
+                async for item in session.astream_chat(message):
+                    yield item
+            finally:
+                project_agents.release(project_id)
+
+        stream_fn = project_stream
+    else:
+        stream_fn = FDAAgent(engine=engine).astream_chat
+        logger.info("기본 에이전트로 스트리밍 질문 처리: %.200s", request.message)
+
+    try:
+        events = chat_dispatcher.stream(project_id, stream_fn, request.message)
+    except DispatcherBusy as e:
+        logger.warning("Chat stream rejected: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    async def event_source():
+        content = []
+        try:
+            with tracing.collect(debug=request.debug_timings) as collected:
+                async for item in events:
+                    event, data = item["event"], item["data"]
+                    if event == "token":
+                        content.append(data["text"])
+                    elif event == "citations" and not data.get("cfr_references"):
+                        # /api/chat과 같은 폴백 추출
+                        extracted = _extract_citations("".join(content))
+                        data["keywords"] = data.get("keywords") or extracted.get(
+                            "keywords", []
+                        )
+                        data["cfr_references"] = extracted.get("cfr_references", [])
+                        data["sources"] = data.get("sources") or extracted.get(
+                            "sources", []
+                        )
+                    elif event == "done" and request.debug_timings and collected.trace:
+                        data["debug_timings"] = collected.trace.to_dict()
+                    yield _sse(event, data)
+        except DispatcherBusy as e:
+            logger.warning("Chat stream rejected: %s", e)
+            yield _sse("error", {"message": "요청이 많아 잠시 후 다시 시도해주세요."})
+        except Exception as e:
+            logger.error("Error processing agent chat stream: %s", e, exc_info=True)
+            yield _sse(
+                "error",
+                {
+                    "message": "죄송합니다. 요청 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+                },
+            )
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.delete("/api/project/{project_id}")
 async def delete_project(project_id: int):
     """프로젝트 삭제 시 해당 에이전트도 제거"""
-    if project_id in project_agents:
-        del project_agents[project_id]
-        logger.info(f"프로젝트 {project_id} 에이전트 삭제 완료")
+    project_agents.remove(project_id)
+    logger.info("프로젝트 %s 에이전트 삭제 완료", project_id)
     return {"message": "프로젝트가 삭제되었습니다."}
 
 @app.post("/api/project/{project_id}/reset")
 async def reset_project_conversation(project_id: int):
     """특정 프로젝트의 대화 히스토리 초기화"""
+    if not engine:
+        raise HTTPException(status_code=500, detail="Agent is not available.")
+
     if project_id in project_agents:
-        project_agents[project_id].reset_conversation()
-        logger.info(f"프로젝트 {project_id} 대화 히스토리 초기화 완료")
+        project_agents.get(project_id).reset_conversation()
+        logger.info("프로젝트 %s 대화 히스토리 초기화 완료", project_id)
         return {"message": "대화 히스토리가 초기화되었습니다."}
     else:
-        # 해당 프로젝트가 없으면 새로 생성
-        project_agents[project_id] = FDAAgent()
-        logger.info(f"프로젝트 {project_id} 새 에이전트 생성")
+        # 해당 프로젝트가 없으면 새로 생성 (디스크에 스필된 대화도 폐기)
+        project_agents.remove(project_id)
+        project_agents.get_or_create(project_id)
+        logger.info("프로젝트 %s 새 세션 생성", project_id)
         return {"message": "새로운 대화가 시작되었습니다."}
 
+
+@app.get("/api/sessions/stats")
+async def session_stats():
+    """세션 저장소 카운터 (세션 수, 히트/퇴출/만료/스필 횟수)"""
+    return project_agents.stats()
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """캐시 히트율 (답변 캐시, 제품 분해 캐시, 라우팅 LLM 호출 캐시, 재순위화 점수 캐시, 임베딩 캐시: 메모리 LRU / 디스크 계층)"""
+    return _cache_stats()
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus 스크랩 엔드포인트"""
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+def _cache_stats() -> Dict:
+    answer_cache = engine.answer_cache if engine else None
+    return {
+        "answer": answer_cache.stats() if answer_cache else None,
+        "decomposition": get_decomposition_cache().stats(),
+        "llm": engine.llm_cache.stats() if engine and engine.llm_cache else None,
+        "rerank": engine.reranker.stats() if engine and engine.reranker else None,
+        "embedding": get_embedding_cache().stats(),
+    }
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -5,38 +5,38 @@ ReAct 프레임워크를 사용하여 FDA 규제 질문에 답변하는 메인 
 import os
 import json
 import re
+import time
+import asyncio
+import logging
 from typing import List, Dict
 from llama_index.core.agent import ReActAgent
-from llama_index.llms.openai import OpenAI
-from llama_index.core import Settings
-from llama_index.embeddings.openai import OpenAIEmbedding
+from llama_index.core.llms import ChatMessage as LlamaChatMessage
 
-from utils.tools import create_fda_tools
+from utils.engine import FDAEngine, get_engine
 from utils.memory import ConversationMemory, ChatMessage
 from utils.collection_strategy import COLLECTION_STRATEGY
+from utils.query_analysis import (
+    QueryAnalysis,
+    build_query_analysis_prompt,
+    parse_query_analysis,
+)
+from utils.context_builder import compact_decomposition, get_token_counter
+from utils import tracing
+from utils.log import get_logger, verbose
 
-class FDAAgent:
-    def __init__(self):
-        # LlamaIndex 전역 설정 (rag_engine과 동일하게 설정)
-        Settings.embed_model = OpenAIEmbedding(model="text-embedding-3-small", api_key=os.getenv("OPENAI_API_KEY"))
-        Settings.llm = OpenAI(model="gpt-4-turbo", temperature=0.1, api_key=os.getenv("OPENAI_API_KEY"))
-
-        # 1. 모든 FDA 컬렉션을 '전문가 툴'로 변환
-        self.fda_tools = create_fda_tools()
+logger = get_logger(__name__)
 
-        # 멀티턴 대화를 위한 메모리 추가
-        self.memory = ConversationMemory()
-        
-        # 제품 분해 캐시 추가
-        self.decomposition_cache = {}
+# 제품명 추출/쿼리 증강/질문 분류를 동시에 시작할지 여부
+# (제품 질문이면 증강/분류 호출은 버려지므로 토큰이 약간 더 쓰인다)
+SPECULATIVE_ROUTING = os.getenv("FDA_SPECULATIVE_ROUTING", "1") != "0"
 
-        # 컬렉션 라우팅 기본값 및 보조 LLM
-        self.available_collections = ['guidance', 'ecfr', 'gras', 'dwpe', 'fsvp', 'rpm', 'usc']
-        self.default_collections = ['guidance', 'ecfr', 'gras', 'dwpe']
-        self.collection_classifier_llm = OpenAI(model="gpt-3.5-turbo", temperature=0)
+# 검색 전 질문 분석 방식
+# - combined: 제품명/증강 쿼리/분류를 한 번의 JSON 응답으로 받음
+# - legacy: 제품명 추출, 쿼리 증강, 질문 분류를 각각 호출 (평가 비교용)
+QUERY_ANALYSIS_MODE = os.getenv("FDA_QUERY_ANALYSIS", "combined")
 
-        # ✅ [수정] 에이전트의 행동 방식을 정의하는 새로운 시스템 프롬프트 (정보 수집 전용)
-        system_prompt = """당신은 FDA 규제 정보 수집 전문가입니다.
+# ✅ [수정] 에이전트의 행동 방식을 정의하는 새로운 시스템 프롬프트 (정보 수집 전용)
+REACT_SYSTEM_PROMPT = """당신은 FDA 규제 정보 수집 전문가입니다.
 
 ## 역할
 사용자 질문에 답하기 위해 필요한 정보를 도구로 수집하세요.
@@ -131,19 +131,111 @@ class FDAAgent:
 첫 검색 실패 시 2-3번 재시도 필수
 """
 
-        # 2. ReAct 에이전트 생성 (context 추가)
-        self.agent = ReActAgent.from_tools(
-            tools=self.fda_tools,
-            llm=Settings.llm,
-            system_prompt=system_prompt,
-            max_iterations=10,
-            verbose=True,
-            # ✅ 핵심 추가: context로 도구 강제 사용
-            context="""You MUST use tools for FDA-related queries.
+# ✅ 핵심 추가: context로 도구 강제 사용
+REACT_CONTEXT = """You MUST use tools for FDA-related queries.
 NEVER answer with "(Implicit) I can answer without tools".
 For keywords like "비용/cost", "절차/procedure", "Chapter", "relabeling" → ALWAYS use tools.
 Always translate Korean to English before searching."""
+
+
+class FDAAgent:
+    """프로젝트별 경량 세션: 대화 메모리와 ReAct 채팅 상태만 보유하고 나머지는 공유 엔진 사용"""
+
+    # 컬렉션 라우팅 기본값
+    available_collections = ["guidance", "ecfr", "gras", "dwpe", "fsvp", "rpm", "usc"]
+    default_collections = ["guidance", "ecfr", "gras", "dwpe"]
+
+    def __init__(self, engine: FDAEngine = None, query_analysis: str = None):
+        # 툴/인덱스/LLM/오케스트레이터는 프로세스 전역 엔진을 공유
+        self.engine = engine or get_engine()
+        self.query_analysis_mode = query_analysis or QUERY_ANALYSIS_MODE
+        self.fda_tools = self.engine.fda_tools
+        self.collection_classifier_llm = self.engine.collection_classifier_llm
+
+        # 제품 분해 캐시 (엔진 공유)
+        self.decomposition_cache = self.engine.decomposition_cache
+
+        # 멀티턴 대화를 위한 메모리 (세션별)
+        self.memory = ConversationMemory()
+
+        # ReAct 에이전트는 폴백 경로에서 처음 필요할 때 생성 (세션별 채팅 상태)
+        self._agent = None
+        # 복원된 ReAct 채팅 기록 (에이전트 생성 시 전달)
+        self._agent_history: List[LlamaChatMessage] = []
+
+    @property
+    def agent(self) -> ReActAgent:
+        """세션 전용 ReAct 에이전트 (공유 툴/LLM 위에 채팅 상태만 별도로 보유)"""
+        if self._agent is None:
+            self._agent = ReActAgent.from_tools(
+                tools=self.fda_tools,
+                llm=self.engine.llm,
+                system_prompt=REACT_SYSTEM_PROMPT,
+                max_iterations=10,
+                # ReAct 단계 출력은 stdout으로 가므로 DEBUG일 때만
+                verbose=logger.isEnabledFor(logging.DEBUG),
+                context=REACT_CONTEXT,
+                chat_history=self._agent_history,
+            )
+            self._agent_history = []
+        return self._agent
+
+    def _record_turn(self, query: str, result: dict):
+        """완료된 질문/답변을 대화 메모리에 기록 (다음 질문의 ReAct 컨텍스트, 세션 스필 대상)"""
+        self.memory.add_message("user", query)
+        self.memory.add_message("assistant", result.get("content", ""))
+
+    def export_state(self) -> dict:
+        """세션 스필용 대화 상태 (대화 메모리 + ReAct 채팅 기록)"""
+        history = (
+            self._agent.chat_history if self._agent is not None else self._agent_history
         )
+        return {
+            "memory": self.memory.to_dict(),
+            "agent_history": [message.model_dump(mode="json") for message in history],
+        }
+
+    def restore_state(self, state: dict):
+        """export_state() 결과로 대화 상태 복원 (ReAct 에이전트는 다음 생성 시 기록을 넘겨받음)"""
+        self.memory = ConversationMemory.from_dict(state["memory"])
+        history = [
+            LlamaChatMessage.model_validate(item)
+            for item in state.get("agent_history", [])
+        ]
+        if self._agent is not None:
+            self._agent.memory.set(history)
+        else:
+            self._agent_history = history
+
+    def has_state(self) -> bool:
+        return (
+            bool(self.memory.messages)
+            or bool(self._agent_history)
+            or (self._agent is not None and bool(self._agent.chat_history))
+        )
+
+    def _complete(self, llm, prompt: str, parse=None):
+        """라우팅/제품 분해용 LLM 호출 (엔진의 LLM 호출 캐시가 있으면 경유, parse 결과 반환)"""
+        with tracing.span("llm", model=self._model_name(llm)):
+            tracing.annotate_tokens(prompt)
+            if self.engine.llm_cache is not None:
+                return self.engine.llm_cache.complete(llm, prompt, parse)
+            text = llm.complete(prompt).text
+            return parse(text) if parse else text
+
+    async def _acomplete(self, llm, prompt: str, parse=None):
+        """_complete의 비동기 버전"""
+        with tracing.span("llm", model=self._model_name(llm)):
+            tracing.annotate_tokens(prompt)
+            if self.engine.llm_cache is not None:
+                return await self.engine.llm_cache.acomplete(llm, prompt, parse)
+            text = (await llm.acomplete(prompt)).text
+            return parse(text) if parse else text
+
+    @staticmethod
+    def _model_name(llm) -> str:
+        """trace/메트릭 라벨용 모델 이름"""
+        return getattr(llm, "model", None) or type(llm).__name__
 
     def _is_food_export_question_llm(self, query: str) -> bool:
         """
@@ -151,8 +243,8 @@ Always translate Korean to English before searching."""
         '특정 식품의 수출 규제'에 대한 것인지 분류하는 필터 함수.
         """
         try:
-            # 필터 전용으로 저렴한 모델을 임시로 사용
-            filter_llm = OpenAI(model="gpt-3.5-turbo", temperature=0)
+            # 필터 전용으로 저렴한 모델 사용 (엔진의 분류용 LLM 재사용)
+            filter_llm = self.collection_classifier_llm
             
             prompt = f"""
             Is the following user query about the regulations for exporting a specific food item?
@@ -160,27 +252,110 @@ Always translate Korean to English before searching."""
 
             Query: "{query}"
             """
-            
-            response = filter_llm.complete(prompt)
-            answer = response.text.strip().lower()
-            
-            print(f"LLM Filter Check for query '{query}': Answer='{answer}'") # 디버깅용 로그
+
+            answer = self._complete(
+                filter_llm, prompt, lambda text: text.strip().lower()
+            )
+
+            # 디버깅용 로그
+            logger.debug("LLM Filter Check for query '%s': Answer='%s'", query, answer)
             
             return answer == "yes"
 
         except Exception as e:
-            print(f"LLM Filter failed: {e}") # 에러 로그
+            logger.warning("LLM Filter failed: %s", e)  # 에러 로그
             return False # 에러 발생 시 안전하게 False로 처리
 
+    @tracing.traced("decompose")
     def _decompose_product(self, product_name: str) -> dict:
         """제품 분해 (10개 요소) - 한국 음식 지원 강화"""
-        # 캐시 확인
-        if product_name in self.decomposition_cache:
-            return self.decomposition_cache[product_name]
+        # 캐시 확인 (정규화 키, 워밍 항목 포함)
+        cached = self.decomposition_cache.get(product_name)
+        if cached is not None:
+            return cached
         
         # 한국어 감지 및 처리 지침 추가
-        is_korean = any(ord(char) >= 0xAC00 and ord(char) <= 0xD7A3 for char in product_name)
+        is_korean = self._is_korean(product_name)
+
+        # _complete 경유: llm 스팬(메트릭)과 LLM 호출 캐시 적용 (파싱 실패 응답은 캐시하지 않음)
+        raw = {}
+
+        def parse(text):
+            raw["text"] = text
+            return self._parse_decomposition(text, is_korean)
+
+        try:
+            decomposition = self._complete(
+                self.engine.llm,
+                self._decomposition_prompt(product_name, is_korean),
+                parse,
+            )
+
+            # 캐싱
+            self.decomposition_cache.put(product_name, decomposition)
+            return decomposition
+
+        except (json.JSONDecodeError, Exception) as e:
+            logger.warning("Decomposition failed for '%s': %s", product_name, e)
+            verbose(logger, "LLM Response:", raw.get("text", "No response"))
+
+            # 스마트한 폴백: LLM 한 번 더 시도 (더 간단한 방식)
+            try:
+                return self._complete(
+                    self.engine.llm,
+                    self._simple_decomposition_prompt(product_name),
+                    lambda text: self._parse_simple_decomposition(
+                        text, product_name, is_korean
+                    ),
+                )
+            except Exception:
+                # 최종 폴백
+                return self._default_decomposition(product_name, is_korean)
+
+    @tracing.traced("decompose")
+    async def _adecompose_product(self, product_name: str) -> dict:
+        """_decompose_product의 비동기 버전"""
+        cached = self.decomposition_cache.get(product_name)
+        if cached is not None:
+            return cached
+
+        is_korean = self._is_korean(product_name)
+
+        raw = {}
+
+        def parse(text):
+            raw["text"] = text
+            return self._parse_decomposition(text, is_korean)
         
+        try:
+            decomposition = await self._acomplete(
+                self.engine.llm,
+                self._decomposition_prompt(product_name, is_korean),
+                parse,
+            )
+            self.decomposition_cache.put(product_name, decomposition)
+            return decomposition
+
+        except (json.JSONDecodeError, Exception) as e:
+            logger.warning("Decomposition failed for '%s': %s", product_name, e)
+            verbose(logger, "LLM Response:", raw.get("text", "No response"))
+
+            try:
+                return await self._acomplete(
+                    self.engine.llm,
+                    self._simple_decomposition_prompt(product_name),
+                    lambda text: self._parse_simple_decomposition(
+                        text, product_name, is_korean
+                    ),
+                )
+            except Exception:
+                return self._default_decomposition(product_name, is_korean)
+
+    @staticmethod
+    def _is_korean(text: str) -> bool:
+        return any(ord(char) >= 0xAC00 and ord(char) <= 0xD7A3 for char in text)
+
+    def _decomposition_prompt(self, product_name: str, is_korean: bool) -> str:
         if is_korean:
             prompt_prefix = f"""
 You are analyzing a KOREAN food product. First, identify what '{product_name}' is in English.
@@ -198,7 +373,7 @@ Now analyze '{product_name}' for FDA requirements.
         else:
             prompt_prefix = f"Analyze '{product_name}' for FDA requirements."
         
-        decomposition_prompt = f"""{prompt_prefix}
+        return f"""{prompt_prefix}
         
 Return a JSON object with EXACTLY these fields:
 {{
@@ -221,101 +396,122 @@ Examples:
 
 Return ONLY valid JSON, no other text or markdown.
 """
+
+    def _parse_decomposition(self, text: str, is_korean: bool) -> dict:
+        text = text.strip()
         
-        try:
-            response = Settings.llm.complete(decomposition_prompt)
-            text = response.text.strip()
-            
-            # Markdown 코드 블록 제거
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            # JSON 파싱
-            decomposition = json.loads(text)
-            
-            # 필드 검증 및 기본값 추가
-            defaults = {
-                "ingredients": [],
-                "processes": [],
-                "allergens": [],
-                "origin": "Korea" if is_korean else "unknown",
-                "category": "ethnic food" if is_korean else "food",
-                "subcategories": [],
-                "storage_type": "ambient",
-                "risk_level": "medium",
-                "packaging_concerns": [],
-                "potential_hazards": [],
-                "import_type": "commercial"
-            }
-            
-            # 누락된 필드 채우기
-            for key, default_value in defaults.items():
-                if key not in decomposition or not decomposition[key]:
-                    decomposition[key] = default_value
-            
-            # 캐싱
-            self.decomposition_cache[product_name] = decomposition
-            return decomposition
-            
-        except (json.JSONDecodeError, Exception) as e:
-            print(f"Decomposition failed for '{product_name}': {e}")
-            print(f"LLM Response: {response.text if 'response' in locals() else 'No response'}")
-            
-            # 스마트한 폴백: LLM 한 번 더 시도 (더 간단한 방식)
-            try:
-                simple_prompt = f"""
+        # Markdown 코드 블록 제거
+        if "```json" in text:
+            text = text.split("```json")[1].split("```")[0].strip()
+        elif "```" in text:
+            text = text.split("```")[1].split("```")[0].strip()
+
+        # JSON 파싱
+        decomposition = json.loads(text)
+
+        # 필드 검증 및 기본값 추가
+        defaults = {
+            "ingredients": [],
+            "processes": [],
+            "allergens": [],
+            "origin": "Korea" if is_korean else "unknown",
+            "category": "ethnic food" if is_korean else "food",
+            "subcategories": [],
+            "storage_type": "ambient",
+            "risk_level": "medium",
+            "packaging_concerns": [],
+            "potential_hazards": [],
+            "import_type": "commercial",
+        }
+
+        # 누락된 필드 채우기
+        for key, default_value in defaults.items():
+            if key not in decomposition or not decomposition[key]:
+                decomposition[key] = default_value
+
+        return decomposition
+
+    def _simple_decomposition_prompt(self, product_name: str) -> str:
+        return f"""
 What are the main ingredients of {product_name}?
 Answer in this exact format:
 ingredients: item1, item2, item3
 allergens: allergen1, allergen2
 """
-                simple_response = Settings.llm.complete(simple_prompt)
-                lines = simple_response.text.strip().split('\n')
-                
-                ingredients = []
-                allergens = []
-                
-                for line in lines:
-                    if line.startswith('ingredients:'):
-                        ingredients = [i.strip() for i in line.split(':')[1].split(',')]
-                    elif line.startswith('allergens:'):
-                        allergens = [a.strip() for a in line.split(':')[1].split(',')]
-                
-                return {
-                    "ingredients": ingredients or [product_name],
-                    "processes": ["processing", "packaging"],
-                    "allergens": allergens,
-                    "origin": "Korea" if is_korean else "unknown",
-                    "category": "ethnic food" if is_korean else "food",
-                    "subcategories": ["imported food"],
-                    "storage_type": "refrigerated" if is_korean else "ambient",
-                    "risk_level": "medium",
-                    "packaging_concerns": ["labeling required"],
-                    "potential_hazards": ["contamination"],
-                    "import_type": "commercial"
-                }
-                
-            except:
-                # 최종 폴백
-                return {
-                    "ingredients": [product_name],
-                    "processes": [],
-                    "allergens": [],
-                    "origin": "Korea" if is_korean else "unknown",
-                    "category": "ethnic food" if is_korean else "food",
-                    "subcategories": [],
-                    "storage_type": "ambient",
-                    "risk_level": "medium",
-                    "packaging_concerns": [],
-                    "potential_hazards": [],
-                    "import_type": "commercial"
-                }
 
+    def _parse_simple_decomposition(
+        self, text: str, product_name: str, is_korean: bool
+    ) -> dict:
+        lines = text.strip().split("\n")
+
+        ingredients = []
+        allergens = []
+
+        for line in lines:
+            if line.startswith("ingredients:"):
+                ingredients = [i.strip() for i in line.split(":")[1].split(",")]
+            elif line.startswith("allergens:"):
+                allergens = [a.strip() for a in line.split(":")[1].split(",")]
+
+        return {
+            "ingredients": ingredients or [product_name],
+            "processes": ["processing", "packaging"],
+            "allergens": allergens,
+            "origin": "Korea" if is_korean else "unknown",
+            "category": "ethnic food" if is_korean else "food",
+            "subcategories": ["imported food"],
+            "storage_type": "refrigerated" if is_korean else "ambient",
+            "risk_level": "medium",
+            "packaging_concerns": ["labeling required"],
+            "potential_hazards": ["contamination"],
+            "import_type": "commercial",
+        }
+
+    def _default_decomposition(self, product_name: str, is_korean: bool) -> dict:
+        return {
+            "ingredients": [product_name],
+            "processes": [],
+            "allergens": [],
+            "origin": "Korea" if is_korean else "unknown",
+            "category": "ethnic food" if is_korean else "food",
+            "subcategories": [],
+            "storage_type": "ambient",
+            "risk_level": "medium",
+            "packaging_concerns": [],
+            "potential_hazards": [],
+            "import_type": "commercial",
+        }
+
+    @tracing.traced("extract_product")
     def _extract_product_name(self, query: str) -> str:
         """LLM을 사용하여 쿼리에서 제품명 추출"""
-        prompt = f"""
+        try:
+            return self._complete(
+                self.engine.llm,
+                self._product_name_prompt(query),
+                self._parse_product_name,
+            )
+
+        except Exception as e:
+            logger.warning("LLM product extraction failed: %s", e)
+            # 에러 시 안전하게 None 반환
+            return None
+
+    @tracing.traced("extract_product")
+    async def _aextract_product_name(self, query: str) -> str:
+        """_extract_product_name의 비동기 버전"""
+        try:
+            return await self._acomplete(
+                self.engine.llm,
+                self._product_name_prompt(query),
+                self._parse_product_name,
+            )
+        except Exception as e:
+            logger.warning("LLM product extraction failed: %s", e)
+            return None
+
+    def _product_name_prompt(self, query: str) -> str:
+        return f"""
 Analyze this user query and determine if it contains a FOOD PRODUCT name.
 
 Query: "{query}"
@@ -328,25 +524,45 @@ Rules:
 
 Answer with ONLY the product name or "None":
 """
+
+    def _parse_product_name(self, text: str) -> str:
+        result = text.strip()
+
+        # "None" 또는 "none" 반환 시 None으로 변환
+        if result.lower() == "none":
+            return None
         
+        return result
+
+    @tracing.traced("augment")
+    def _augment_general_query(self, original_query: str) -> str:
+        """일반 질문에 대한 LLM 쿼리 증강"""
         try:
-            response = Settings.llm.complete(prompt)
-            result = response.text.strip()
-            
-            # "None" 또는 "none" 반환 시 None으로 변환
-            if result.lower() == "none":
-                return None
-            
-            return result
+            augmented_query = self._complete(
+                self.engine.llm, self._augmentation_prompt(original_query), str.strip
+            )
+
+            # 원본 쿼리와 증강된 쿼리 결합
+            return f"{original_query}\n\nEnhanced search query: {augmented_query}"
             
         except Exception as e:
-            print(f"LLM product extraction failed: {e}")
-            # 에러 시 안전하게 None 반환
-            return None
+            logger.warning("Query augmentation failed: %s", e)
+            return original_query
 
-    def _augment_general_query(self, original_query: str) -> str:
-        """일반 질문에 대한 LLM 쿼리 증강"""
-        prompt = f"""
+    @tracing.traced("augment")
+    async def _aaugment_general_query(self, original_query: str) -> str:
+        """_augment_general_query의 비동기 버전"""
+        try:
+            augmented_query = await self._acomplete(
+                self.engine.llm, self._augmentation_prompt(original_query), str.strip
+            )
+            return f"{original_query}\n\nEnhanced search query: {augmented_query}"
+        except Exception as e:
+            logger.warning("Query augmentation failed: %s", e)
+            return original_query
+
+    def _augmentation_prompt(self, original_query: str) -> str:
+        return f"""
 다음 사용자 질문을 FDA 규제 데이터베이스 검색에 최적화된 영어 쿼리로 변환하고 확장하세요.
 
 사용자 질문: {original_query}
@@ -364,17 +580,6 @@ Answer with ONLY the product name or "None":
 
 변환된 검색 쿼리만 반환하세요 (설명 없이):
 """
-        
-        try:
-            response = Settings.llm.complete(prompt)
-            augmented_query = response.text.strip()
-            
-            # 원본 쿼리와 증강된 쿼리 결합
-            return f"{original_query}\n\nEnhanced search query: {augmented_query}"
-            
-        except Exception as e:
-            print(f"Query augmentation failed: {e}")
-            return original_query
 
     def _augment_query(self, original_query: str, decomposition: dict) -> str:
         """분해된 10개 요소를 모두 활용하는 쿼리 증강"""
@@ -447,63 +652,584 @@ Use the most relevant collections based on the product characteristics above.
         
         return "\n".join(formatted)
 
+    @tracing.traced_request("chat")
     def chat(self, query: str) -> dict:
         """사용자 제안 구조: 제품 질문은 분해, 일반 질문은 LLM 증강"""
         try:
-            product = self._extract_product_name(query)
-            
-            if product:
-                # 제품 질문: 분해 방식
-                print(f"📦 제품 질문 감지: {product}")
-                decomposition = self._decompose_product(product)
-                search_query = query  # 원본 사용
-                print(f"🔬 제품 분해 완료: {decomposition.get('category')}")
-            else:
-                # 일반 질문: LLM 증강 방식
-                print("🔍 일반 질문 감지 - LLM 증강 적용")
-                decomposition = None
-                search_query = self._augment_general_query(query)  # 여기서 증강!
-                print(f"✨ 증강된 쿼리: {search_query[:100]}...")
-                classification = self._classify_question(query)
-                collections = self._select_collections(classification)
-                print(f"🧭 질문 분류 결과: {classification}")
+            request_start = time.perf_counter()
             
-            # orchestrator에 전달 (순수 검색만 담당)
-            from utils.orchestrator import SimpleOrchestrator
-            orchestrator = SimpleOrchestrator()
+            # 이전 대화와 무관한 질문이면 답변 캐시 먼저 조회
+            probe = None
+            if self._answer_cache_enabled():
+                (cached, probe), lookup_ms = self._timed(self._cached_answer, query)
+                if cached is not None:
+                    logger.info("♻️ 답변 캐시 히트")
+                    tracing.annotate(path="cache")
+                    cached["timings"] = {"cache_lookup": lookup_ms, "total": lookup_ms}
+                    self._record_turn(query, cached)
+                    return cached
             
-            if decomposition:
-                # 제품 질문: 분해 기반 컬렉션 선택
-                collections = orchestrator.determine_collections(decomposition)
-            else:
-                # 일반 질문: 기본 컬렉션 사용
-                # 상단에서 분류된 컬렉션이 없는 경우를 대비한 폴백
-                collections = collections if 'collections' in locals() else self.default_collections
+            route = self._route_query(query)
+            timings = route["timings"]
+            if probe is not None:
+                timings["cache_lookup"] = lookup_ms
             
-            print(f"📚 검색할 컬렉션: {collections}")
+            # orchestrator에 전달 (순수 검색만 담당, 엔진 공유 인스턴스)
+            orchestrator = self.engine.orchestrator
             
             # 병렬 검색 실행
-            parallel_results = orchestrator.parallel_search(
-                query=search_query,  # 증강된 또는 원본
-                collections=collections,
-                decomposition=decomposition
+            parallel_results, timings["search"] = self._timed(
+                orchestrator.parallel_search,
+                query=route["search_query"],  # 증강된 또는 원본
+                collections=route["collections"],
+                decomposition=route["decomposition"],
             )
             
-            ranked_results = orchestrator.merge_and_rank(parallel_results)
-            print(f"⚡ 병렬 검색 완료: {parallel_results['search_time']:.2f}초, {len(ranked_results)}개 결과")
+            if "embedding" in parallel_results:
+                timings["embed"] = parallel_results["embedding"]["time"] * 1000
+            ranked_results, timings["merge"] = self._timed(
+                orchestrator.merge_and_rank, parallel_results
+            )
+            logger.info(
+                "⚡ 병렬 검색 완료: %.2f초, %d개 결과",
+                parallel_results["search_time"],
+                len(ranked_results),
+            )
+            ranked_results = self._rerank(query, ranked_results, timings)
             
-            # 결과 충분성 평가 및 응답 생성
-            if self._is_parallel_result_sufficient(ranked_results, decomposition or {}):
+            # 결과 충분성 평가 (부족하면 보강 검색) 및 응답 생성
+            decomposition = route["decomposition"]
+            direct = self._is_parallel_result_sufficient(
+                ranked_results, decomposition or {}
+            )
+            if not direct and self.engine.gap_filler is not None:
+                (ranked_results, direct), timings["gap_fill"] = self._timed(
+                    self._gap_fill, query, route, ranked_results
+                )
+            tracing.annotate(
+                path="direct" if direct else "react_agent", results=len(ranked_results)
+            )
+            if direct:
                 # decomposition 있든 없든, 충분하면 직접 답변
-                print("✅ 병렬 검색 결과만으로 충분 - 직접 답변 생성")
-                return self._generate_direct_response(query, ranked_results, decomposition)
+                logger.info("✅ 병렬 검색 결과만으로 충분 - 직접 답변 생성")
+                result, timings["generation"] = self._timed(
+                    self._generate_direct_response,
+                    query,
+                    ranked_results,
+                    decomposition,
+                    route["search_query"],
+                )
             else:
                 # ReAct Agent로 추가 정보 수집
-                print("🔄 ReAct Agent로 추가 정보 수집")
-                search_summary = self._format_parallel_results(ranked_results)
+                logger.info("🔄 ReAct Agent로 추가 정보 수집")
+                full_query = self._build_agent_query(query, route, ranked_results)
+
+                # Agent로 정보 수집만
+                logger.debug("🔍 Agent 정보 수집 시작...")
+                with tracing.span("react_agent") as span:
+                    agent_response, timings["react_agent"] = self._timed(
+                        self.agent.chat, full_query
+                    )
+                    span.set(tool_calls=len(agent_response.sources))
+                collected_info = str(agent_response)
+
+                # 병렬 검색 + Agent 정보를 합쳐서 최종 답변 생성
+                logger.debug("✅ 정보 수집 완료 - 최종 답변 생성")
+                result, timings["generation"] = self._timed(
+                    self._generate_response_with_agent_info,
+                    query=query,
+                    parallel_results=ranked_results,
+                    agent_info=collected_info,
+                    decomposition=decomposition,
+                    search_query=route["search_query"],
+                )
+
+            timings["total"] = (time.perf_counter() - request_start) * 1000
+            result["timings"] = timings
+            if probe is not None:
+                self._cache_answer(probe, result, route["collections"])
+            self._record_turn(query, result)
+            return result
+
+        except Exception as e:
+            logger.error("Error in chat: %s", e, exc_info=True)
+            tracing.annotate(path="error")
+            return self._fallback_result(query)
+
+    @tracing.traced_request("achat")
+    async def achat(self, query: str) -> dict:
+        """chat()의 비동기 버전: LLM(acomplete)과 Qdrant(AsyncQdrantClient)를 await로 호출"""
+        try:
+            request_start = time.perf_counter()
+
+            probe = None
+            if self._answer_cache_enabled():
+                (cached, probe), lookup_ms = await self._atimed(
+                    self._acached_answer(query)
+                )
+                if cached is not None:
+                    logger.info("♻️ 답변 캐시 히트")
+                    tracing.annotate(path="cache")
+                    cached["timings"] = {"cache_lookup": lookup_ms, "total": lookup_ms}
+                    self._record_turn(query, cached)
+                    return cached
+
+            route = await self._aroute_query(query)
+            timings = route["timings"]
+            if probe is not None:
+                timings["cache_lookup"] = lookup_ms
+
+            orchestrator = self.engine.orchestrator
+            parallel_results, timings["search"] = await self._atimed(
+                orchestrator.aparallel_search(
+                    query=route["search_query"],
+                    collections=route["collections"],
+                    decomposition=route["decomposition"],
+                )
+            )
+
+            if "embedding" in parallel_results:
+                timings["embed"] = parallel_results["embedding"]["time"] * 1000
+            ranked_results, timings["merge"] = self._timed(
+                orchestrator.merge_and_rank, parallel_results
+            )
+            logger.info(
+                "⚡ 병렬 검색 완료: %.2f초, %d개 결과",
+                parallel_results["search_time"],
+                len(ranked_results),
+            )
+            ranked_results = await self._arerank(query, ranked_results, timings)
+
+            decomposition = route["decomposition"]
+            direct = self._is_parallel_result_sufficient(
+                ranked_results, decomposition or {}
+            )
+            if not direct and self.engine.gap_filler is not None:
+                (ranked_results, direct), timings["gap_fill"] = await self._atimed(
+                    self._agap_fill(query, route, ranked_results)
+                )
+            tracing.annotate(
+                path="direct" if direct else "react_agent", results=len(ranked_results)
+            )
+            if direct:
+                logger.info("✅ 병렬 검색 결과만으로 충분 - 직접 답변 생성")
+                result, timings["generation"] = await self._atimed(
+                    self._agenerate_direct_response(
+                        query, ranked_results, decomposition, route["search_query"]
+                    )
+                )
+            else:
+                logger.info("🔄 ReAct Agent로 추가 정보 수집")
+                full_query = self._build_agent_query(query, route, ranked_results)
                 
-                if decomposition:
-                    enhanced_query = f"""
+                logger.debug("🔍 Agent 정보 수집 시작...")
+                with tracing.span("react_agent") as span:
+                    agent_response, timings["react_agent"] = await self._atimed(
+                        self.agent.achat(full_query)
+                    )
+                    span.set(tool_calls=len(agent_response.sources))
+                collected_info = str(agent_response)
+
+                logger.debug("✅ 정보 수집 완료 - 최종 답변 생성")
+                result, timings["generation"] = await self._atimed(
+                    self._agenerate_response_with_agent_info(
+                        query=query,
+                        parallel_results=ranked_results,
+                        agent_info=collected_info,
+                        decomposition=decomposition,
+                        search_query=route["search_query"],
+                    )
+                )
+
+            timings["total"] = (time.perf_counter() - request_start) * 1000
+            result["timings"] = timings
+            if probe is not None:
+                await self._acache_answer(probe, result, route["collections"])
+            self._record_turn(query, result)
+            return result
+
+        except Exception as e:
+            logger.error("Error in chat: %s", e, exc_info=True)
+            tracing.annotate(path="error")
+            return self._fallback_result(query)
+
+    def _answer_cache_enabled(self) -> bool:
+        """답변 캐시는 이전 대화 맥락이 없는 질문에만 사용"""
+        if self.engine.answer_cache is None:
+            return False
+        return not self.has_state()
+
+    def _cached_answer(self, query: str):
+        """(캐시된 결과 또는 None, 저장용 probe). 캐시 오류는 미스로 처리"""
+        try:
+            return self.engine.answer_cache.lookup(query)
+        except Exception as e:
+            logger.warning("⚠️ 답변 캐시 조회 실패: %s", e)
+            return None, None
+
+    async def _acached_answer(self, query: str):
+        """_cached_answer의 비동기 버전"""
+        try:
+            return await self.engine.answer_cache.alookup(query)
+        except Exception as e:
+            logger.warning("⚠️ 답변 캐시 조회 실패: %s", e)
+            return None, None
+
+    def _cache_answer(self, probe, result: dict, collections: List[str]):
+        try:
+            self.engine.answer_cache.store(probe, result, collections)
+        except Exception as e:
+            logger.warning("⚠️ 답변 캐시 저장 실패: %s", e)
+
+    async def _acache_answer(self, probe, result: dict, collections: List[str]):
+        try:
+            await self.engine.answer_cache.astore(probe, result, collections)
+        except Exception as e:
+            logger.warning("⚠️ 답변 캐시 저장 실패: %s", e)
+
+    @staticmethod
+    def _timed(fn, *args, **kwargs):
+        """fn 실행 결과와 소요 시간(ms) 반환"""
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    async def _atimed(awaitable):
+        """awaitable 결과와 소요 시간(ms) 반환"""
+        start = time.perf_counter()
+        result = await awaitable
+        return result, (time.perf_counter() - start) * 1000
+
+    def _rerank(self, query: str, results: List[Dict], timings: dict) -> List[Dict]:
+        """CrossEncoder 재순위화 (엔진에 재순위화기가 있을 때만)"""
+        if self.engine.reranker is None:
+            return results
+        with tracing.span("rerank", candidates=len(results)):
+            reranked, timings["rerank"] = self._timed(
+                self.engine.reranker.rerank, query, results
+            )
+        return reranked
+
+    async def _arerank(
+        self, query: str, results: List[Dict], timings: dict
+    ) -> List[Dict]:
+        """_rerank의 비동기 버전 (CPU 추론은 이벤트 루프 밖 스레드에서)"""
+        if self.engine.reranker is None:
+            return results
+        with tracing.span("rerank", candidates=len(results)):
+            reranked, timings["rerank"] = await self._atimed(
+                asyncio.to_thread(self.engine.reranker.rerank, query, results)
+            )
+        return reranked
+
+    def _fast_route(self, query: str):
+        """규칙 라우터로 확신할 수 있으면 (QueryAnalysis, 소요 시간), 아니면 None"""
+        if self.engine.fast_router is None:
+            return None
+        with tracing.span("fast_route") as span:
+            analysis, elapsed = self._timed(self.engine.fast_router.route, query)
+            span.set(hit=analysis is not None)
+        if analysis is None:
+            return None
+        logger.debug("⚡ %s (%.2fms)", analysis.reason, elapsed)
+        return analysis, elapsed
+
+    @tracing.traced("route")
+    def _route_query(self, query: str) -> dict:
+        """검색 전 단계: 규칙 라우팅 → 통합 질문 분석 (실패 시 개별 단계로 폴백)"""
+        route_start = time.perf_counter()
+        fast = self._fast_route(query)
+        if fast is not None:
+            analysis, elapsed = fast
+            return self._route_from_analysis(
+                query, analysis, {"fast_route": elapsed}, route_start
+            )
+        if self.query_analysis_mode == "combined":
+            local = self._local_classify(query)
+            analysis, elapsed = self._timed(self._analyze_query, query, local is None)
+            if analysis is not None:
+                analysis = self._merge_local_classification(query, analysis, local)
+                return self._route_from_analysis(
+                    query, analysis, {"analyze": elapsed}, route_start
+                )
+            logger.warning("⚠️ 통합 질문 분석 실패 - 개별 단계로 폴백")
+        return self._route_query_legacy(query)
+
+    @tracing.traced("route")
+    async def _aroute_query(self, query: str) -> dict:
+        """_route_query의 비동기 버전"""
+        route_start = time.perf_counter()
+        fast = self._fast_route(query)
+        if fast is not None:
+            analysis, elapsed = fast
+            return await self._aroute_from_analysis(
+                query, analysis, {"fast_route": elapsed}, route_start
+            )
+        if self.query_analysis_mode == "combined":
+            local = self._local_classify(query)
+            analysis, elapsed = await self._atimed(
+                self._aanalyze_query(query, local is None)
+            )
+            if analysis is not None:
+                analysis = self._merge_local_classification(query, analysis, local)
+                return await self._aroute_from_analysis(
+                    query, analysis, {"analyze": elapsed}, route_start
+                )
+            logger.warning("⚠️ 통합 질문 분석 실패 - 개별 단계로 폴백")
+        return await self._aroute_query_legacy(query)
+
+    def _merge_local_classification(
+        self, query: str, analysis: QueryAnalysis, local: dict
+    ) -> QueryAnalysis:
+        """로컬 분류기가 확신한 경우 그 컬렉션을 쓰고, 아니면 LLM 분류를 학습 로그에 기록"""
+        if local is None:
+            self._log_classification(
+                query,
+                self._sanitize_collections(analysis.collections),
+                analysis.category,
+                "analysis",
+            )
+            return analysis
+        return analysis.model_copy(
+            update={
+                "category": local["category"],
+                "collections": local["collections"],
+                "reason": local["reason"],
+            }
+        )
+
+    def _route_from_analysis(
+        self, query: str, analysis: QueryAnalysis, timings: dict, route_start: float
+    ) -> dict:
+        """통합 분석 결과로 라우팅 (누락된 필드는 기존 단계별 폴백 적용)"""
+        if analysis.product_name:
+            logger.debug("📦 제품 질문 감지: %s", analysis.product_name)
+            decomposition, timings["decompose"] = self._timed(
+                self._decompose_product, analysis.product_name
+            )
+            logger.debug("🔬 제품 분해 완료: %s", decomposition.get("category"))
+            route = self._product_route(query, decomposition)
+        else:
+            logger.debug("🔍 일반 질문 감지 - 통합 분석 증강 적용")
+            if analysis.augmented_query:
+                search_query = (
+                    f"{query}\n\nEnhanced search query: {analysis.augmented_query}"
+                )
+            else:
+                search_query, timings["augment"] = self._timed(
+                    self._augment_general_query, query
+                )
+            logger.debug("✨ 증강된 쿼리: %.100s...", search_query)
+            route = self._general_route(
+                search_query, self._classification_from_analysis(analysis)
+            )
+
+        timings["pre_retrieval"] = (time.perf_counter() - route_start) * 1000
+        route["timings"] = timings
+        return route
+
+    async def _aroute_from_analysis(
+        self, query: str, analysis: QueryAnalysis, timings: dict, route_start: float
+    ) -> dict:
+        """_route_from_analysis의 비동기 버전"""
+        if analysis.product_name:
+            logger.debug("📦 제품 질문 감지: %s", analysis.product_name)
+            decomposition, timings["decompose"] = await self._atimed(
+                self._adecompose_product(analysis.product_name)
+            )
+            logger.debug("🔬 제품 분해 완료: %s", decomposition.get("category"))
+            route = self._product_route(query, decomposition)
+        else:
+            logger.debug("🔍 일반 질문 감지 - 통합 분석 증강 적용")
+            if analysis.augmented_query:
+                search_query = (
+                    f"{query}\n\nEnhanced search query: {analysis.augmented_query}"
+                )
+            else:
+                search_query, timings["augment"] = await self._atimed(
+                    self._aaugment_general_query(query)
+                )
+            logger.debug("✨ 증강된 쿼리: %.100s...", search_query)
+            route = self._general_route(
+                search_query, self._classification_from_analysis(analysis)
+            )
+
+        timings["pre_retrieval"] = (time.perf_counter() - route_start) * 1000
+        route["timings"] = timings
+        return route
+
+    def _classification_from_analysis(self, analysis: QueryAnalysis) -> dict:
+        """통합 분석 결과를 _classify_question 형식으로 변환 (빈 컬렉션은 기본값)"""
+        return {
+            "category": analysis.category or "OTHER",
+            "collections": self._sanitize_collections(analysis.collections)
+            or self.default_collections,
+            "reason": analysis.reason or "combined analysis",
+        }
+
+    @tracing.traced("analyze")
+    def _analyze_query(self, query: str, classify: bool = True) -> QueryAnalysis:
+        """제품명/증강 쿼리/분류를 한 번의 LLM 호출로 분석 (실패 시 None, classify=False면 분류 생략)"""
+        prompt = build_query_analysis_prompt(query, classify)
+        for attempt in range(2):
+            try:
+                return self._complete(
+                    self.engine.analysis_llm, prompt, parse_query_analysis
+                )
+            except Exception as e:
+                logger.warning("Query analysis attempt %d failed: %s", attempt + 1, e)
+        return None
+
+    @tracing.traced("analyze")
+    async def _aanalyze_query(self, query: str, classify: bool = True) -> QueryAnalysis:
+        """_analyze_query의 비동기 버전"""
+        prompt = build_query_analysis_prompt(query, classify)
+        for attempt in range(2):
+            try:
+                return await self._acomplete(
+                    self.engine.analysis_llm, prompt, parse_query_analysis
+                )
+            except Exception as e:
+                logger.warning("Query analysis attempt %d failed: %s", attempt + 1, e)
+        return None
+
+    def _route_query_legacy(self, query: str) -> dict:
+        """개별 단계 방식: 제품 질문은 분해, 일반 질문은 증강 + 분류
+
+        제품명 추출/증강/분류는 서로 독립적이므로 동시에 시작하고,
+        제품이 감지되면 곧바로 분해를 시작하며 일반 질문용 결과는 버린다.
+        """
+        route_start = time.perf_counter()
+        timings = {}
+
+        if SPECULATIVE_ROUTING:
+            pool = self.engine.executor
+            extract_future = pool.submit(
+                tracing.bind(self._timed), self._extract_product_name, query
+            )
+            augment_future = pool.submit(
+                tracing.bind(self._timed), self._augment_general_query, query
+            )
+            classify_future = pool.submit(
+                tracing.bind(self._timed), self._classify_question, query
+            )
+            product, timings["extract_product"] = extract_future.result()
+        else:
+            product, timings["extract_product"] = self._timed(
+                self._extract_product_name, query
+            )
+
+        if product:
+            # 제품 질문: 분해 방식
+            if SPECULATIVE_ROUTING:
+                augment_future.cancel()
+                classify_future.cancel()
+            logger.debug("📦 제품 질문 감지: %s", product)
+            decomposition, timings["decompose"] = self._timed(
+                self._decompose_product, product
+            )
+            logger.debug("🔬 제품 분해 완료: %s", decomposition.get("category"))
+            route = self._product_route(query, decomposition)
+        else:
+            # 일반 질문: LLM 증강 방식
+            logger.debug("🔍 일반 질문 감지 - LLM 증강 적용")
+            if SPECULATIVE_ROUTING:
+                search_query, timings["augment"] = augment_future.result()
+                classification, timings["classify"] = classify_future.result()
+            else:
+                # 여기서 증강!
+                search_query, timings["augment"] = self._timed(
+                    self._augment_general_query, query
+                )
+                classification, timings["classify"] = self._timed(
+                    self._classify_question, query
+                )
+            logger.debug("✨ 증강된 쿼리: %.100s...", search_query)
+            route = self._general_route(search_query, classification)
+
+        timings["pre_retrieval"] = (time.perf_counter() - route_start) * 1000
+        route["timings"] = timings
+        return route
+
+    async def _aroute_query_legacy(self, query: str) -> dict:
+        """_route_query_legacy의 비동기 버전 (asyncio 태스크로 동시 실행, 제품 질문이면 나머지 취소)"""
+        route_start = time.perf_counter()
+        timings = {}
+
+        if SPECULATIVE_ROUTING:
+            augment_task = asyncio.create_task(
+                self._atimed(self._aaugment_general_query(query))
+            )
+            classify_task = asyncio.create_task(
+                self._atimed(self._aclassify_question(query))
+            )
+        product, timings["extract_product"] = await self._atimed(
+            self._aextract_product_name(query)
+        )
+
+        if product:
+            if SPECULATIVE_ROUTING:
+                augment_task.cancel()
+                classify_task.cancel()
+            logger.debug("📦 제품 질문 감지: %s", product)
+            decomposition, timings["decompose"] = await self._atimed(
+                self._adecompose_product(product)
+            )
+            logger.debug("🔬 제품 분해 완료: %s", decomposition.get("category"))
+            route = self._product_route(query, decomposition)
+        else:
+            logger.debug("🔍 일반 질문 감지 - LLM 증강 적용")
+            if SPECULATIVE_ROUTING:
+                (search_query, timings["augment"]), (
+                    classification,
+                    timings["classify"],
+                ) = await asyncio.gather(augment_task, classify_task)
+            else:
+                search_query, timings["augment"] = await self._atimed(
+                    self._aaugment_general_query(query)
+                )
+                classification, timings["classify"] = await self._atimed(
+                    self._aclassify_question(query)
+                )
+            logger.debug("✨ 증강된 쿼리: %.100s...", search_query)
+            route = self._general_route(search_query, classification)
+
+        timings["pre_retrieval"] = (time.perf_counter() - route_start) * 1000
+        route["timings"] = timings
+        return route
+
+    def _product_route(self, query: str, decomposition: dict) -> dict:
+        # 제품 질문: 원본 쿼리 + 분해 기반 컬렉션 선택
+        collections = self.engine.orchestrator.determine_collections(decomposition)
+        logger.debug("📚 검색할 컬렉션: %s", collections)
+        return {
+            "decomposition": decomposition,
+            "search_query": query,
+            "collections": collections,
+        }
+
+    def _general_route(self, search_query: str, classification: dict) -> dict:
+        # 일반 질문: 분류된 컬렉션 (없으면 기본 컬렉션)
+        collections = self._select_collections(classification)
+        logger.debug(
+            "🧭 질문 분류 결과: %s, 검색할 컬렉션: %s", classification, collections
+        )
+        return {
+            "decomposition": None,
+            "search_query": search_query,
+            "collections": collections,
+        }
+
+    def _build_agent_query(
+        self, query: str, route: dict, ranked_results: List[Dict]
+    ) -> str:
+        """ReAct Agent에 넘길 정보 수집 프롬프트 (이전 대화 컨텍스트 포함)"""
+        search_summary = self._format_parallel_results(ranked_results)
+        decomposition = route["decomposition"]
+
+        if decomposition:
+            enhanced_query = f"""
 {self._augment_query(query, decomposition)}
 
 ## 검색된 FDA 문서들
@@ -512,9 +1238,9 @@ Use the most relevant collections based on the product characteristics above.
 위 정보를 활용하고, 부족한 부분만 추가 검색하세요.
 정보 수집만 하고, 최종 답변은 생성하지 마세요.
 """
-                else:
-                    enhanced_query = f"""
-{search_query}
+        else:
+            enhanced_query = f"""
+{route["search_query"]}
 
 ## 검색된 FDA 문서들
 {search_summary}
@@ -522,37 +1248,119 @@ Use the most relevant collections based on the product characteristics above.
 위 정보를 활용하고, 부족한 부분만 추가 검색하세요.
 정보 수집만 하고, 최종 답변은 생성하지 마세요.
 """
-                
-                context = self.memory.get_context_for_agent()
-                full_query = f"{context}\n{enhanced_query}" if context else enhanced_query
-                
-                # Agent로 정보 수집만
-                print("🔍 Agent 정보 수집 시작...")
-                agent_response = self.agent.chat(full_query)
-                collected_info = str(agent_response)
-                
-                # 병렬 검색 + Agent 정보를 합쳐서 최종 답변 생성
-                print("✅ 정보 수집 완료 - 최종 답변 생성")
-                return self._generate_response_with_agent_info(
-                    query=query,
-                    parallel_results=ranked_results,
-                    agent_info=collected_info,
-                    decomposition=decomposition
-                )
-            
-        except Exception as e:
-            print(f"Error in chat: {e}")
-            fallback = self._generate_fallback_response(query)
-            return {
-                "content": fallback,
-                "cfr_references": [],
-                "sources": [],
-                "keywords": []
-            }
 
+        context = self.memory.get_context_for_agent()
+        return f"{context}\n{enhanced_query}" if context else enhanced_query
+
+    def _fallback_result(self, query: str) -> dict:
+        """파이프라인 오류 시 반환할 기본 응답"""
+        fallback = self._generate_fallback_response(query)
+        return {
+            "content": fallback,
+            "cfr_references": [],
+            "sources": [],
+            "keywords": [],
+        }
+
+    @tracing.traced("classify")
     def _classify_question(self, query: str) -> dict:
         """LLM을 활용하여 질문 유형과 적합한 컬렉션을 동적으로 결정"""
-        prompt = f"""
+        prompt = self._classification_prompt(query)
+
+        local = self._local_classify(query)
+        if local is not None:
+            return local
+
+        for attempt in range(2):
+            try:
+                classification = self._complete(
+                    self.collection_classifier_llm, prompt, self._parse_classification
+                )
+            except Exception as e:
+                logger.warning(
+                    "Question classification attempt %d failed: %s", attempt + 1, e
+                )
+                continue
+            self._log_classification(
+                query,
+                classification["collections"],
+                classification.get("category"),
+                "classifier",
+            )
+            return classification
+
+        return {
+            "category": "OTHER",
+            "collections": self.default_collections,
+            "reason": "fallback",
+        }
+
+    @tracing.traced("classify")
+    async def _aclassify_question(self, query: str) -> dict:
+        """_classify_question의 비동기 버전"""
+        prompt = self._classification_prompt(query)
+
+        local = self._local_classify(query)
+        if local is not None:
+            return local
+
+        for attempt in range(2):
+            try:
+                classification = await self._acomplete(
+                    self.collection_classifier_llm, prompt, self._parse_classification
+                )
+            except Exception as e:
+                logger.warning(
+                    "Question classification attempt %d failed: %s", attempt + 1, e
+                )
+                continue
+            self._log_classification(
+                query,
+                classification["collections"],
+                classification.get("category"),
+                "classifier",
+            )
+            return classification
+
+        return {
+            "category": "OTHER",
+            "collections": self.default_collections,
+            "reason": "fallback",
+        }
+
+    def _local_classify(self, query: str):
+        """로컬 분류기가 확신하면 분류 결과, 아니면 None (LLM 분류로 폴백)"""
+        if self.engine.local_router is None:
+            return None
+        try:
+            classification = self.engine.local_router.classify(query)
+        except Exception as e:
+            logger.warning("⚠️ 로컬 분류기 실패: %s", e)
+            return None
+        if classification is not None:
+            classification["collections"] = self._sanitize_collections(
+                classification["collections"]
+            )
+            if classification["collections"]:
+                logger.debug(
+                    "🧠 %s: %s", classification["reason"], classification["collections"]
+                )
+                return classification
+        return None
+
+    def _log_classification(
+        self, query: str, collections: List[str], category: str, source: str
+    ):
+        """LLM 분류 결과를 로컬 분류기 학습 로그에 기록 (FDA_ROUTING_LOG)"""
+        if self.engine.routing_log is None or not collections:
+            return
+        try:
+            self.engine.routing_log.append(query, collections, category, source)
+        except Exception as e:
+            logger.warning("⚠️ 분류 로그 기록 실패: %s", e)
+
+    def _classification_prompt(self, query: str) -> str:
+        return f"""
 You are an assistant that routes FDA-related questions to the most relevant document collections.
 
 Available collections:
@@ -587,32 +1395,24 @@ Rules:
 Question: "{query}"
 """
 
-        for attempt in range(2):
-            try:
-                response = self.collection_classifier_llm.complete(prompt)
-                raw = response.text.strip()
-
-                # 코드 블록 제거
-                if raw.startswith("```"):
-                    raw = raw.strip("`").strip()
-                    if raw.lower().startswith('json'):
-                        raw = raw[4:].strip()
+    def _parse_classification(self, text: str) -> dict:
+        raw = text.strip()
 
-                classification = json.loads(raw)
+        # 코드 블록 제거
+        if raw.startswith("```"):
+            raw = raw.strip("`").strip()
+            if raw.lower().startswith("json"):
+                raw = raw[4:].strip()
 
-                collections = classification.get('collections', [])
-                classification['collections'] = self._sanitize_collections(collections)
+        classification = json.loads(raw)
 
-                if not classification['collections']:
-                    classification['collections'] = self.default_collections
+        collections = classification.get("collections", [])
+        classification["collections"] = self._sanitize_collections(collections)
 
-                return classification
-
-            except Exception as e:
-                print(f"Question classification attempt {attempt + 1} failed: {e}")
-                continue
+        if not classification["collections"]:
+            classification["collections"] = self.default_collections
 
-        return {"category": "OTHER", "collections": self.default_collections, "reason": "fallback"}
+        return classification
 
     def _sanitize_collections(self, collections: List[str]) -> List[str]:
         """허용된 컬렉션만 남기고 중복 제거"""
@@ -639,35 +1439,184 @@ Question: "{query}"
 
         return self.default_collections
 
+    @tracing.traced("sufficiency")
     def _is_parallel_result_sufficient(self, results: List[Dict], decomposition: dict) -> bool:
         """병렬 검색 결과의 충분성 평가 (단순화된 품질 중심 기준)"""
-        print(f"\n🔍 충분성 평가 시작")
-        print(f"  - 전체 결과 개수: {len(results)}")
-        
         if not results or len(results) < 2:
-            print(f"  ❌ 결과 부족: {len(results)}개")
+            logger.debug("🔍 충분성 평가: ❌ 결과 부족 (%d개)", len(results))
             return False
         
         avg_score = sum(r['score'] for r in results) / len(results)
         max_score = max(r['score'] for r in results)
-        print(f"  - 평균 점수: {avg_score:.3f} (임계값: 0.65)")
-        print(f"  - 최고 점수: {max_score:.3f}")
         
         if avg_score < 0.65:
-            unique_collections = set(r['collection'] for r in results)
             if max_score >= 0.75 and len(results) >= 2:
-                print(f"  ✅ 예외 통과: 고품질 결과 (최고 {max_score:.3f})")
+                logger.debug(
+                    "🔍 충분성 평가: ✅ 예외 통과 - 고품질 결과 (평균 %.3f, 최고 %.3f)",
+                    avg_score,
+                    max_score,
+                )
                 return True
-            print(f"  ❌ 평균 점수 부족")
+            # 하이브리드 검색: 질문의 식별자(21 CFR 101.4, GRN 1023 등)가 문서에 그대로 있으면 통과
+            exact = [r for r in results if r.get("exact_match")]
+            if exact:
+                logger.debug(
+                    "🔍 충분성 평가: ✅ 예외 통과 - 식별자 정확 일치 %d개", len(exact)
+                )
+                return True
+            logger.debug(
+                "🔍 충분성 평가: ❌ 평균 점수 부족 (%d개, 평균 %.3f < 0.65, 최고 %.3f)",
+                len(results),
+                avg_score,
+                max_score,
+            )
             return False
-        
-        unique_collections = set(r['collection'] for r in results)
-        print(f"  - 컬렉션 다양성: {len(unique_collections)}개 {list(unique_collections)}")
-        print(f"  ✅ 충분성 평가 통과!\n")
+
+        logger.debug(
+            "🔍 충분성 평가: ✅ 통과 (%d개, 평균 %.3f, 최고 %.3f, 컬렉션 %d개)",
+            len(results),
+            avg_score,
+            max_score,
+            len({r["collection"] for r in results}),
+        )
         return True
 
-    def _generate_direct_response(self, query: str, results: List[Dict], decomposition: dict) -> dict:
+    @tracing.traced("gap_fill")
+    def _gap_fill(self, query: str, route: dict, results: List[Dict]):
+        """보강 검색 후 (결과, 직접 답변 여부) - 여전히 부족하면 FDA_GAPFILL_REACT=1일 때만 ReAct"""
+        results, report = self.engine.gap_filler.fill(query, route, results)
+        return results, self._accept_gap_fill(route, results, report)
+
+    @tracing.traced("gap_fill")
+    async def _agap_fill(self, query: str, route: dict, results: List[Dict]):
+        """_gap_fill의 비동기 버전"""
+        results, report = await self.engine.gap_filler.afill(query, route, results)
+        return results, self._accept_gap_fill(route, results, report)
+
+    def _accept_gap_fill(self, route: dict, results: List[Dict], report: dict) -> bool:
+        tracing.annotate(
+            gaps=",".join(report["gaps"]),
+            queries=report["queries"],
+            added=report["added"],
+        )
+        logger.info(
+            "🧩 보강 검색: 관점 %s, 쿼리 %d개, 결과 +%d개 (%.0fms%s)",
+            report["gaps"],
+            report["queries"],
+            report["added"],
+            report["elapsed_ms"],
+            ", 시간 예산 초과" if report["timed_out"] else "",
+        )
+        if self._is_parallel_result_sufficient(results, route["decomposition"] or {}):
+            return True
+        # 결과가 하나도 없으면 ReAct 툴 검색에 맡김
+        return bool(results) and not self.engine.gap_fill_react
+
+    @tracing.traced("generation")
+    def _generate_direct_response(
+        self,
+        query: str,
+        results: List[Dict],
+        decomposition: dict,
+        search_query: str = None,
+    ) -> dict:
         """병렬 검색 결과만으로 직접 답변 생성 (제품 질문과 일반 질문 모두 지원)"""
+        prompt, citations = self._build_direct_prompt(
+            query, results, decomposition, search_query
+        )
+        response = self.engine.llm.complete(prompt)
+        tracing.annotate_tokens(
+            prompt, response.text, model=self._model_name(self.engine.llm)
+        )
+        return self._finalize_direct_response(response.text, citations, results)
+
+    @tracing.traced("generation")
+    async def _agenerate_direct_response(
+        self,
+        query: str,
+        results: List[Dict],
+        decomposition: dict,
+        search_query: str = None,
+    ) -> dict:
+        """_generate_direct_response의 비동기 버전"""
+        prompt, citations = self._build_direct_prompt(
+            query, results, decomposition, search_query
+        )
+        response = await self.engine.llm.acomplete(prompt)
+        tracing.annotate_tokens(
+            prompt, response.text, model=self._model_name(self.engine.llm)
+        )
+        return self._finalize_direct_response(response.text, citations, results)
+
+    def _pack_context(
+        self,
+        query: str,
+        results: List[Dict],
+        decomposition: dict,
+        search_query: str = None,
+        agent_info: str = None,
+    ):
+        """토큰 예산에 맞춰 답변 프롬프트용 검색 결과/Agent 정보 압축 (비활성화 시 그대로)"""
+        builder = self.engine.context_builder
+        if builder is None:
+            return results, agent_info
+        relevance = " ".join(
+            filter(
+                None,
+                [
+                    query,
+                    search_query,
+                    compact_decomposition(decomposition) if decomposition else None,
+                ],
+            )
+        )
+        packed = builder.build(results, relevance, agent_info)
+        stats = packed["stats"]
+        logger.debug(
+            "🧮 컨텍스트 압축: 문서 %d→%d개 (중복 %d개), 문서 토큰 %d→%d, Agent 토큰 %d→%d",
+            stats["docs_before"],
+            stats["docs_after"],
+            stats["duplicates_dropped"],
+            stats["doc_tokens_before"],
+            stats["doc_tokens_after"],
+            stats["agent_tokens_before"],
+            stats["agent_tokens_after"],
+        )
+        return packed["results"], packed["agent_info"]
+
+    def _format_decomposition(self, decomposition: dict) -> str:
+        """프롬프트용 제품 특성 (컨텍스트 압축 시 빈 값을 뺀 한 줄 JSON)"""
+        if self.engine.context_builder is None:
+            return json.dumps(decomposition, indent=2, ensure_ascii=False)
+        return compact_decomposition(decomposition)
+
+    @staticmethod
+    def _format_source_list(citations: List[Dict]) -> str:
+        """프롬프트용 출처 목록 (병합된 중복 문서의 컬렉션도 표시)"""
+        lines = []
+        for c in citations:
+            line = f"[출처 {c['index']}] {c['collection']}: {c['title'][:80]}"
+            also_in = sorted(
+                {
+                    d["collection"]
+                    for d in c.get("also_in", [])
+                    if d["collection"] != c["collection"]
+                }
+            )
+            if also_in:
+                line += f" (동일 내용: {', '.join(also_in)})"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _build_direct_prompt(
+        self,
+        query: str,
+        results: List[Dict],
+        decomposition: dict,
+        search_query: str = None,
+    ):
+        """직접 답변용 프롬프트와 citations 생성"""
+        results, _ = self._pack_context(query, results, decomposition, search_query)
         
         # 출처 번호 매핑 생성
         citations = []
@@ -693,21 +1642,23 @@ Question: "{query}"
                     url = f"https://www.accessdata.fda.gov/cms_ia/country_KR.html"
                 elif r['collection'] == 'usc':
                     url = f"https://www.law.cornell.edu/uscode/text/21"
-            
-            citations.append({
-                "index": i,
-                "collection": r['collection'],
-                "title": title,
-                "url": url,
-                "score": r['score'],
-                "content": r.get('text', '')  # ⭐ 평가용: 문서 내용 추가
-            })
-        
+
+            citations.append(
+                {
+                    "index": i,
+                    "collection": r["collection"],
+                    "title": title,
+                    "url": url,
+                    "score": r["score"],
+                    "content": r.get("text", ""),  # ⭐ 평가용: 문서 내용 추가
+                    "also_in": r.get(
+                        "duplicates", []
+                    ),  # 같은 내용이 있는 다른 컬렉션 문서
+                }
+            )
+
         # 출처 리스트 (프롬프트용)
-        source_list = "\n".join([
-            f"[출처 {c['index']}] {c['collection']}: {c['title'][:80]}"
-            for c in citations
-        ])
+        source_list = self._format_source_list(citations)
         
         # 전체 검색 결과를 풍부하게 전달
         full_context = "\n\n".join([
@@ -717,25 +1668,15 @@ Question: "{query}"
             for i, r in enumerate(results[:10])
         ])
         
-        # 🆕 디버깅 출력 추가
-        print("\n" + "="*60)
-        print("🔍 검색된 문서 내용 (디버깅)")
-        print("="*60)
-        for i, r in enumerate(results[:2], 1):
-            text_content = r.get('text', '')
-            print(f"\n[출처 {i}] {r['collection'].upper()} (점수: {r['score']:.3f})")
-            print(f"제목: {r.get('title', 'N/A')}")
-            print(f"📏 원본 텍스트 길이: {len(text_content)}자")  # ⬅️ 핵심!
-            print(f"내용 (첫 500자): {text_content[:2000]}")
-            print()
-        print("="*60 + "\n")
+        # 검색 문서 본문은 DEBUG + 샘플링된 요청에서만 (FDA_LOG_PAYLOAD_CHARS자까지)
+        verbose(logger, "🔍 검색된 문서 내용 (디버깅)", full_context)
         
         if decomposition:
             prompt = f"""
 사용자 질문: {query}
 
 제품 특성:
-{json.dumps(decomposition, indent=2, ensure_ascii=False)}
+{self._format_decomposition(decomposition)}
 
 📖 문서 컨텍스트 (각 내용 앞의 [출처 N]을 보고 주석을 달아야 함):
 {full_context}
@@ -793,34 +1734,93 @@ A: X는 ...을 의미합니다[1]. 여기에는 A, B, C, D, E가 포함됩니다
 한국어로 명확하고 구체적인 답변을 제공하세요.
 """
         
-        response = Settings.llm.complete(prompt)
-        
-        print(f"\n📋 Citations 생성 완료:")
-        print(f"  - 총 {len(citations)}개 citations 생성")
-        for c in citations:
-            print(f"    [{c['index']}] {c['collection']}: {c['title'][:50]}...")
+        return prompt, citations
+
+    @staticmethod
+    def _log_citations(citations: List[Dict]):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📋 Citations:\n%s",
+                "\n".join(
+                    f"    [{c['index']}] {c['collection']}: {c['title'][:50]}..."
+                    for c in citations
+                ),
+            )
+
+    def _finalize_direct_response(
+        self, text: str, citations: List[Dict], results: List[Dict]
+    ) -> dict:
+        """LLM 답변 텍스트 + citations를 API 응답 형태로 정리"""
+        logger.info(
+            "✅ 답변 생성 완료: %d자, citations %d개", len(text), len(citations)
+        )
+        self._log_citations(citations)
         
         return {
-            "content": response.text,
+            "content": text,
             "citations": citations,
             "cfr_references": [],
             "sources": [c['title'] for c in citations[:5]],
             "keywords": list(set(r['collection'] for r in results))
         }
 
+    @tracing.traced("generation")
     def _generate_response_with_agent_info(
         self, 
         query: str, 
         parallel_results: List[Dict],
         agent_info: str,
-        decomposition: dict
+        decomposition: dict,
+        search_query: str = None,
     ) -> dict:
         """병렬 검색 + Agent 수집 정보를 종합하여 답변 생성"""
-        
-        print("\n" + "="*60)
-        print("📝 최종 답변 생성 시작")
-        print("="*60)
-        
+        prompt, citations = self._build_agent_info_prompt(
+            query, parallel_results, agent_info, decomposition, search_query
+        )
+
+        # 단일 LLM 호출로 최종 답변 생성
+        response = self.engine.llm.complete(prompt)
+        tracing.annotate_tokens(
+            prompt, response.text, model=self._model_name(self.engine.llm)
+        )
+        return self._finalize_agent_info_response(
+            response.text, citations, parallel_results
+        )
+
+    @tracing.traced("generation")
+    async def _agenerate_response_with_agent_info(
+        self,
+        query: str,
+        parallel_results: List[Dict],
+        agent_info: str,
+        decomposition: dict,
+        search_query: str = None,
+    ) -> dict:
+        """_generate_response_with_agent_info의 비동기 버전"""
+        prompt, citations = self._build_agent_info_prompt(
+            query, parallel_results, agent_info, decomposition, search_query
+        )
+        response = await self.engine.llm.acomplete(prompt)
+        tracing.annotate_tokens(
+            prompt, response.text, model=self._model_name(self.engine.llm)
+        )
+        return self._finalize_agent_info_response(
+            response.text, citations, parallel_results
+        )
+
+    def _build_agent_info_prompt(
+        self,
+        query: str,
+        parallel_results: List[Dict],
+        agent_info: str,
+        decomposition: dict,
+        search_query: str = None,
+    ):
+        """병렬 검색 + Agent 정보 통합 프롬프트와 citations 생성"""
+        parallel_results, agent_info = self._pack_context(
+            query, parallel_results, decomposition, search_query, agent_info
+        )
+
         # 출처 번호 매핑 생성
         citations = []
         for i, r in enumerate(parallel_results[:10], 1):
@@ -845,21 +1845,23 @@ A: X는 ...을 의미합니다[1]. 여기에는 A, B, C, D, E가 포함됩니다
                     url = f"https://www.fda.gov/import-alerts"
                 elif r['collection'] == 'usc':
                     url = f"https://www.law.cornell.edu/uscode/text/21"
-            
-            citations.append({
-                "index": i,
-                "collection": r['collection'],
-                "title": title,
-                "url": url,
-                "score": r['score'],
-                "content": r.get('text', '')  # ⭐ 평가용: 문서 내용 추가
-            })
-        
+
+            citations.append(
+                {
+                    "index": i,
+                    "collection": r["collection"],
+                    "title": title,
+                    "url": url,
+                    "score": r["score"],
+                    "content": r.get("text", ""),  # ⭐ 평가용: 문서 내용 추가
+                    "also_in": r.get(
+                        "duplicates", []
+                    ),  # 같은 내용이 있는 다른 컬렉션 문서
+                }
+            )
+
         # 출처 리스트 (프롬프트용)
-        source_list = "\n".join([
-            f"[출처 {c['index']}] {c['collection']}: {c['title'][:80]}"
-            for c in citations
-        ])
+        source_list = self._format_source_list(citations)
         
         # 병렬 검색 결과 정리 (Streamlit 스타일)
         parallel_context = "\n\n".join([
@@ -868,19 +1870,21 @@ A: X는 ...을 의미합니다[1]. 여기에는 A, B, C, D, E가 포함됩니다
             f"내용: {r.get('text', '')[:10000]}"  # ⭐ 5000 → 10000자로 증가
             for i, r in enumerate(parallel_results[:10])
         ])
-        
-        print(f"📊 입력 정보:")
-        print(f"  - 병렬 검색 결과: {len(parallel_results)}개")
-        print(f"  - Agent 수집 정보: {len(agent_info)}자")
-        print(f"  - 총 컨텍스트: {len(parallel_context) + len(agent_info)}자")
-        
+
+        logger.debug(
+            "📊 입력 정보: 병렬 검색 결과 %d개, Agent 수집 정보 %d자, 총 컨텍스트 %d자",
+            len(parallel_results),
+            len(agent_info),
+            len(parallel_context) + len(agent_info),
+        )
+
         # 통합 프롬프트
         if decomposition:
             prompt = f"""
 사용자 질문: {query}
 
 제품 특성:
-{json.dumps(decomposition, indent=2, ensure_ascii=False)}
+{self._format_decomposition(decomposition)}
 
 📖 문서 컨텍스트 (각 내용 앞의 [출처 N]을 보고 주석을 달아야 함):
 {parallel_context}
@@ -944,29 +1948,29 @@ A: X는 ...을 의미합니다[1]. 여기에는 A, B, C, D, E가 포함됩니다
 한국어로 명확하고 구체적인 답변을 제공하세요.
 """
         
-        print(f"\n🤖 LLM 호출 중... (프롬프트: {len(prompt)}자)")
-        
-        # 단일 LLM 호출로 최종 답변 생성
-        response = Settings.llm.complete(prompt)
-        
-        print(f"\n✅ 최종 답변 생성 완료!")
-        print(f"  - 답변 길이: {len(response.text)}자")
-        print(f"  - 답변 단어 수: {len(response.text.split())}단어")
-        
-        print(f"\n📋 Citations 생성 완료:")
-        print(f"  - 총 {len(citations)}개 citations 생성")
-        for c in citations:
-            print(f"    [{c['index']}] {c['collection']}: {c['title'][:50]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🤖 LLM 호출 중... (프롬프트: %d자, %d토큰)",
+                len(prompt),
+                get_token_counter().count(prompt),
+            )
+
+        return prompt, citations
+
+    def _finalize_agent_info_response(
+        self, text: str, citations: List[Dict], parallel_results: List[Dict]
+    ) -> dict:
+        """LLM 답변 텍스트 + citations를 API 응답 형태로 정리"""
+        logger.info(
+            "✅ 최종 답변 생성 완료: %d자, citations %d개", len(text), len(citations)
+        )
+        self._log_citations(citations)
         
-        # 최종 답변 내용 출력
-        print("\n" + "="*60)
-        print("📄 최종 답변 내용:")
-        print("="*60)
-        print(response.text)
-        print("="*60 + "\n")
+        # 최종 답변 전문은 DEBUG + 샘플링된 요청에서만
+        verbose(logger, "📄 최종 답변 내용:", text)
         
         return {
-            "content": response.text,
+            "content": text,
             "citations": citations,
             "cfr_references": [],
             "sources": [c['title'] for c in citations[:5]],
@@ -1010,15 +2014,163 @@ A: X는 ...을 의미합니다[1]. 여기에는 A, B, C, D, E가 포함됩니다
     def reset_conversation(self):
         """대화 히스토리 초기화"""
         self.memory.clear_history()
-        # 에이전트도 새로 시작
-        self.agent.reset()
+        self._agent_history = []
+        # 에이전트도 새로 시작 (아직 생성되지 않았으면 초기화할 상태도 없음)
+        if self._agent is not None:
+            self._agent.reset()
 
+    @tracing.traced_request("astream_chat")
+    async def astream_chat(self, query: str):
+        """achat()의 스트리밍 버전
 
-    ## 현재 사용되지 않아서 수정하지 않음. 
-    def stream_chat(self, query: str):
-        """
-        스트리밍 방식으로 답변을 생성합니다. (향후 확장 기능)
+        진행 이벤트(progress) → 최종 답변 토큰(token) → 출처(citations) → 완료(done) 순서로
+        {"event": ..., "data": {...}} 형태의 이벤트를 yield 한다.
         """
-        response_stream = self.agent.stream_chat(query)
-        for token in response_stream.response_gen:
-            yield token
+        request_start = time.perf_counter()
+        streamed = False  # 답변 토큰을 이미 보냈는지 (오류 시 이어 붙이지 않기 위함)
+        try:
+            cached, probe = None, None
+            if self._answer_cache_enabled():
+                (cached, probe), lookup_ms = await self._atimed(
+                    self._acached_answer(query)
+                )
+
+            if cached is not None:
+                logger.info("♻️ 답변 캐시 히트")
+                tracing.annotate(path="cache")
+                yield self._event("progress", stage="cache_hit")
+                yield self._event("token", text=cached["content"])
+                result, timings = cached, {"cache_lookup": lookup_ms}
+            else:
+                out = {}
+                async for event in self._astream_pipeline(query, request_start, out):
+                    streamed = streamed or event["event"] == "token"
+                    yield event
+                result, timings = out["result"], out["timings"]
+                if probe is not None:
+                    timings["cache_lookup"] = lookup_ms
+                    await self._acache_answer(probe, result, out["collections"])
+            self._record_turn(query, result)
+
+        except Exception as e:
+            logger.error("Error in stream chat: %s", e, exc_info=True)
+            tracing.annotate(path="error")
+            result = self._fallback_result(query)
+            if streamed:
+                # 부분 답변 뒤에 안내 문구를 토큰으로 덧붙이지 않고 error로 알림 (클라이언트가 부분 답변을 대체)
+                yield self._event("error", message=result["content"], partial=True)
+                yield self._event(
+                    "done",
+                    timings={"total": (time.perf_counter() - request_start) * 1000},
+                )
+                return
+            result["citations"] = []
+            timings = {}
+            yield self._event("token", text=result["content"])
+
+        yield self._event(
+            "citations",
+            citations=result["citations"],
+            sources=result["sources"],
+            keywords=result["keywords"],
+            cfr_references=result["cfr_references"],
+        )
+        timings["total"] = (time.perf_counter() - request_start) * 1000
+        yield self._event("done", timings=timings)
+
+    async def _astream_pipeline(self, query: str, request_start: float, out: dict):
+        """검색 → (ReAct) → 답변 토큰 스트리밍. 완료 시 out에 result/timings/collections 기록"""
+        yield self._event("progress", stage="routing")
+        route = await self._aroute_query(query)
+        timings = route["timings"]
+        yield self._event(
+            "progress",
+            stage="routed",
+            product=route["decomposition"] is not None,
+            collections=route["collections"],
+        )
+
+        orchestrator = self.engine.orchestrator
+        parallel_results, timings["search"] = await self._atimed(
+            orchestrator.aparallel_search(
+                query=route["search_query"],
+                collections=route["collections"],
+                decomposition=route["decomposition"],
+            )
+        )
+        if "embedding" in parallel_results:
+            timings["embed"] = parallel_results["embedding"]["time"] * 1000
+        ranked_results, timings["merge"] = self._timed(
+            orchestrator.merge_and_rank, parallel_results
+        )
+        ranked_results = await self._arerank(query, ranked_results, timings)
+        yield self._event("progress", stage="search_done", results=len(ranked_results))
+
+        decomposition = route["decomposition"]
+        direct = self._is_parallel_result_sufficient(
+            ranked_results, decomposition or {}
+        )
+        if not direct and self.engine.gap_filler is not None:
+            yield self._event("progress", stage="gap_fill")
+            (ranked_results, direct), timings["gap_fill"] = await self._atimed(
+                self._agap_fill(query, route, ranked_results)
+            )
+        tracing.annotate(
+            path="direct" if direct else "react_agent", results=len(ranked_results)
+        )
+        if direct:
+            logger.info("✅ 병렬 검색 결과만으로 충분 - 직접 답변 스트리밍")
+            prompt, citations = self._build_direct_prompt(
+                query, ranked_results, decomposition, route["search_query"]
+            )
+            finalize = self._finalize_direct_response
+        else:
+            logger.info("🔄 ReAct Agent로 추가 정보 수집")
+            yield self._event("progress", stage="agent")
+            full_query = self._build_agent_query(query, route, ranked_results)
+            with tracing.span("react_agent") as span:
+                agent_response, timings["react_agent"] = await self._atimed(
+                    self.agent.achat(full_query)
+                )
+                span.set(tool_calls=len(agent_response.sources))
+            yield self._event(
+                "progress", stage="agent_done", sources=len(agent_response.sources)
+            )
+            prompt, citations = self._build_agent_info_prompt(
+                query,
+                ranked_results,
+                str(agent_response),
+                decomposition,
+                route["search_query"],
+            )
+            finalize = self._finalize_agent_info_response
+
+        # 최종 답변 토큰 스트리밍
+        yield self._event("progress", stage="generating")
+        generation_start = time.perf_counter()
+        chunks = []
+        with tracing.span("generation") as span:
+            async for chunk in await self.engine.llm.astream_complete(prompt):
+                if not chunk.delta:
+                    continue
+                if not chunks:
+                    timings["first_token"] = (
+                        time.perf_counter() - request_start
+                    ) * 1000
+                    span.set(
+                        first_token_ms=(time.perf_counter() - generation_start) * 1000
+                    )
+                chunks.append(chunk.delta)
+                yield self._event("token", text=chunk.delta)
+            tracing.annotate_tokens(
+                prompt, "".join(chunks), model=self._model_name(self.engine.llm)
+            )
+        timings["generation"] = (time.perf_counter() - generation_start) * 1000
+
+        out["result"] = finalize("".join(chunks), citations, ranked_results)
+        out["timings"] = timings
+        out["collections"] = route["collections"]
+
+    @staticmethod
+    def _event(event: str, **data) -> dict:
+        return {"event": event, "data": data}
@@ -0,0 +1,275 @@
+# utils/answer_cache.py
+"""
+의미 기반 답변 캐시
+
+같은 질문(정규화 후 동일)은 정확 일치로, 표현만 조금 다른 질문은 임베딩 코사인 유사도로 찾아
+파이프라인 전체(LLM 호출 + 컬렉션 검색)를 건너뛴다.
+
+- 이전 대화 맥락이 없는 질문만 캐시 (FDAAgent에서 판단)
+- TTL 경과 시 만료
+- 답변에 사용된 컬렉션의 데이터 버전(리비전, points_count)이 바뀌면 무효화
+  리비전은 적재 스크립트가 QdrantService.mark_collection_updated()로 올린다. 리비전을 올리지 않은
+  적재에서는 points_count만 비교하므로, 같은 수의 포인트를 교체한 upsert는 TTL이 지나야 반영된다.
+"""
+import copy
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+_PUNCT_RE = re.compile(r"[\s\?\!\.,~…·]+")
+
+
+def normalize_query(query: str) -> str:
+    """대소문자, 공백, 문장부호 차이를 없앤 캐시 키"""
+    text = unicodedata.normalize("NFKC", query).lower().strip()
+    return _PUNCT_RE.sub(" ", text).strip()
+
+
+class CollectionVersions:
+    """컬렉션 데이터 버전(리비전, points_count) 조회 결과를 refresh_interval 동안 재사용"""
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, Any]],
+        afetch: Callable = None,
+        refresh_interval: float = 60,
+    ):
+        self.fetch = fetch
+        self.afetch = afetch
+        self.refresh_interval = refresh_interval
+        self._versions: Dict[str, Any] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _stale(self, collections: List[str]) -> List[str]:
+        now = time.time()
+        with self._lock:
+            return [
+                c
+                for c in collections
+                if now - self._checked_at.get(c, 0) > self.refresh_interval
+            ]
+
+    def _update(self, versions: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            for collection, version in versions.items():
+                self._versions[collection] = version
+                self._checked_at[collection] = now
+
+    def _snapshot(self, collections: List[str]) -> Dict[str, Any]:
+        with self._lock:
+            return {c: self._versions.get(c) for c in collections}
+
+    def get(self, collections: List[str]) -> Dict[str, Any]:
+        stale = self._stale(collections)
+        if stale:
+            self._update(self.fetch(stale))
+        return self._snapshot(collections)
+
+    async def aget(self, collections: List[str]) -> Dict[str, Any]:
+        stale = self._stale(collections)
+        if stale:
+            self._update(await self.afetch(stale) if self.afetch else self.fetch(stale))
+        return self._snapshot(collections)
+
+
+class AnswerProbe:
+    """조회 시 계산한 키/임베딩 (미스 후 저장할 때 재사용)"""
+
+    def __init__(self, key: str, embedding: Optional[np.ndarray]):
+        self.key = key
+        self.embedding = embedding
+
+
+class AnswerCache:
+    """정확 일치 + 임베딩 유사도 답변 캐시"""
+
+    def __init__(
+        self,
+        embed_model,
+        versions: CollectionVersions,
+        max_entries: int = 1000,
+        ttl: float = 86400,
+        similarity_threshold: float = 0.95,
+    ):
+        self.embed_model = embed_model
+        self.versions = versions
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+
+        # key → {"result", "embedding", "collections", "versions", "created"}
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._evictions = 0
+        self._stores = 0
+
+    # ---- 조회 ----
+
+    def lookup(self, query: str):
+        """(캐시된 결과 사본 또는 None, AnswerProbe)"""
+        key = normalize_query(query)
+        entry = self._exact(key)
+        if entry is not None:
+            return self._validate(
+                entry, self.versions.get(entry["collections"]), exact=True
+            ), AnswerProbe(key, None)
+
+        embedding = self._embed(self.embed_model.get_query_embedding(key))
+        entry = self._nearest(embedding)
+        if entry is not None:
+            return self._validate(
+                entry, self.versions.get(entry["collections"]), exact=False
+            ), AnswerProbe(key, embedding)
+        self._record_miss()
+        return None, AnswerProbe(key, embedding)
+
+    async def alookup(self, query: str):
+        """lookup의 비동기 버전"""
+        key = normalize_query(query)
+        entry = self._exact(key)
+        if entry is not None:
+            versions = await self.versions.aget(entry["collections"])
+            return self._validate(entry, versions, exact=True), AnswerProbe(key, None)
+
+        embedding = self._embed(await self.embed_model.aget_query_embedding(key))
+        entry = self._nearest(embedding)
+        if entry is not None:
+            versions = await self.versions.aget(entry["collections"])
+            return self._validate(entry, versions, exact=False), AnswerProbe(
+                key, embedding
+            )
+        self._record_miss()
+        return None, AnswerProbe(key, embedding)
+
+    def _exact(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry):
+                del self._entries[key]
+                self._expirations += 1
+                return None
+            return entry
+
+    def _nearest(self, embedding: np.ndarray) -> Optional[Dict]:
+        with self._lock:
+            best, best_score = None, self.similarity_threshold
+            for key, entry in list(self._entries.items()):
+                if self._expired(entry):
+                    del self._entries[key]
+                    self._expirations += 1
+                    continue
+                score = float(np.dot(entry["embedding"], embedding))
+                if score >= best_score:
+                    best, best_score = entry, score
+            return best
+
+    def _validate(
+        self, entry: Dict, versions: Dict[str, Any], exact: bool
+    ) -> Optional[Dict]:
+        with self._lock:
+            if versions != entry["versions"]:
+                # 컬렉션 데이터가 바뀜 → 무효화
+                self._entries.pop(entry["key"], None)
+                self._invalidations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(entry["key"])
+            if exact:
+                self._exact_hits += 1
+            else:
+                self._semantic_hits += 1
+            return copy.deepcopy(entry["result"])
+
+    def _record_miss(self):
+        with self._lock:
+            self._misses += 1
+
+    # ---- 저장 ----
+
+    def store(self, probe: AnswerProbe, result: Dict, collections: List[str]):
+        if probe.embedding is None:
+            probe.embedding = self._embed(
+                self.embed_model.get_query_embedding(probe.key)
+            )
+        self._put(probe, result, collections, self.versions.get(collections))
+
+    async def astore(self, probe: AnswerProbe, result: Dict, collections: List[str]):
+        if probe.embedding is None:
+            probe.embedding = self._embed(
+                await self.embed_model.aget_query_embedding(probe.key)
+            )
+        self._put(probe, result, collections, await self.versions.aget(collections))
+
+    def _put(
+        self,
+        probe: AnswerProbe,
+        result: Dict,
+        collections: List[str],
+        versions: Dict[str, Any],
+    ):
+        cached = {k: copy.deepcopy(v) for k, v in result.items() if k != "timings"}
+        with self._lock:
+            self._entries[probe.key] = {
+                "key": probe.key,
+                "result": cached,
+                "embedding": probe.embedding,
+                "collections": list(collections),
+                "versions": versions,
+                "created": time.time(),
+            }
+            self._entries.move_to_end(probe.key)
+            self._stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    # ---- 유틸 ----
+
+    @staticmethod
+    def _embed(vector: List[float]) -> np.ndarray:
+        # 코사인 유사도를 내적으로 계산하기 위해 정규화
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def _expired(self, entry: Dict) -> bool:
+        return self.ttl is not None and time.time() - entry["created"] > self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._exact_hits + self._semantic_hits
+            lookups = hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "similarity_threshold": self.similarity_threshold,
+                "hits": hits,
+                "exact_hits": self._exact_hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "evictions": self._evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,198 @@
+# utils/bm25_index.py
+"""
+컬렉션별 로컬 BM25 인덱스 (하이브리드 검색용)
+
+"21 CFR 101.4", "GRN 1023", "Import Alert 16-120"처럼 숫자 식별자가 핵심인 질문은
+밀집 임베딩이 놓치기 쉬우므로 Qdrant payload(title + text)로 BM25 인덱스를 만들어 보완한다.
+
+- 인덱스는 컬렉션별로 처음 필요할 때 백그라운드 스레드에서 생성 (생성 중에는 밀집 검색만 사용)
+- refresh_interval이 지나면 다시 생성
+- 토큰화: 소문자, "101.4" / "16-120" 같은 식별자는 한 토큰으로 유지, 숫자 앞의 0 제거 (GRN 001023 = 1023)
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.\-][a-z0-9]+)*|[가-힣]+")
+_STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "as",
+    "at",
+    "be",
+    "by",
+    "do",
+    "does",
+    "for",
+    "from",
+    "how",
+    "in",
+    "is",
+    "it",
+    "of",
+    "on",
+    "or",
+    "that",
+    "the",
+    "this",
+    "to",
+    "what",
+    "with",
+    "enhanced",
+    "search",
+    "query",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in _STOPWORDS:
+            continue
+        if token.isdigit():
+            token = token.lstrip("0") or "0"
+        tokens.append(token)
+    return tokens
+
+
+def identifier_tokens(query: str) -> List[str]:
+    """질문 속 식별자 토큰 (숫자 포함 3자 이상 또는 . / - 로 이어진 번호, 예: 117, 101.4, 16-120)"""
+    return list(
+        dict.fromkeys(
+            t
+            for t in tokenize(query)
+            if any(ch.isdigit() for ch in t) and (len(t) >= 3 or "." in t or "-" in t)
+        )
+    )
+
+
+def contains_identifier(text: str, identifiers: List[str]) -> bool:
+    if not identifiers:
+        return False
+    tokens = set(tokenize(text))
+    return any(identifier in tokens for identifier in identifiers)
+
+
+class BM25Index:
+    """포인트 id 목록 + BM25Okapi"""
+
+    def __init__(self, ids: List, token_lists: List[List[str]]):
+        self.ids = ids
+        self.size = len(ids)
+        self._bm25 = BM25Okapi(token_lists) if ids else None
+
+    def search(self, query_tokens: List[str], limit: int = 5) -> List[Tuple]:
+        """[(포인트 id, BM25 점수)] 점수 내림차순, 0점 제외"""
+        if self._bm25 is None or not query_tokens:
+            return []
+        scores = self._bm25.get_scores(query_tokens)
+        if len(scores) > limit:
+            # 전체 정렬 대신 상위 limit개만 골라 정렬
+            top = np.argpartition(scores, -limit)[-limit:]
+            ranked = top[np.argsort(scores[top])[::-1]]
+        else:
+            ranked = np.argsort(scores)[::-1]
+        return [(self.ids[i], float(scores[i])) for i in ranked if scores[i] > 0]
+
+
+class BM25Store:
+    """컬렉션 → BM25Index (백그라운드 생성, 주기적 재생성)"""
+
+    def __init__(
+        self,
+        qdrant_service,
+        refresh_interval: float = 3600,
+        fields: Tuple[str, ...] = ("title", "text"),
+    ):
+        self.qdrant_service = qdrant_service
+        self.refresh_interval = refresh_interval
+        self.fields = fields
+        self._indexes: Dict[str, BM25Index] = {}
+        self._built_at: Dict[str, float] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._building = set()
+        self._lock = threading.Lock()
+        # 인덱스 생성은 검색 스레드 풀과 분리 (수 초 걸릴 수 있음)
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fda-bm25")
+
+    def get(self, collection: str) -> Optional[BM25Index]:
+        """준비된 인덱스 (없거나 오래됐으면 백그라운드 생성 시작, 준비 전에는 None)"""
+        with self._lock:
+            index = self._indexes.get(collection)
+            # 마지막 생성 시도(실패 포함) 이후 refresh_interval이 지났으면 다시 생성
+            stale = (
+                time.time() - self._built_at.get(collection, 0) > self.refresh_interval
+            )
+            if stale and collection not in self._building:
+                self._building.add(collection)
+                self._builder.submit(self._build, collection)
+            return index
+
+    def warm(self, collections: List[str]):
+        """서버 시작 시 인덱스 미리 생성"""
+        for collection in collections:
+            self.get(collection)
+
+    def build(self, collection: str) -> BM25Index:
+        """동기 생성 (벤치마크/테스트용)"""
+        with self._lock:
+            self._building.add(collection)
+        self._build(collection)
+        return self._indexes.get(collection)
+
+    def _build(self, collection: str):
+        start = time.time()
+        try:
+            ids, token_lists = [], []
+            for point_id, payload in self.qdrant_service.scroll_payloads(collection):
+                text = " ".join(str(payload.get(field, "")) for field in self.fields)
+                ids.append(point_id)
+                token_lists.append(tokenize(text))
+            index = BM25Index(ids, token_lists)
+            elapsed = time.time() - start
+            with self._lock:
+                self._indexes[collection] = index
+                self._built_at[collection] = time.time()
+                self._build_seconds[collection] = elapsed
+            logger.info(
+                "📇 BM25 인덱스 생성: %s %d개 문서 (%.1f초)", collection, index.size, elapsed
+            )
+        except Exception as e:
+            logger.warning("⚠️ BM25 인덱스 생성 실패 (%s): %s", collection, e)
+            with self._lock:
+                # 실패 시 refresh_interval 후 재시도
+                self._built_at[collection] = time.time()
+        finally:
+            with self._lock:
+                self._building.discard(collection)
+
+    def search(self, collection: str, query: str, limit: int = 5) -> List[Tuple]:
+        index = self.get(collection)
+        if index is None:
+            return []
+        return index.search(tokenize(query), limit)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                collection: {
+                    "docs": index.size,
+                    "built_at": self._built_at.get(collection),
+                    "build_seconds": self._build_seconds.get(collection),
+                }
+                for collection, index in self._indexes.items()
+            }
+
+    def close(self):
+        self._builder.shutdown(wait=False)
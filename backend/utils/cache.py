@@ -0,0 +1,234 @@
+# utils/cache.py
+"""
+공용 캐시 구성 요소
+
+- LRUCache: 스레드 안전 메모리 LRU (선택적 TTL, 히트율 통계)
+- SQLiteCache: 문자열 키 → bytes 디스크 저장소 (항목 수 상한, 오래 안 쓴 항목부터 삭제)
+- TieredCache: 메모리 LRU + 선택적 SQLite 디스크 계층
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """항목 수 상한이 있는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 1000, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key → (value, 저장 시각)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            value, stored_at = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class SQLiteCache:
+    """문자열 키 → bytes 디스크 캐시 (프로세스 재시작 후에도 유지)"""
+
+    def __init__(
+        self, path: str, table: str = "cache", max_entries: Optional[int] = None
+    ):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)"
+        )
+        self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            self._hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, accessed) "
+                "VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), time.time()),
+            )
+            self._writes += 1
+            if self.max_entries:
+                self._evict_overflow()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict_overflow(self):
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._evictions += overflow
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[
+                0
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        size = len(self)
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """메모리 LRU → 디스크(SQLite) 순으로 조회하는 2단계 캐시
+
+    디스크에는 encode/decode로 변환한 bytes를 저장한다.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache,
+        disk: Optional[SQLiteCache] = None,
+        encode: Callable[[Any], bytes] = None,
+        decode: Callable[[bytes], Any] = None,
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.encode = encode
+        self.decode = decode
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        value = self.decode(raw)
+        self.memory.set(key, value)  # 디스크 히트는 메모리로 승격
+        return value
+
+    def set(self, key: str, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, self.encode(value))
+
+    def delete(self, key: str):
+        self.memory.pop(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
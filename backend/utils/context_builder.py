@@ -0,0 +1,252 @@
+# utils/context_builder.py
+"""
+토큰 예산 기반 답변 프롬프트 컨텍스트 구성
+
+최종 답변 프롬프트는 검색 결과 최대 10개 × 10,000자 + Agent 수집 정보 전체 + 제품 분해 JSON이 그대로 들어가
+호출당 10만 자를 넘기기 쉽다. ContextBuilder는 이를 토큰 예산 안으로 줄인다.
+
+1. 중복 제거: 앞(고득점) 문서에 이미 나온 문장은 뒤 문서에서 제거, 대부분 겹치는 문서는 통째로 제외
+2. 예산 배분: Agent 정보에 최대 agent_share, 나머지를 문서별 점수 × 컬렉션 다양성 가중치로 배분
+   (짧은 문서가 남긴 예산은 다른 문서로 재배분)
+3. 문장 선택: 예산을 넘는 문서는 질문/검색 쿼리와 겹치는 단어가 많은 문장 위주로 남기고 원래 순서로 이어 붙임
+
+토큰 수는 tiktoken(gpt-4-turbo 인코딩)으로 세고, 인코딩 파일을 받을 수 없는 환경에서는 문자 수로 추정한다.
+"""
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from utils.bm25_index import identifier_tokens, tokenize
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?。])\s+|\n+")
+_GAP = "…"
+
+
+def _ascii_estimate(text: str) -> int:
+    """tiktoken 없이 대략적인 토큰 수 (영문 약 4자/토큰, 한글 약 1자/토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+class TokenCounter:
+    """tiktoken 토큰 수 (로드 실패 시 추정치)"""
+
+    def __init__(self, model: str = "gpt-4-turbo"):
+        self.model = model
+        try:
+            import tiktoken
+
+            self._encoding = tiktoken.encoding_for_model(model)
+            self.exact = True
+        except Exception as e:
+            logger.warning("⚠️ tiktoken 인코딩 로드 실패 (%s), 문자 수로 추정: %s", model, e)
+            self._encoding = None
+            self.exact = False
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return _ascii_estimate(text)
+
+    def truncate(self, text: str, limit: int) -> str:
+        """앞에서부터 limit 토큰까지"""
+        if limit <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return (
+                text if len(tokens) <= limit else self._encoding.decode(tokens[:limit])
+            )
+        while text and _ascii_estimate(text) > limit:
+            text = text[: int(len(text) * 0.9)]
+        return text
+
+
+_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    global _counter
+    if _counter is None:
+        _counter = TokenCounter()
+    return _counter
+
+
+def compact_decomposition(decomposition: dict) -> str:
+    """빈 값을 뺀 한 줄 JSON (들여쓰기 없는 제품 특성)"""
+    compact = {
+        k: v for k, v in (decomposition or {}).items() if v not in (None, "", [], {})
+    }
+    return json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(text or "") if s.strip()]
+
+
+def _sentence_key(sentence: str) -> str:
+    return " ".join(sentence.lower().split())
+
+
+class ContextBuilder:
+    """검색 결과 + Agent 정보를 토큰 예산에 맞게 압축"""
+
+    def __init__(
+        self,
+        budget_tokens: int = None,
+        agent_share: float = None,
+        max_docs: int = 10,
+        min_doc_tokens: int = 120,
+        duplicate_ratio: float = 0.8,
+        counter: TokenCounter = None,
+    ):
+        self.budget_tokens = budget_tokens or int(
+            os.getenv("FDA_CONTEXT_BUDGET", "12000")
+        )
+        self.agent_share = (
+            agent_share
+            if agent_share is not None
+            else float(os.getenv("FDA_CONTEXT_AGENT_SHARE", "0.35"))
+        )
+        self.max_docs = max_docs
+        self.min_doc_tokens = min_doc_tokens
+        self.duplicate_ratio = duplicate_ratio
+        self.counter = counter or get_token_counter()
+
+    def build(
+        self, results: List[Dict], relevance_text: str, agent_info: str = None
+    ) -> Dict:
+        """{"results": 압축된 결과(text만 교체), "agent_info": 압축된 Agent 정보, "stats": 토큰 수}"""
+        docs = results[: self.max_docs]
+        tokens_before = sum(self.counter.count(d.get("text", "")[:10000]) for d in docs)
+        agent_before = self.counter.count(agent_info or "")
+
+        terms = set(tokenize(relevance_text))
+        identifiers = set(identifier_tokens(relevance_text))
+
+        # 1. 문장 단위 중복 제거 (점수 순서대로 먼저 나온 문서가 문장을 가짐)
+        seen = set()
+        kept, duplicates = [], 0
+        for doc in docs:
+            sentences = _split_sentences(doc.get("text", "")[:10000])
+            unique = [s for s in sentences if _sentence_key(s) not in seen]
+            if sentences and len(unique) <= len(sentences) * (1 - self.duplicate_ratio):
+                duplicates += 1
+                continue
+            seen.update(_sentence_key(s) for s in unique)
+            kept.append((doc, unique))
+
+        # 2. Agent 정보 예산 (필요한 만큼, 최대 agent_share)
+        agent_budget = (
+            min(agent_before, int(self.budget_tokens * self.agent_share))
+            if agent_info
+            else 0
+        )
+        packed_agent = (
+            self._trim(_split_sentences(agent_info), agent_budget, terms, identifiers)
+            if agent_info
+            else agent_info
+        )
+
+        # 3. 문서 예산 배분
+        needs = [self.counter.count(" ".join(sentences)) for _, sentences in kept]
+        weights = self._weights([doc for doc, _ in kept])
+        allocations = self._allocate(needs, weights, self.budget_tokens - agent_budget)
+
+        packed = []
+        for (doc, sentences), need, allocation in zip(kept, needs, allocations):
+            text = (
+                " ".join(sentences)
+                if need <= allocation
+                else self._trim(sentences, allocation, terms, identifiers)
+            )
+            packed.append(dict(doc, text=text))
+
+        tokens_after = sum(self.counter.count(d["text"]) for d in packed)
+        agent_after = self.counter.count(packed_agent or "")
+        return {
+            "results": packed,
+            "agent_info": packed_agent,
+            "stats": {
+                "docs_before": len(docs),
+                "docs_after": len(packed),
+                "duplicates_dropped": duplicates,
+                "doc_tokens_before": tokens_before,
+                "doc_tokens_after": tokens_after,
+                "agent_tokens_before": agent_before,
+                "agent_tokens_after": agent_after,
+                "exact_tokens": self.counter.exact,
+            },
+        }
+
+    @staticmethod
+    def _weights(docs: List[Dict]) -> List[float]:
+        """점수 × 컬렉션 다양성 (같은 컬렉션의 n번째 문서는 1 / (1 + 0.5n))"""
+        per_collection: Dict[str, int] = {}
+        weights = []
+        for doc in docs:
+            n = per_collection.get(doc.get("collection"), 0)
+            per_collection[doc.get("collection")] = n + 1
+            weights.append(max(doc.get("score", 0.0), 0.05) / (1 + 0.5 * n))
+        return weights
+
+    def _allocate(
+        self, needs: List[int], weights: List[float], budget: int
+    ) -> List[int]:
+        """가중치 비례 배분, 필요량보다 많이 받은 문서의 남는 예산은 나머지에 재배분"""
+        allocations = [0] * len(needs)
+        open_docs = set(range(len(needs)))
+        remaining = max(budget, 0)
+        while open_docs and remaining > 0:
+            total = sum(weights[i] for i in open_docs)
+            shares = {i: int(remaining * weights[i] / total) for i in open_docs}
+            satisfied = {i for i in open_docs if needs[i] - allocations[i] <= shares[i]}
+            if not satisfied:
+                for i in open_docs:
+                    allocations[i] += shares[i]
+                break
+            for i in satisfied:
+                remaining -= needs[i] - allocations[i]
+                allocations[i] = needs[i]
+            open_docs -= satisfied
+        # 배분이 너무 작으면 해당 문서는 최소 분량만
+        return [
+            a if a >= self.min_doc_tokens or a == n else min(n, self.min_doc_tokens)
+            for a, n in zip(allocations, needs)
+        ]
+
+    def _trim(
+        self, sentences: List[str], limit: int, terms: set, identifiers: set
+    ) -> str:
+        """질문과 관련 높은 문장 위주로 limit 토큰 이내, 원래 순서 유지"""
+        if limit <= 0 or not sentences:
+            return ""
+
+        def relevance(index: int) -> float:
+            tokens = set(tokenize(sentences[index]))
+            score = len(tokens & terms) + 3 * len(tokens & identifiers)
+            return score + 1.0 / (1 + index)  # 동점이면 앞 문장 우선
+
+        chosen, used = [], 0
+        for i in sorted(range(len(sentences)), key=relevance, reverse=True):
+            cost = self.counter.count(sentences[i]) + 1
+            if used + cost > limit:
+                if not chosen:
+                    return self.counter.truncate(sentences[i], limit)
+                continue
+            chosen.append(i)
+            used += cost
+
+        parts, previous = [], None
+        for i in sorted(chosen):
+            if previous is not None and i != previous + 1:
+                parts.append(_GAP)
+            parts.append(sentences[i])
+            previous = i
+        return " ".join(parts)
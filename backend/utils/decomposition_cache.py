@@ -0,0 +1,412 @@
+# utils/decomposition_cache.py
+"""
+제품 분해 캐시: 제품명 → 10개 요소 분해 결과
+
+_decompose_product는 gpt-4-turbo 호출이라 비싸므로 모든 세션이 하나의 캐시를 공유하고,
+FDA_DECOMP_CACHE_PATH를 설정하면 SQLite에 저장해 재시작 후에도 유지한다.
+
+- 키 정규화: 공백/하이픈 제거, 소문자화, 영문·로마자 표기 → 한글 대표명 (kimchi, 김 치 → 김치)
+- 워밍 항목: 자주 묻는 한국 식품은 미리 계산한 분해 결과로 LLM 호출 없이 응답
+"""
+import copy
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from utils.cache import LRUCache, SQLiteCache, TieredCache
+
+_SEPARATOR_RE = re.compile(r"[\s\-_·/]+")
+
+# 영문/로마자 표기 → 한글 대표명 (정규화 후 키 기준)
+PRODUCT_ALIASES = {
+    "kimchi": "김치",
+    "gimchi": "김치",
+    "cabbagekimchi": "김치",
+    "배추김치": "김치",
+    "tteokbokki": "떡볶이",
+    "topokki": "떡볶이",
+    "ddeokbokki": "떡볶이",
+    "떡뽁이": "떡볶이",
+    "kimbap": "김밥",
+    "gimbap": "김밥",
+    "mandu": "만두",
+    "koreandumpling": "만두",
+    "koreandumplings": "만두",
+    "bulgogi": "불고기",
+    "bibimbap": "비빔밥",
+    "ramyeon": "라면",
+    "ramyun": "라면",
+    "koreanramen": "라면",
+    "instantnoodles": "라면",
+    "gochujang": "고추장",
+    "redpepperpaste": "고추장",
+    "doenjang": "된장",
+    "soybeanpaste": "된장",
+    "gim": "김",
+    "조미김": "김",
+    "laver": "김",
+    "seasonedlaver": "김",
+    "seaweedsnack": "김",
+    "yuzutea": "유자차",
+    "yujacha": "유자차",
+    "citrontea": "유자차",
+}
+
+
+def _korean(**fields) -> Dict[str, Any]:
+    """한국 식품 워밍 항목 기본값 (_parse_decomposition의 기본값과 같은 필드)"""
+    decomposition = {
+        "ingredients": [],
+        "processes": [],
+        "allergens": [],
+        "origin": "Korea",
+        "category": "ethnic food",
+        "subcategories": [],
+        "storage_type": "ambient",
+        "risk_level": "medium",
+        "packaging_concerns": [],
+        "potential_hazards": [],
+        "import_type": "commercial",
+    }
+    decomposition.update(fields)
+    return decomposition
+
+
+# 자주 묻는 한국 식품의 미리 계산한 분해 결과
+WARM_DECOMPOSITIONS = {
+    "김치": _korean(
+        ingredients=[
+            "napa cabbage",
+            "chili powder",
+            "garlic",
+            "ginger",
+            "fish sauce",
+            "salted shrimp",
+            "radish",
+        ],
+        processes=["salting", "seasoning", "fermentation", "packaging"],
+        allergens=["fish", "shellfish"],
+        subcategories=["fermented vegetables", "acidified foods"],
+        storage_type="refrigerated",
+        packaging_concerns=[
+            "gas build-up from fermentation",
+            "leak-proof sealing",
+            "allergen labeling",
+        ],
+        potential_hazards=[
+            "pathogen growth if under-fermented",
+            "container swelling",
+            "undeclared allergens",
+        ],
+    ),
+    "떡볶이": _korean(
+        ingredients=[
+            "rice cake",
+            "fish cake",
+            "gochujang",
+            "sugar",
+            "chili powder",
+            "green onion",
+        ],
+        processes=["steaming", "extrusion", "sauce mixing", "packaging"],
+        allergens=["wheat", "soybeans", "fish"],
+        subcategories=["rice products", "sauces", "ready-to-cook meals"],
+        storage_type="refrigerated",
+        packaging_concerns=[
+            "shelf life of rice cakes",
+            "allergen labeling",
+            "sauce sachet labeling",
+        ],
+        potential_hazards=[
+            "microbial spoilage",
+            "undeclared allergens",
+            "color additives in sauce",
+        ],
+    ),
+    "김밥": _korean(
+        ingredients=[
+            "rice",
+            "dried laver",
+            "pickled radish",
+            "carrot",
+            "spinach",
+            "egg",
+            "ham",
+            "sesame oil",
+        ],
+        processes=["cooking", "rolling", "cutting", "packaging"],
+        allergens=["eggs", "sesame", "soybeans", "wheat"],
+        subcategories=["rice products", "ready-to-eat meals"],
+        storage_type="frozen",
+        risk_level="high",
+        packaging_concerns=["cold chain", "allergen labeling"],
+        potential_hazards=[
+            "bacterial growth in cooked rice",
+            "meat product regulations",
+            "undeclared allergens",
+        ],
+    ),
+    "만두": _korean(
+        ingredients=[
+            "wheat flour wrapper",
+            "pork",
+            "tofu",
+            "cabbage",
+            "green onion",
+            "garlic",
+            "glass noodles",
+        ],
+        processes=[
+            "filling preparation",
+            "forming",
+            "steaming",
+            "freezing",
+            "packaging",
+        ],
+        allergens=["wheat", "soybeans"],
+        subcategories=["dumplings", "frozen foods", "meat-containing products"],
+        storage_type="frozen",
+        risk_level="high",
+        packaging_concerns=["cold chain", "meat content labeling"],
+        potential_hazards=[
+            "pathogens in meat filling",
+            "USDA jurisdiction for meat content",
+            "undeclared allergens",
+        ],
+    ),
+    "불고기": _korean(
+        ingredients=[
+            "beef",
+            "soy sauce",
+            "sugar",
+            "pear",
+            "garlic",
+            "sesame oil",
+            "onion",
+        ],
+        processes=["slicing", "marinating", "cooking", "freezing", "packaging"],
+        allergens=["soybeans", "wheat", "sesame"],
+        subcategories=["meat products", "marinated foods"],
+        storage_type="frozen",
+        risk_level="high",
+        packaging_concerns=["cold chain", "meat origin labeling"],
+        potential_hazards=[
+            "pathogens in beef",
+            "USDA jurisdiction for meat",
+            "undeclared allergens",
+        ],
+    ),
+    "비빔밥": _korean(
+        ingredients=[
+            "rice",
+            "bean sprouts",
+            "spinach",
+            "carrot",
+            "mushroom",
+            "egg",
+            "gochujang",
+            "sesame oil",
+        ],
+        processes=["cooking", "blanching", "assembling", "freezing", "packaging"],
+        allergens=["eggs", "soybeans", "wheat", "sesame"],
+        subcategories=["rice products", "ready-to-eat meals"],
+        storage_type="frozen",
+        risk_level="high",
+        packaging_concerns=["cold chain", "allergen labeling"],
+        potential_hazards=[
+            "bacterial growth in cooked rice and sprouts",
+            "undeclared allergens",
+        ],
+    ),
+    "라면": _korean(
+        ingredients=[
+            "wheat flour noodles",
+            "palm oil",
+            "seasoning powder",
+            "dried vegetables",
+            "salt",
+        ],
+        processes=[
+            "noodle making",
+            "steaming",
+            "frying",
+            "seasoning blending",
+            "packaging",
+        ],
+        allergens=["wheat", "soybeans", "milk", "shellfish"],
+        subcategories=["instant noodles", "seasonings"],
+        packaging_concerns=[
+            "nutrition facts labeling",
+            "seasoning packet allergen labeling",
+        ],
+        potential_hazards=[
+            "undeclared allergens",
+            "oil oxidation",
+            "high sodium labeling",
+        ],
+        risk_level="low",
+    ),
+    "고추장": _korean(
+        ingredients=[
+            "chili powder",
+            "glutinous rice",
+            "fermented soybean powder",
+            "salt",
+            "rice syrup",
+        ],
+        processes=["mixing", "fermentation", "aging", "sterilization", "packaging"],
+        allergens=["soybeans", "wheat"],
+        subcategories=["condiments", "fermented sauces"],
+        packaging_concerns=["container sealing", "allergen labeling"],
+        potential_hazards=[
+            "aflatoxin in chili",
+            "undeclared allergens",
+            "unapproved color additives",
+        ],
+    ),
+    "된장": _korean(
+        ingredients=["soybeans", "salt", "water"],
+        processes=[
+            "soaking",
+            "boiling",
+            "meju fermentation",
+            "brining",
+            "aging",
+            "packaging",
+        ],
+        allergens=["soybeans"],
+        subcategories=["condiments", "fermented soybean products"],
+        packaging_concerns=["container sealing", "allergen labeling"],
+        potential_hazards=["aflatoxin", "biogenic amines", "undeclared allergens"],
+    ),
+    "김": _korean(
+        ingredients=["laver seaweed", "sesame oil", "salt", "vegetable oil"],
+        processes=["drying", "roasting", "seasoning", "cutting", "packaging"],
+        allergens=["sesame"],
+        subcategories=["seaweed products", "snacks"],
+        risk_level="low",
+        packaging_concerns=["moisture barrier", "desiccant labeling"],
+        potential_hazards=["heavy metals", "iodine content", "undeclared allergens"],
+    ),
+    "유자차": _korean(
+        ingredients=["citron", "sugar", "honey"],
+        processes=["slicing", "sugaring", "jarring", "pasteurization"],
+        subcategories=["fruit preserves", "beverage bases"],
+        risk_level="low",
+        packaging_concerns=["glass jar sealing", "label language"],
+        potential_hazards=[
+            "acidified food process filing",
+            "botulism if under-processed",
+        ],
+    ),
+}
+
+
+def normalize_product_name(product_name: str) -> str:
+    """캐시 키: 공백/하이픈 제거 + 소문자화 후 별칭을 한글 대표명으로 변환"""
+    key = unicodedata.normalize("NFKC", product_name or "").lower().strip()
+    key = _SEPARATOR_RE.sub("", key)
+    return PRODUCT_ALIASES.get(key, key)
+
+
+class DecompositionCache:
+    """워밍 항목 → 메모리 LRU → 선택적 SQLite 디스크 순으로 조회하는 제품 분해 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None,
+        warm: Optional[Dict[str, Dict]] = None,
+    ):
+        disk = None
+        if disk_path:
+            disk = SQLiteCache(
+                disk_path, table="decompositions", max_entries=disk_max_entries
+            )
+        self._cache = TieredCache(
+            memory=LRUCache(max_entries=max_entries),
+            disk=disk,
+            encode=lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8"),
+            decode=lambda raw: json.loads(raw.decode("utf-8")),
+        )
+        self._warm = {
+            normalize_product_name(name): d for name, d in (warm or {}).items()
+        }
+
+        self._lock = threading.Lock()
+        self._warm_hits = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def get(self, product_name: str) -> Optional[Dict]:
+        """캐시된 분해 결과 사본 (없으면 None)"""
+        key = normalize_product_name(product_name)
+        if not key:
+            return None
+
+        decomposition = self._warm.get(key)
+        if decomposition is not None:
+            with self._lock:
+                self._warm_hits += 1
+            return copy.deepcopy(decomposition)
+
+        decomposition = self._cache.get(key)
+        with self._lock:
+            if decomposition is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return copy.deepcopy(decomposition)
+
+    def put(self, product_name: str, decomposition: Dict):
+        key = normalize_product_name(product_name)
+        if not key or key in self._warm:
+            return
+        self._cache.set(key, copy.deepcopy(decomposition))
+        with self._lock:
+            self._stores += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._warm_hits + self._hits
+            lookups = hits + self._misses
+            summary = {
+                "warm_entries": len(self._warm),
+                "hits": hits,
+                "warm_hits": self._warm_hits,
+                "cache_hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+        summary.update(self._cache.stats())
+        return summary
+
+    def close(self):
+        self._cache.close()
+
+
+_cache: Optional[DecompositionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_decomposition_cache() -> DecompositionCache:
+    """프로세스 전역 제품 분해 캐시 (최초 호출 시 환경변수로 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk_max = int(os.getenv("FDA_DECOMP_CACHE_DISK_MAX", "50000"))
+                use_warm = os.getenv("FDA_DECOMP_CACHE_WARM", "1") != "0"
+                _cache = DecompositionCache(
+                    max_entries=int(os.getenv("FDA_DECOMP_CACHE_SIZE", "2000")),
+                    disk_path=os.getenv("FDA_DECOMP_CACHE_PATH") or None,
+                    disk_max_entries=disk_max or None,
+                    warm=WARM_DECOMPOSITIONS if use_warm else None,
+                )
+    return _cache
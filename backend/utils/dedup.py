@@ -0,0 +1,110 @@
+# utils/dedup.py
+"""
+SimHash 기반 근사 중복 청크 병합 (merge_and_rank 단계)
+
+같은 규정 문구가 guidance / ecfr / usc에 각각 들어 있어 merge_and_rank가 컬렉션별 상위 5개를 고르면
+거의 같은 본문이 여러 번 프롬프트에 들어간다. 본문의 단어 3-gram으로 64비트 SimHash를 만들고
+해밍 거리가 max_distance 이하인 청크는 점수가 가장 높은 하나로 합친다.
+(무관한 본문끼리의 거리는 평균 32, 기본값 8은 본문의 수 % 정도가 다른 청크까지 잡는다)
+합쳐진 청크의 출처는 대표 청크의 "duplicates"에 남겨 citation에서 함께 보여준다.
+"""
+import hashlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.bm25_index import tokenize
+
+SHINGLE_SIZE = 3
+MIN_TOKENS = 10  # 이보다 짧은 청크는 정확히 같을 때만 중복으로 본다
+
+
+def _shingles(tokens: List[str]) -> List[str]:
+    if len(tokens) < SHINGLE_SIZE:
+        return tokens
+    return [
+        " ".join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    ]
+
+
+def simhash(tokens: List[str]) -> int:
+    """단어 3-gram 빈도 가중 64비트 SimHash"""
+    counts = Counter(_shingles(tokens))
+    if not counts:
+        return 0
+    hashes = np.array(
+        [
+            int.from_bytes(
+                hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little"
+            )
+            for s in counts
+        ],
+        dtype=np.uint64,
+    )
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    bits = np.unpackbits(
+        hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little"
+    ).astype(np.int64)
+    votes = (bits * 2 - 1).T @ weights
+    fingerprint = 0
+    for bit in np.nonzero(votes > 0)[0]:
+        fingerprint |= 1 << int(bit)
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def collapse_near_duplicates(
+    results: List[Dict], max_distance: int = 8
+) -> Tuple[List[Dict], int]:
+    """점수 내림차순 results에서 근사 중복을 대표 청크 하나로 병합 → (병합된 목록, 병합된 청크 수)
+
+    입력 dict는 바꾸지 않는다 (대표 청크는 복사본에 duplicates를 붙임).
+    """
+    kept: List[Dict] = []
+    fingerprints: List[Tuple[int, bool, str]] = []
+    copied = set()
+    collapsed = 0
+    for result in results:
+        text = result.get("text", "")
+        tokens = tokenize(text)
+        long_enough = len(tokens) >= MIN_TOKENS
+        fingerprint = simhash(tokens) if long_enough else 0
+        exact = " ".join(tokens)
+
+        match = None
+        for i, (other, other_long, other_exact) in enumerate(fingerprints):
+            if long_enough and other_long:
+                if hamming(fingerprint, other) <= max_distance:
+                    match = i
+                    break
+            elif exact == other_exact:
+                match = i
+                break
+
+        if match is None:
+            kept.append(result)
+            fingerprints.append((fingerprint, long_enough, exact))
+            continue
+
+        collapsed += 1
+        if match not in copied:
+            # 갭 보강처럼 같은 결과를 다시 병합해도 이전 목록의 duplicates가 늘지 않도록
+            kept[match] = {
+                **kept[match],
+                "duplicates": list(kept[match].get("duplicates", [])),
+            }
+            copied.add(match)
+        kept[match]["duplicates"].append(
+            {
+                "collection": result.get("collection"),
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "score": result.get("score"),
+            }
+        )
+    return kept, collapsed
@@ -0,0 +1,169 @@
+# utils/dispatcher.py
+"""
+채팅 요청 디스패처
+
+- 동기 파이프라인은 제한된 워커 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+- 비동기 파이프라인(achat)은 이벤트 루프에서 직접 await
+- 스트리밍 파이프라인(astream_chat)은 스트림이 끝날 때까지 슬롯을 점유
+- 대기 요청 수 상한 초과 시 즉시 거절 (backpressure)
+- 같은 프로젝트의 요청은 순서대로 하나씩 처리 (세션 상태 보호)
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class DispatcherBusy(Exception):
+    """대기 요청이 상한에 도달하여 새 요청을 받을 수 없음"""
+
+
+class ChatDispatcher:
+    """워커 풀 + 대기열 상한 + 프로젝트별 직렬화"""
+
+    def __init__(self, max_workers: int = 8, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fda-chat"
+        )
+
+        # 이벤트 루프 스레드에서만 접근하지만 stats()는 다른 스레드에서도 호출될 수 있음
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+        # key → [asyncio.Lock, 참조 수]
+        self._key_locks: Dict[Hashable, list] = {}
+
+    async def run(
+        self, key: Optional[Hashable], fn: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """fn(*args, **kwargs)를 워커 스레드에서 실행. key가 같은 요청은 직렬 처리
+
+        호출 시점의 contextvars(요청 trace 등)를 워커 스레드로 넘긴다.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await self._dispatch(
+            key,
+            lambda: loop.run_in_executor(
+                self.executor, functools.partial(context.run, fn, *args, **kwargs)
+            ),
+        )
+
+    async def run_async(
+        self,
+        key: Optional[Hashable],
+        coro_fn: Callable[..., Awaitable],
+        *args,
+        **kwargs,
+    ) -> Any:
+        """코루틴 함수를 이벤트 루프에서 직접 await. key가 같은 요청은 직렬 처리"""
+        return await self._dispatch(key, lambda: coro_fn(*args, **kwargs))
+
+    async def _dispatch(
+        self, key: Optional[Hashable], start: Callable[[], Awaitable]
+    ) -> Any:
+        async with self._slot(key):
+            return await start()
+
+    def stream(
+        self,
+        key: Optional[Hashable],
+        agen_fn: Callable[..., AsyncIterator],
+        *args,
+        **kwargs,
+    ) -> AsyncIterator:
+        """비동기 제너레이터를 슬롯 안에서 끝까지 소비 (스트리밍 응답용)
+
+        대기열이 가득 차 있으면 스트림을 시작하기 전에 즉시 DispatcherBusy를 던진다.
+        """
+        with self._lock:
+            self._reject_if_full()
+
+        async def gen():
+            async with self._slot(key):
+                async for item in agen_fn(*args, **kwargs):
+                    yield item
+
+        return gen()
+
+    def _reject_if_full(self):
+        # self._lock을 잡은 상태에서 호출
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise DispatcherBusy(
+                f"Too many pending chat requests ({self._pending}/{self.max_pending})"
+            )
+
+    @asynccontextmanager
+    async def _slot(self, key: Optional[Hashable]):
+        """대기 요청 수 확인 + key별 직렬화 + 실행 카운터"""
+        with self._lock:
+            self._reject_if_full()
+            self._pending += 1
+
+        key_lock = self._acquire_key_lock(key)
+        try:
+            async with key_lock:
+                with self._lock:
+                    self._running += 1
+                try:
+                    yield
+                finally:
+                    with self._lock:
+                        self._running -= 1
+                        self._completed += 1
+        finally:
+            self._release_key_lock(key)
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "rejected": self._rejected,
+                "completed": self._completed,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    def _acquire_key_lock(self, key: Optional[Hashable]):
+        """key별 asyncio.Lock (key가 None이면 직렬화하지 않음)"""
+        if key is None:
+            return _NullLock()
+        entry = self._key_locks.get(key)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._key_locks[key] = entry
+        entry[1] += 1
+        return entry[0]
+
+    def _release_key_lock(self, key: Optional[Hashable]):
+        if key is None:
+            return
+        entry = self._key_locks.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._key_locks[key]
+
+
+class _NullLock:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
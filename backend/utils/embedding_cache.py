@@ -0,0 +1,158 @@
+# utils/embedding_cache.py
+"""
+임베딩 캐시: (모델, 텍스트) → 벡터
+
+generate_optimized_query가 만드는 템플릿 쿼리는 제품이 달라도 거의 같기 때문에
+같은 문자열을 반복해서 임베딩하지 않도록 오케스트레이터, LlamaIndex 쿼리 엔진,
+평가기가 하나의 캐시를 공유한다.
+
+메모리 계층에는 벡터를 float32 array로 보관하고(1536차원 기준 항목당 약 6KB,
+파이썬 float 리스트면 약 50KB) 조회 시점에만 리스트로 변환한다.
+"""
+import hashlib
+import os
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from llama_index.embeddings.openai import OpenAIEmbedding
+
+from utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+def _encode_vector(vector: array) -> bytes:
+    return vector.tobytes()
+
+
+def _decode_vector(raw: bytes) -> array:
+    vector = array("f")
+    vector.frombytes(raw)
+    return vector
+
+
+class EmbeddingCache:
+    """메모리 LRU + 선택적 SQLite 디스크 계층 임베딩 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 20000,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None,
+    ):
+        disk = None
+        if disk_path:
+            disk = SQLiteCache(
+                disk_path, table="embeddings", max_entries=disk_max_entries
+            )
+        self._cache = TieredCache(
+            memory=LRUCache(max_entries=max_entries),
+            disk=disk,
+            encode=_encode_vector,
+            decode=_decode_vector,
+        )
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        vector = self._cache.get(self.make_key(model, text))
+        return vector.tolist() if vector is not None else None
+
+    def put(self, model: str, text: str, vector: List[float]):
+        self._cache.set(self.make_key(model, text), array("f", vector))
+
+    def get_many(
+        self, model: str, texts: List[str]
+    ) -> Tuple[Dict[str, List[float]], List[str]]:
+        """(캐시에 있는 텍스트 → 벡터, 캐시에 없는 고유 텍스트 목록)"""
+        found, missing = {}, []
+        for text in dict.fromkeys(texts):
+            vector = self.get(model, text)
+            if vector is None:
+                missing.append(text)
+            else:
+                found[text] = vector
+        return found, missing
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]):
+        for text, vector in vectors.items():
+            self.put(model, text, vector)
+
+    def stats(self) -> Dict:
+        return self._cache.stats()
+
+    def close(self):
+        self._cache.close()
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """프로세스 전역 임베딩 캐시 (최초 호출 시 환경변수로 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk_max = int(os.getenv("FDA_EMBED_CACHE_DISK_MAX", "200000"))
+                _cache = EmbeddingCache(
+                    max_entries=int(os.getenv("FDA_EMBED_CACHE_SIZE", "20000")),
+                    disk_path=os.getenv("FDA_EMBED_CACHE_PATH") or None,
+                    disk_max_entries=disk_max or None,
+                )
+    return _cache
+
+
+class CachedOpenAIEmbedding(OpenAIEmbedding):
+    """공유 임베딩 캐시를 먼저 조회하는 OpenAIEmbedding"""
+
+    def _cache_model(self, engine: str) -> str:
+        # dimensions가 다르면 같은 모델이라도 벡터가 다르므로 키에 포함
+        return f"{engine}@{self.dimensions}" if self.dimensions else engine
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        model = self._cache_model(self._query_engine)
+        cache = get_embedding_cache()
+        vector = cache.get(model, query)
+        if vector is None:
+            vector = super()._get_query_embedding(query)
+            cache.put(model, query, vector)
+        return vector
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        model = self._cache_model(self._query_engine)
+        cache = get_embedding_cache()
+        vector = cache.get(model, query)
+        if vector is None:
+            vector = await super()._aget_query_embedding(query)
+            cache.put(model, query, vector)
+        return vector
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        model = self._cache_model(self._text_engine)
+        cache = get_embedding_cache()
+        found, missing = cache.get_many(model, texts)
+        if missing:
+            vectors = dict(zip(missing, super()._get_text_embeddings(missing)))
+            cache.put_many(model, vectors)
+            found.update(vectors)
+        return [found[text] for text in texts]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        model = self._cache_model(self._text_engine)
+        cache = get_embedding_cache()
+        found, missing = cache.get_many(model, texts)
+        if missing:
+            vectors = dict(zip(missing, await super()._aget_text_embeddings(missing)))
+            cache.put_many(model, vectors)
+            found.update(vectors)
+        return [found[text] for text in texts]
@@ -0,0 +1,213 @@
+# utils/engine.py
+"""
+프로세스 전역에서 공유하는 FDA 엔진 (툴, 인덱스, LLM 클라이언트, 오케스트레이터).
+
+프로젝트별 세션(FDAAgent)은 대화 메모리와 ReAct 채팅 상태만 가지고,
+무거운 리소스는 모두 이 엔진을 참조한다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from llama_index.core import Settings
+from llama_index.llms.openai import OpenAI
+
+from utils.decomposition_cache import get_decomposition_cache
+from utils.embedding_cache import CachedOpenAIEmbedding
+from utils.llm_cache import get_llm_cache
+from utils.log import get_logger
+from utils.reranker import load_reranker
+
+logger = get_logger(__name__)
+
+
+class FDAEngine:
+    """FDAAgent 세션들이 공유하는 무거운 리소스 묶음"""
+
+    def __init__(
+        self,
+        llm=None,
+        classifier_llm=None,
+        analysis_llm=None,
+        embed_model=None,
+        tools=None,
+        orchestrator=None,
+        use_answer_cache: Optional[bool] = None,
+        use_llm_cache: Optional[bool] = None,
+        reranker=None,
+        fallback_mode: Optional[str] = None,
+    ):
+        # LlamaIndex 전역 설정 (rag_engine과 동일하게 설정)
+        self.embed_model = embed_model or CachedOpenAIEmbedding(
+            model="text-embedding-3-small", api_key=os.getenv("OPENAI_API_KEY")
+        )
+        self.llm = llm or OpenAI(
+            model="gpt-4-turbo", temperature=0.1, api_key=os.getenv("OPENAI_API_KEY")
+        )
+        Settings.embed_model = self.embed_model
+        Settings.llm = self.llm
+
+        # 질문 분류용 보조 LLM
+        self.collection_classifier_llm = classifier_llm or OpenAI(
+            model="gpt-3.5-turbo", temperature=0
+        )
+
+        # 통합 질문 분석용 LLM (JSON 모드로 구조화된 응답 강제)
+        self.analysis_llm = analysis_llm or OpenAI(
+            model="gpt-4-turbo",
+            temperature=0,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            additional_kwargs={"response_format": {"type": "json_object"}},
+        )
+
+        # 검색 전용 오케스트레이터 (QdrantService + 스레드 풀)
+        if orchestrator is None:
+            from utils.orchestrator import SimpleOrchestrator
+
+            orchestrator = SimpleOrchestrator()
+        self.orchestrator = orchestrator
+
+        # 모든 FDA 컬렉션을 '전문가 툴'로 변환
+        # (FDA_TOOL_MODE=retrieval: 오케스트레이터로 검색 청크 반환, synthesis: 컬렉션별 쿼리 엔진 요약)
+        if tools is None:
+            from utils.tools import create_fda_tools
+
+            tools = create_fda_tools(self.orchestrator)
+        self.fda_tools = tools
+
+        # 동기 chat()에서 검색 전 LLM 단계를 동시에 실행하기 위한 스레드 풀
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("FDA_ROUTING_WORKERS", "16")),
+            thread_name_prefix="fda-route",
+        )
+
+        # 제품 분해 캐시 (프로세스 전역 공유, 선택적 디스크 저장)
+        self.decomposition_cache = get_decomposition_cache()
+
+        # 규칙 기반 빠른 라우터 (FDA_FAST_ROUTING=0이면 항상 LLM 분석)
+        if os.getenv("FDA_FAST_ROUTING", "1") != "0":
+            from utils.fast_router import FastRouter
+
+            self.fast_router = FastRouter()
+        else:
+            self.fast_router = None
+
+        # 로컬 질문 분류기 (학습된 모델이 있으면 LLM 분류보다 먼저 사용)
+        self.local_router = self._load_local_router()
+
+        # LLM 분류 로그 (로컬 분류기 학습 데이터)
+        routing_log_path = os.getenv("FDA_ROUTING_LOG")
+        if routing_log_path:
+            from utils.local_router import RoutingLog
+
+            self.routing_log = RoutingLog(routing_log_path)
+        else:
+            self.routing_log = None
+
+        # CrossEncoder 재순위화 (FDA_RERANK=1, 모델은 백그라운드 로드)
+        self.reranker = reranker if reranker is not None else load_reranker()
+
+        # 충분성 평가 실패 시 폴백
+        # - gapfill (기본): 빠진 관점만 한 번에 병렬 보강 검색 후 직접 답변
+        #   (FDA_GAPFILL_REACT=1이면 보강 후에도 부족할 때 ReAct, 결과가 하나도 없으면 항상 ReAct)
+        # - react: 기존 ReAct 에이전트
+        self.fallback_mode = fallback_mode or os.getenv("FDA_FALLBACK_MODE", "gapfill")
+        if self.fallback_mode == "gapfill":
+            from utils.gap_fill import GapFiller
+
+            self.gap_filler = GapFiller(self.orchestrator)
+        else:
+            self.gap_filler = None
+        self.gap_fill_react = os.getenv("FDA_GAPFILL_REACT", "0") == "1"
+
+        # 답변 프롬프트 컨텍스트 토큰 예산 (FDA_CONTEXT_PACKING=0이면 기존처럼 전체 전달)
+        if os.getenv("FDA_CONTEXT_PACKING", "1") != "0":
+            from utils.context_builder import ContextBuilder
+
+            self.context_builder = ContextBuilder()
+        else:
+            self.context_builder = None
+
+        # 라우팅 LLM 호출 캐시 (FDA_LLM_CACHE=0이면 비활성화)
+        if use_llm_cache is None:
+            use_llm_cache = os.getenv("FDA_LLM_CACHE", "1") != "0"
+        self.llm_cache = get_llm_cache() if use_llm_cache else None
+
+        # 의미 기반 답변 캐시 (FDA_ANSWER_CACHE=0이면 비활성화)
+        if use_answer_cache is None:
+            use_answer_cache = os.getenv("FDA_ANSWER_CACHE", "1") != "0"
+        self.answer_cache = self._build_answer_cache() if use_answer_cache else None
+
+    @staticmethod
+    def _load_local_router():
+        path = os.getenv("FDA_LOCAL_ROUTER_PATH")
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            from utils.local_router import LocalRouter
+
+            router = LocalRouter.load(path)
+            logger.info(
+                "🧠 로컬 분류기 로드: %s (학습 %d개, 임계값 %s)",
+                path,
+                router.trained_on,
+                router.threshold,
+            )
+            return router
+        except Exception as e:
+            logger.warning("⚠️ 로컬 분류기 로드 실패: %s", e)
+            return None
+
+    def _build_answer_cache(self):
+        from utils.answer_cache import AnswerCache, CollectionVersions
+
+        service = self.orchestrator.qdrant_service
+        return AnswerCache(
+            embed_model=self.embed_model,
+            versions=CollectionVersions(
+                service.collection_versions,
+                service.acollection_versions,
+                refresh_interval=float(
+                    os.getenv("FDA_ANSWER_CACHE_VERSION_CHECK", "60")
+                ),
+            ),
+            max_entries=int(os.getenv("FDA_ANSWER_CACHE_SIZE", "1000")),
+            ttl=float(os.getenv("FDA_ANSWER_CACHE_TTL", "86400")),
+            similarity_threshold=float(os.getenv("FDA_ANSWER_CACHE_THRESHOLD", "0.95")),
+        )
+
+    async def aclose(self):
+        """서버 종료 시 스레드 풀과 커넥션 정리 (FastAPI lifespan에서 호출)"""
+        self.executor.shutdown(wait=True)
+        await self.orchestrator.aclose()
+        if self.reranker is not None:
+            self.reranker.close()
+
+    def close(self):
+        """동기 환경(평가 스크립트 등)에서의 정리"""
+        self.executor.shutdown(wait=True)
+        self.orchestrator.close()
+        if self.reranker is not None:
+            self.reranker.close()
+
+
+_engine: Optional[FDAEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> FDAEngine:
+    """공유 엔진 반환 (최초 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = FDAEngine()
+    return _engine
+
+
+def set_engine(engine: Optional[FDAEngine]):
+    """공유 엔진 교체 (평가/벤치마크에서 스텁 엔진 주입용)"""
+    global _engine
+    with _engine_lock:
+        _engine = engine
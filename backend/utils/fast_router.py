@@ -0,0 +1,343 @@
+# utils/fast_router.py
+"""
+규칙 기반 빠른 라우터: 제품명/컬렉션을 LLM 없이 결정
+
+"21 CFR", "GRN", "Import Alert", "FSVP"처럼 컬렉션이 명확한 표현이나
+잘 알려진 한국 식품명이 있으면 정규식/키워드 표로 바로 라우팅하고,
+확신이 없으면 None을 돌려 기존 LLM 분석(_analyze_query / _classify_question)으로 넘긴다.
+
+- 강한 규칙(식별자, 고유 명칭): 가중치 1.0
+- COLLECTION_STRATEGY['key_focus'] 키워드, 일반 주제어: 가중치 0.5
+- 규칙의 첫 번째 컬렉션은 가중치 전체, 나머지(보조 컬렉션)는 절반을 받음
+- 최고 점수 컬렉션이 threshold 이상이면 확신
+- 검색 쿼리 증강은 원문 + 규칙 확장어 (오케스트레이터가 증강 부분만 검색하므로 원문을 포함해야 함)
+"""
+import os
+import re
+from typing import Dict, List, Optional
+
+from utils.collection_strategy import COLLECTION_STRATEGY
+from utils.decomposition_cache import (
+    PRODUCT_ALIASES,
+    WARM_DECOMPOSITIONS,
+    normalize_product_name,
+)
+from utils.query_analysis import QueryAnalysis
+
+STRONG = 1.0
+WEAK = 0.5
+
+# (이름, 정규식, 컬렉션(중요도 순), 분류, 검색 쿼리 확장어, 가중치)
+ROUTING_RULES = [
+    (
+        "cfr-citation",
+        r"\b21\s*c\.?\s*f\.?\s*r\b|\bcfr\b|\bpart\s*1\d{2}\b|연방\s*규정",
+        ["ecfr", "guidance"],
+        "COMPLIANCE",
+        "21 CFR federal regulations requirements",
+        STRONG,
+    ),
+    (
+        "usc-citation",
+        r"\b21\s*u\.?\s*s\.?\s*c\b|\busc\b|fd&c\s*act|\bsection\s*\d{3}|"
+        r"201\s*\(qq\)|연방\s*법률",
+        ["usc", "guidance"],
+        "DEFINITION",
+        "21 U.S.C. FD&C Act statutory provisions",
+        STRONG,
+    ),
+    (
+        "gras",
+        r"\bgrn\s*(no\.?\s*)?\d*\b|\bgras\b|generally\s+recognized\s+as\s+safe|"
+        r"no\s+objection\s+letter",
+        ["gras", "ecfr"],
+        "COMPLIANCE",
+        "GRAS notice inventory status intended use",
+        STRONG,
+    ),
+    (
+        "import-alert",
+        r"import\s*alerts?|\bdwpe\b|detention\s+without\s+physical|red\s*list|"
+        r"수입\s*경보|수입\s*거부|억류",
+        ["dwpe", "ecfr"],
+        "ENFORCEMENT",
+        "Import Alert detention without physical examination",
+        STRONG,
+    ),
+    (
+        "fsvp",
+        r"\bfsvp\b|foreign\s+supplier\s+verification|(해외\s*)?공급자\s*검증|수입자\s*검증",
+        ["fsvp", "ecfr"],
+        "PROCEDURE",
+        "FSVP foreign supplier verification importer requirements",
+        STRONG,
+    ),
+    (
+        "rpm",
+        r"\brpm\b|regulatory\s+procedures\s+manual|personal\s+(use|importation)|"
+        r"3.month\s+supply|"
+        r"개인\s*(용|사용|수입)|우편|mail\s+shipments?",
+        ["rpm", "dwpe"],
+        "PROCEDURE",
+        "Regulatory Procedures Manual import procedures personal use",
+        STRONG,
+    ),
+    (
+        "cgmp-haccp",
+        r"\bhaccp\b|\bcgmp\b|\bharpc\b|preventive\s+controls?|예방\s*관리",
+        ["ecfr", "guidance"],
+        "COMPLIANCE",
+        "CGMP hazard analysis risk-based preventive controls 21 CFR 117",
+        STRONG,
+    ),
+    (
+        "penalties",
+        r"penalt(y|ies)|prohibited\s+acts?|벌금|처벌|misbrand|adulterat",
+        ["usc", "guidance"],
+        "ENFORCEMENT",
+        "prohibited acts penalties misbranding adulteration",
+        STRONG,
+    ),
+    (
+        "allergen",
+        r"allergen|알레르기|알러지|contains\s+statement",
+        ["guidance", "ecfr"],
+        "COMPLIANCE",
+        "food allergen labeling requirements",
+        WEAK,
+    ),
+    (
+        "labeling",
+        r"label|라벨|표시|nutrition\s+facts|영양\s*성분",
+        ["guidance", "ecfr"],
+        "COMPLIANCE",
+        "food labeling requirements 21 CFR 101",
+        WEAK,
+    ),
+    (
+        "additive",
+        r"additive|첨가물|색소|color\s+additive|preservative|보존료",
+        ["gras", "ecfr"],
+        "COMPLIANCE",
+        "food additive color additive approval status",
+        WEAK,
+    ),
+    (
+        "registration",
+        r"facility\s+registration|시설\s*등록|prior\s+notice|사전\s*통지",
+        ["ecfr", "guidance"],
+        "PROCEDURE",
+        "food facility registration prior notice requirements",
+        WEAK,
+    ),
+]
+
+# 제품명 사전: 워밍 항목 + 별칭 + 자주 묻는 한국 식품
+KOREAN_PRODUCTS = [
+    "새우튀김",
+    "냉동만두",
+    "호떡",
+    "잡채",
+    "떡국",
+    "떡",
+    "한과",
+    "약과",
+    "식혜",
+    "홍삼",
+    "인삼",
+    "고춧가루",
+    "참기름",
+    "간장",
+    "쌈장",
+    "어묵",
+    "젓갈",
+    "김부각",
+    "불닭볶음면",
+    "컵라면",
+    "즉석밥",
+    "김자반",
+    "미역",
+    "누룽지",
+    "매실청",
+    "꿀",
+    "곶감",
+    "오미자차",
+]
+ENGLISH_PRODUCTS = [
+    "kimchi",
+    "tteokbokki",
+    "topokki",
+    "kimbap",
+    "gimbap",
+    "mandu",
+    "korean dumplings",
+    "bulgogi",
+    "bibimbap",
+    "ramyeon",
+    "ramyun",
+    "gochujang",
+    "doenjang",
+    "yuja tea",
+    "yuzu tea",
+    "seasoned laver",
+    "red pepper paste",
+    "soybean paste",
+    "red ginseng",
+]
+
+# 영문 단어 경계 (\b는 한글도 단어 문자로 보므로 "FSVP가", "CFR의"에서 경계를 못 찾음)
+_ASCII_BOUNDARY = r"(?:(?<![a-z0-9])(?=[a-z0-9])|(?<=[a-z0-9])(?![a-z0-9]))"
+
+
+def _compile(pattern: str):
+    return re.compile(pattern.replace(r"\b", _ASCII_BOUNDARY), re.IGNORECASE)
+
+
+# 한 글자 제품명은 독립 어절이면서 조사가 붙었거나 뒤에 수출/규정 같은 말이 올 때만 인정
+# (김치/김밥의 "김", "김 대표님" 같은 성씨 오인 방지)
+_JOSA_RE = re.compile(r"(을|를|이|가|은|는|의|도|만|에|과|와|으로|로)$")
+_PRODUCT_CONTEXT_RE = re.compile(r"^(수출|수입|판매|제품|규정|라벨|표시|포장|통관|fda)", re.IGNORECASE)
+
+# 제품명 바로 뒤에 붙을 수 있는 한글: 조사 또는 수출/규정 같은 말. 그 밖의 한글이 이어지면
+# 다른 음식의 일부로 본다 (간장게장의 "간장", 김치찌개의 "김치")
+_PRODUCT_SUFFIX_RE = re.compile(
+    r"(을|를|이|가|은|는|의|도|만|에|에서|과|와|으로|로|이나|나|랑|까지|부터|처럼|보다)?"
+)
+_HANGUL_RUN_RE = re.compile(r"[가-힣]*")
+
+
+def _key_focus_rules() -> List[tuple]:
+    """COLLECTION_STRATEGY의 key_focus를 약한 키워드 규칙으로 변환"""
+    rules = []
+    for collection, strategy in COLLECTION_STRATEGY.items():
+        for phrase in strategy.get("key_focus", []):
+            pattern = (
+                r"\b"
+                + r"\s+".join(re.escape(word) for word in phrase.lower().split())
+                + r"\b"
+            )
+            rules.append(
+                (
+                    f"key_focus:{collection}",
+                    pattern,
+                    [collection],
+                    "OTHER",
+                    phrase,
+                    WEAK,
+                )
+            )
+    return rules
+
+
+class FastRouter:
+    """정규식/키워드 표와 제품 사전으로 질문을 로컬에서 라우팅"""
+
+    def __init__(
+        self, threshold: float = None, available_collections: List[str] = None
+    ):
+        self.threshold = (
+            threshold
+            if threshold is not None
+            else float(os.getenv("FDA_FAST_ROUTE_THRESHOLD", "1.0"))
+        )
+        self.available_collections = available_collections
+        self.rules = [
+            (name, _compile(pattern), collections, category, expansion, weight)
+            for name, pattern, collections, category, expansion, weight in ROUTING_RULES
+            + _key_focus_rules()
+        ]
+
+        korean = set(WARM_DECOMPOSITIONS) | set(KOREAN_PRODUCTS)
+        korean |= {alias for alias in PRODUCT_ALIASES if re.fullmatch(r"[가-힣]+", alias)}
+        # 긴 이름부터 찾아 "냉동만두"가 "만두"보다 먼저 잡히도록 정렬
+        self._korean_products = sorted(
+            (p for p in korean if len(p) > 1), key=len, reverse=True
+        )
+        self._single_products = {p for p in korean if len(p) == 1}
+        self._english_product_re = _compile(
+            r"\b("
+            + "|".join(
+                re.escape(p) for p in sorted(ENGLISH_PRODUCTS, key=len, reverse=True)
+            )
+            + r")\b"
+        )
+
+    def detect_product(self, query: str) -> Optional[str]:
+        """사전에 있는 제품명 (한글 대표명으로 정규화), 없으면 None"""
+        for product in self._korean_products:
+            start = query.find(product)
+            while start != -1:
+                if self._standalone(query, start + len(product)):
+                    return normalize_product_name(product)
+                start = query.find(product, start + 1)
+        tokens = query.split()
+        for i, token in enumerate(tokens):
+            stem = _JOSA_RE.sub("", token)
+            if stem not in self._single_products:
+                continue
+            following = tokens[i + 1] if i + 1 < len(tokens) else ""
+            if stem != token or _PRODUCT_CONTEXT_RE.match(following):
+                return normalize_product_name(stem)
+        match = self._english_product_re.search(query)
+        if match:
+            return normalize_product_name(match.group(1))
+        return None
+
+    @staticmethod
+    def _standalone(query: str, end: int) -> bool:
+        """query[:end]에서 끝나는 제품명 뒤에 다른 음식 이름이 이어지지 않는지"""
+        following = _HANGUL_RUN_RE.match(query, end).group()
+        return bool(
+            _PRODUCT_SUFFIX_RE.fullmatch(following)
+            or _PRODUCT_CONTEXT_RE.match(following)
+        )
+
+    def score(self, query: str) -> Dict:
+        """규칙 매칭 상세 (리포트/디버깅용)"""
+        scores: Dict[str, float] = {}
+        matched = []
+        for name, pattern, collections, category, expansion, weight in self.rules:
+            if not pattern.search(query):
+                continue
+            matched.append((name, category, expansion, weight))
+            for i, collection in enumerate(collections):
+                if (
+                    self.available_collections
+                    and collection not in self.available_collections
+                ):
+                    continue
+                scores[collection] = scores.get(collection, 0.0) + (
+                    weight if i == 0 else weight / 2
+                )
+        return {
+            "product": self.detect_product(query),
+            "scores": scores,
+            "matched": matched,
+        }
+
+    def route(self, query: str) -> Optional[QueryAnalysis]:
+        """확신할 수 있으면 QueryAnalysis, 아니면 None (LLM 분석으로 폴백)"""
+        detail = self.score(query)
+        if detail["product"]:
+            return QueryAnalysis(
+                product_name=detail["product"],
+                category="PRODUCT",
+                reason=f"규칙 라우팅: 제품 사전 '{detail['product']}'",
+            )
+
+        scores = detail["scores"]
+        if not scores or max(scores.values()) < self.threshold:
+            return None
+
+        ranked = sorted(scores, key=lambda c: scores[c], reverse=True)
+        collections = [c for c in ranked if scores[c] >= WEAK][:4]
+        strongest = max(detail["matched"], key=lambda m: m[3])
+        expansions = list(dict.fromkeys(m[2] for m in detail["matched"]))
+        # 원문을 앞에 두어 규칙이 잡은 식별자(21 CFR 101.4, GRN 1023 등)가 밀집 검색 쿼리에 남도록 함
+        return QueryAnalysis(
+            augmented_query=" ".join([query.strip()] + expansions),
+            category=strongest[1],
+            collections=collections,
+            reason="규칙 라우팅: "
+            + ", ".join(dict.fromkeys(m[0] for m in detail["matched"])),
+        )
@@ -0,0 +1,228 @@
+# utils/gap_fill.py
+"""
+보강 검색(gap-fill): ReAct 폴백 대신 빠진 관점만 한 번에 병렬 재검색
+
+충분성 평가에 실패하면 기존에는 ReActAgent(max_iterations=10)가 gpt-4-turbo 호출과
+QueryEngineTool(gpt-4o-mini 요약)을 순차로 반복했다. GapFiller는
+1. 1차 검색 결과에서 빠진 관점(CFR 규정, Import Alert, 라벨링/알레르기, FSVP)을 규칙으로 찾고
+2. 관점별 후속 쿼리를 (컬렉션, 쿼리) 목록으로 만들어 search_many 한 번으로 병렬 검색한 뒤
+3. merge_and_rank + 근사 중복 병합으로 1차 결과와 합친다.
+라운드 수(rounds)와 전체 시간 예산(budget_ms)을 넘기면 그때까지의 결과로 멈춘다.
+"""
+import os
+import re
+import time
+from typing import Dict, List, Tuple
+
+from utils.dedup import collapse_near_duplicates
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# (이름, 후속 검색 컬렉션, 질문에서 관련 여부 판단 정규식, 결과에서 충족 여부 판단 정규식, 후속 쿼리 템플릿)
+ASPECTS = [
+    (
+        "cfr",
+        "ecfr",
+        r"cfr|regulat|requirement|규정|요건|기준",
+        r"21\s*c\.?f\.?r|§\s*\d|part\s*1\d{2}",
+        "21 CFR federal regulations requirements for {subject}",
+    ),
+    (
+        "import_alert",
+        "dwpe",
+        r"import\s*alert|detention|refus|dwpe|수입\s*경보|억류|거부|통관",
+        r"import\s*alert|detention without physical",
+        "Import Alert detention without physical examination {subject}",
+    ),
+    (
+        "labeling",
+        "guidance",
+        r"label|allergen|nutrition|라벨|표시|알레르기|알러지|영양",
+        r"label|allergen",
+        "food labeling allergen declaration requirements {subject}",
+    ),
+    (
+        "fsvp",
+        "fsvp",
+        r"fsvp|foreign\s+supplier|importer|verification|공급자|수입자|검증",
+        r"fsvp|foreign supplier verification",
+        "FSVP foreign supplier verification importer requirements {subject}",
+    ),
+]
+
+_ENHANCED_RE = re.compile(r"Enhanced search query:\s*(.+)", re.DOTALL)
+
+
+def _subject(query: str, route: dict) -> str:
+    """후속 쿼리에 붙일 주제 (제품 분해 > 증강 쿼리 > 원문)"""
+    decomposition = route.get("decomposition")
+    if decomposition:
+        parts = (decomposition.get("subcategories") or [])[:2] + (
+            decomposition.get("ingredients") or []
+        )[:3]
+        return " ".join(parts) or decomposition.get("category", "") or query
+    match = _ENHANCED_RE.search(route.get("search_query") or "")
+    return (match.group(1) if match else query).strip()[:200]
+
+
+class GapFiller:
+    """빠진 관점을 찾아 한 번의 병렬 보강 검색으로 채운다"""
+
+    def __init__(
+        self,
+        orchestrator,
+        rounds: int = None,
+        budget_ms: float = None,
+        max_queries: int = None,
+        fallback_collections: List[str] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.rounds = rounds or int(os.getenv("FDA_GAPFILL_ROUNDS", "1"))
+        self.budget_ms = budget_ms or float(os.getenv("FDA_GAPFILL_BUDGET_MS", "4000"))
+        self.max_queries = max_queries or int(os.getenv("FDA_GAPFILL_MAX_QUERIES", "6"))
+        self.fallback_collections = fallback_collections or [
+            "guidance",
+            "ecfr",
+            "gras",
+            "dwpe",
+        ]
+        self.aspects = [
+            (
+                name,
+                collection,
+                re.compile(relevant, re.IGNORECASE),
+                re.compile(evidence, re.IGNORECASE),
+                template,
+            )
+            for name, collection, relevant, evidence, template in ASPECTS
+        ]
+
+    def find_gaps(
+        self, query: str, route: dict, results: List[Dict], searched: List[str]
+    ) -> List[Tuple[str, str, str]]:
+        """[(관점 이름, 컬렉션, 후속 쿼리)] - 제품 질문은 4개 관점 모두, 일반 질문은 질문과 관련된 관점만"""
+        subject = _subject(query, route)
+        question = f"{query} {route.get('search_query', '')}"
+        gaps = []
+        for name, collection, relevant, evidence, template in self.aspects:
+            if not route.get("decomposition") and not relevant.search(question):
+                continue
+            covered = any(
+                r["collection"] == collection
+                or evidence.search(f"{r.get('title', '')} {r.get('text', '')[:3000]}")
+                for r in results
+            )
+            if not covered:
+                gaps.append((name, collection, template.format(subject=subject)))
+
+        # 관련 관점이 모두 채워졌는데도 결과가 부족하면 아직 검색하지 않은 기본 컬렉션으로 넓힘
+        if not gaps:
+            for collection in self.fallback_collections:
+                if collection not in searched:
+                    gaps.append((f"coverage:{collection}", collection, subject))
+        return gaps[: self.max_queries]
+
+    def _merge(self, results: List[Dict], searched: dict) -> List[Dict]:
+        added = (
+            self.orchestrator.merge_and_rank(searched)
+            if searched["results_by_collection"]
+            else []
+        )
+        seen = {
+            (r["collection"], r.get("title"), r.get("text", "")[:500]) for r in results
+        }
+        added = [
+            r
+            for r in added
+            if (r["collection"], r.get("title"), r.get("text", "")[:500]) not in seen
+        ]
+        merged = sorted(results + added, key=lambda r: r["score"], reverse=True)
+        if self.orchestrator.dedup_distance is not None:  # FDA_DEDUP=0이면 병합하지 않음
+            merged, _ = collapse_near_duplicates(
+                merged, self.orchestrator.dedup_distance
+            )
+        return merged
+
+    @staticmethod
+    def _report(
+        start: float, rounds: int, gaps: list, queries: int, added: int, timed_out: bool
+    ) -> Dict:
+        return {
+            "rounds": rounds,
+            "gaps": gaps,
+            "queries": queries,
+            "added": added,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "timed_out": timed_out,
+        }
+
+    def fill(
+        self, query: str, route: dict, results: List[Dict]
+    ) -> Tuple[List[Dict], Dict]:
+        """(보강된 결과, 리포트)"""
+        start = time.perf_counter()
+        before = len(results)
+        searched = list(route.get("collections") or [])
+        all_gaps, queries, timed_out, rounds = [], 0, False, 0
+        issued = set()
+        for rounds in range(1, self.rounds + 1):
+            remaining = self.budget_ms / 1000 - (time.perf_counter() - start)
+            if remaining <= 0:
+                timed_out = True
+                break
+            # 이전 라운드에서 이미 보낸 쿼리는 다시 보내지 않음
+            gaps = [
+                g
+                for g in self.find_gaps(query, route, results, searched)
+                if g[1:] not in issued
+            ]
+            if not gaps:
+                break
+            logger.debug("🧩 보강 검색 %d회차: %s", rounds, [name for name, _, _ in gaps])
+            found = self.orchestrator.search_many(
+                [(collection, q) for _, collection, q in gaps], timeout=remaining
+            )
+            results = self._merge(results, found)
+            all_gaps += [name for name, _, _ in gaps]
+            searched += [collection for _, collection, _ in gaps]
+            queries += len(gaps)
+            issued.update(g[1:] for g in gaps)
+        return results, self._report(
+            start, rounds, all_gaps, queries, len(results) - before, timed_out
+        )
+
+    async def afill(
+        self, query: str, route: dict, results: List[Dict]
+    ) -> Tuple[List[Dict], Dict]:
+        """fill의 비동기 버전"""
+        start = time.perf_counter()
+        before = len(results)
+        searched = list(route.get("collections") or [])
+        all_gaps, queries, timed_out, rounds = [], 0, False, 0
+        issued = set()
+        for rounds in range(1, self.rounds + 1):
+            remaining = self.budget_ms / 1000 - (time.perf_counter() - start)
+            if remaining <= 0:
+                timed_out = True
+                break
+            # 이전 라운드에서 이미 보낸 쿼리는 다시 보내지 않음
+            gaps = [
+                g
+                for g in self.find_gaps(query, route, results, searched)
+                if g[1:] not in issued
+            ]
+            if not gaps:
+                break
+            logger.debug("🧩 보강 검색 %d회차: %s", rounds, [name for name, _, _ in gaps])
+            found = await self.orchestrator.asearch_many(
+                [(collection, q) for _, collection, q in gaps], timeout=remaining
+            )
+            results = self._merge(results, found)
+            all_gaps += [name for name, _, _ in gaps]
+            searched += [collection for _, collection, _ in gaps]
+            queries += len(gaps)
+            issued.update(g[1:] for g in gaps)
+        return results, self._report(
+            start, rounds, all_gaps, queries, len(results) - before, timed_out
+        )
@@ -0,0 +1,145 @@
+# utils/llm_cache.py
+"""
+LLM 호출 메모이제이션: (모델, 온도, 추가 옵션, 프롬프트 해시) → 응답 텍스트
+
+제품명 추출, 질문 증강, 컬렉션 분류, 통합 질문 분석처럼 같은 질문이면 같은 결과를 내는
+라우팅 호출에 사용한다. 답변 생성 호출은 대화마다 결과가 달라야 하므로 사용하지 않는다.
+
+- parse가 예외를 내는 응답은 저장하지 않음 (재시도 시 다시 LLM 호출)
+- 캐시된 응답의 parse가 실패하면 (프롬프트/파서 변경 등) 항목을 지우고 다시 호출
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+def _identity(text: str) -> str:
+    return text
+
+
+class LLMCallCache:
+    """메모리 LRU + 선택적 SQLite 디스크 계층 LLM 응답 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        disk_path: Optional[str] = None,
+        disk_max_entries: Optional[int] = None,
+    ):
+        disk = None
+        if disk_path:
+            disk = SQLiteCache(
+                disk_path, table="llm_calls", max_entries=disk_max_entries
+            )
+        self._cache = TieredCache(
+            memory=LRUCache(max_entries=max_entries),
+            disk=disk,
+            encode=lambda text: text.encode("utf-8"),
+            decode=lambda raw: raw.decode("utf-8"),
+        )
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._rejected = 0
+
+    @staticmethod
+    def make_key(llm, prompt: str) -> str:
+        """모델명, 온도, 추가 옵션(JSON 모드 등)과 프롬프트 해시로 키 생성"""
+        model = llm.metadata.model_name
+        temperature = getattr(llm, "temperature", None)
+        options = json.dumps(
+            getattr(llm, "additional_kwargs", None) or {}, sort_keys=True
+        )
+        digest = hashlib.sha256(f"{options}\n{prompt}".encode("utf-8")).hexdigest()
+        return f"{model}:{temperature}:{digest}"
+
+    def complete(self, llm, prompt: str, parse: Callable[[str], Any] = None) -> Any:
+        """llm.complete(prompt)를 캐시 경유로 호출하고 parse(text) 결과 반환"""
+        parse = parse or _identity
+        key = self.make_key(llm, prompt)
+        cached = self._lookup(key, parse)
+        if cached is not None:
+            return cached[0]
+        text = llm.complete(prompt).text
+        return self._store(key, text, parse)
+
+    async def acomplete(
+        self, llm, prompt: str, parse: Callable[[str], Any] = None
+    ) -> Any:
+        """complete의 비동기 버전"""
+        parse = parse or _identity
+        key = self.make_key(llm, prompt)
+        cached = self._lookup(key, parse)
+        if cached is not None:
+            return cached[0]
+        text = (await llm.acomplete(prompt)).text
+        return self._store(key, text, parse)
+
+    def _lookup(self, key: str, parse: Callable[[str], Any]) -> Optional[tuple]:
+        """(parse 결과,) 또는 None"""
+        text = self._cache.get(key)
+        if text is not None:
+            try:
+                value = parse(text)
+            except Exception:
+                self._cache.delete(key)
+            else:
+                with self._lock:
+                    self._hits += 1
+                return (value,)
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def _store(self, key: str, text: str, parse: Callable[[str], Any]) -> Any:
+        try:
+            value = parse(text)
+        except Exception:
+            with self._lock:
+                self._rejected += 1
+            raise
+        self._cache.set(key, text)
+        with self._lock:
+            self._stores += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            summary = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "rejected": self._rejected,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+        summary.update(self._cache.stats())
+        return summary
+
+    def close(self):
+        self._cache.close()
+
+
+_cache: Optional[LLMCallCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCallCache:
+    """프로세스 전역 LLM 호출 캐시 (최초 호출 시 환경변수로 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                disk_max = int(os.getenv("FDA_LLM_CACHE_DISK_MAX", "100000"))
+                _cache = LLMCallCache(
+                    max_entries=int(os.getenv("FDA_LLM_CACHE_SIZE", "5000")),
+                    disk_path=os.getenv("FDA_LLM_CACHE_PATH") or None,
+                    disk_max_entries=disk_max or None,
+                )
+    return _cache
@@ -0,0 +1,152 @@
+# utils/local_router.py
+"""
+로컬 질문 분류기: 질문 → 검색할 컬렉션 (TF-IDF + 로지스틱 회귀, CPU 수 ms)
+
+_classify_question의 gpt-3.5-turbo 호출을 대신한다.
+- 학습 데이터: LLM 분류 로그(FDA_ROUTING_LOG, JSONL) + test_dataset의 expected_collections
+- 학습: python -m evaluation.train_local_router
+- 예측 확신도가 threshold 미만이면 None → LLM 분류로 폴백
+  확신도는 결정 전체 기준: 선택한 컬렉션은 p, 선택하지 않은 컬렉션은 1 - p의 최솟값
+  (MIN_COLLECTIONS를 채우려고 0.5 미만에서 끌어온 컬렉션도 p로 계산됨)
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from utils.answer_cache import normalize_query
+
+MIN_COLLECTIONS = 2
+MAX_COLLECTIONS = 4
+
+
+class RoutingLog:
+    """LLM 분류 결과를 JSONL로 누적 (로컬 분류기 학습 데이터)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def append(
+        self,
+        query: str,
+        collections: List[str],
+        category: str = None,
+        source: str = "llm",
+    ):
+        record = {
+            "query": query,
+            "collections": list(collections),
+            "category": category,
+            "source": source,
+            "ts": time.time(),
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    @staticmethod
+    def read(path: str) -> Iterable[Dict]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("query") and record.get("collections"):
+                    yield record
+
+
+class LocalRouter:
+    """다중 레이블 컬렉션 분류기"""
+
+    def __init__(self, threshold: float = None):
+        self.threshold = (
+            threshold
+            if threshold is not None
+            else float(os.getenv("FDA_LOCAL_ROUTER_THRESHOLD", "0.7"))
+        )
+        self.vectorizer = TfidfVectorizer(
+            analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True, min_df=1
+        )
+        self.binarizer = MultiLabelBinarizer()
+        self.model = OneVsRestClassifier(
+            LogisticRegression(C=5.0, class_weight="balanced", max_iter=1000)
+        )
+        self.trained_on = 0
+
+    def fit(self, queries: List[str], labels: List[List[str]]) -> "LocalRouter":
+        features = self.vectorizer.fit_transform([normalize_query(q) for q in queries])
+        targets = self.binarizer.fit_transform(labels)
+        self.model.fit(features, targets)
+        self.trained_on = len(queries)
+        return self
+
+    def probabilities(self, query: str) -> Dict[str, float]:
+        features = self.vectorizer.transform([normalize_query(query)])
+        probs = self.model.predict_proba(features)[0]
+        return dict(zip(self.binarizer.classes_, (float(p) for p in probs)))
+
+    def predict(self, query: str) -> Dict:
+        """{"collections", "confidence", "probabilities"} (확신도와 관계없이)"""
+        probs = self.probabilities(query)
+        ranked = sorted(probs, key=probs.get, reverse=True)
+        collections = [c for c in ranked if probs[c] >= 0.5][:MAX_COLLECTIONS]
+        for c in ranked:
+            if len(collections) >= MIN_COLLECTIONS:
+                break
+            if c not in collections:
+                collections.append(c)
+        return {
+            "collections": collections,
+            "confidence": self.decision_confidence(probs, collections),
+            "probabilities": probs,
+        }
+
+    @staticmethod
+    def decision_confidence(probs: Dict[str, float], collections: List[str]) -> float:
+        """모든 컬렉션의 포함/제외 결정 중 가장 불확실한 것의 확률"""
+        selected = set(collections)
+        return min(p if c in selected else 1 - p for c, p in probs.items())
+
+    def classify(self, query: str) -> Optional[Dict]:
+        """확신도가 threshold 이상이면 _classify_question 형식 결과, 아니면 None"""
+        prediction = self.predict(query)
+        if prediction["confidence"] < self.threshold:
+            return None
+        return {
+            "category": "OTHER",
+            "collections": prediction["collections"],
+            "reason": f"로컬 분류기 (확신도 {prediction['confidence']:.2f})",
+        }
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str, threshold: float = None) -> "LocalRouter":
+        router = joblib.load(path)
+        if threshold is not None:
+            router.threshold = threshold
+        else:
+            router.threshold = float(
+                os.getenv("FDA_LOCAL_ROUTER_THRESHOLD", str(router.threshold))
+            )
+        return router
@@ -0,0 +1,133 @@
+# utils/log.py
+"""
+요청 경로용 구조화 로깅 (레벨, 지연 포맷팅, 상세 페이로드 샘플링, 요청 ID)
+
+- 모듈은 get_logger(__name__)로 표준 logging 로거를 받고, 메시지는 %-인자로 넘긴다
+  (레벨이 꺼져 있으면 문자열을 만들지 않음). 점수 목록처럼 인자 계산 자체가 비싼 경우
+  logger.isEnabledFor(logging.DEBUG)로 감싼다.
+- 검색 문서 본문, 최종 답변 전문 같은 큰 페이로드는 verbose()로만 남긴다.
+  DEBUG가 켜져 있고 현재 요청이 샘플링된 경우에만 FDA_LOG_PAYLOAD_CHARS자까지 기록한다.
+- request_scope()가 요청 ID와 샘플링 여부를 contextvar에 두어 같은 요청의 로그를 묶는다
+  (스레드 풀은 tracing.bind()/디스패처의 컨텍스트 복사로 함께 전달됨).
+
+환경 변수
+- FDA_LOG_LEVEL: 기본 INFO (DEBUG면 단계별 상세 로그, ReAct verbose 출력 포함)
+- FDA_LOG_FORMAT: text(기본) / json (한 줄에 레코드 하나, extra 필드 포함)
+- FDA_LOG_SAMPLE_RATE: verbose 페이로드를 남길 요청 비율 (기본 1.0, DEBUG일 때만 의미 있음)
+- FDA_LOG_PAYLOAD_CHARS: verbose 페이로드 최대 길이 (기본 2000)
+"""
+import contextvars
+import json
+import logging
+import os
+import random
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+LOG_LEVEL = os.getenv("FDA_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("FDA_LOG_FORMAT", "text")
+SAMPLE_RATE = float(os.getenv("FDA_LOG_SAMPLE_RATE", "1.0"))
+PAYLOAD_CHARS = int(os.getenv("FDA_LOG_PAYLOAD_CHARS", "2000"))
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "fda_request_id", default=None
+)
+_sampled: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar(
+    "fda_log_sampled", default=None
+)
+
+# LogRecord 기본 속성 (json 포맷에서 extra 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def sampled() -> bool:
+    """현재 요청의 verbose 페이로드 샘플링 여부 (요청 밖이면 호출마다 결정)"""
+    decision = _sampled.get()
+    if decision is None:
+        return random.random() < SAMPLE_RATE
+    return decision
+
+
+@contextmanager
+def request_scope(request_id: Optional[str] = None):
+    """요청 ID와 샘플링 여부를 현재 컨텍스트에 설정 (이미 요청 안이면 그대로 사용)"""
+    if _request_id.get() is not None:
+        yield _request_id.get()
+        return
+    rid = request_id or uuid.uuid4().hex[:12]
+    id_token = _request_id.set(rid)
+    sample_token = _sampled.set(random.random() < SAMPLE_RATE)
+    try:
+        yield rid
+    finally:
+        _request_id.reset(id_token)
+        _sampled.reset(sample_token)
+
+
+def verbose(logger: logging.Logger, label: str, payload: str):
+    """큰 페이로드 로그 (DEBUG + 샘플링된 요청에서만, PAYLOAD_CHARS자까지)"""
+    if not logger.isEnabledFor(logging.DEBUG) or not sampled():
+        return
+    text = str(payload)
+    size = len(text)
+    if size > PAYLOAD_CHARS:
+        text = f"{text[:PAYLOAD_CHARS]}... (+{size - PAYLOAD_CHARS}자)"
+    logger.debug("%s\n%s", label, text, extra={"payload_chars": size})
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """ts, level, logger, request_id, message + extra 필드"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup(level: Optional[str] = None, fmt: Optional[str] = None):
+    """루트 로거 설정 (main.py 시작 시 한 번 호출, 기존 basicConfig 대체)"""
+    handler = logging.StreamHandler()
+    handler.addFilter(_RequestIdFilter())
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+            )
+        )
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level or LOG_LEVEL)
+    # 요청마다 찍히는 HTTP 클라이언트 로그는 한 단계 올림
+    for noisy in ("httpx", "httpcore", "openai"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
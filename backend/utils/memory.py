@@ -66,4 +66,34 @@ class ConversationMemory:
     
     def clear_history(self):
         """대화 히스토리 초기화"""
-        self.messages.clear()
\ No newline at end of file
+        self.messages.clear()
+
+    def to_dict(self) -> Dict:
+        """디스크 저장용 직렬화"""
+        return {
+            "max_history": self.max_history,
+            "messages": [
+                {
+                    "role": msg.role,
+                    "content": msg.content,
+                    "timestamp": msg.timestamp.isoformat(),
+                    "tools_used": msg.tools_used,
+                }
+                for msg in self.messages
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConversationMemory":
+        """to_dict() 결과로부터 메모리 복원"""
+        memory = cls(max_history=data.get("max_history", 10))
+        for item in data.get("messages", []):
+            memory.messages.append(
+                ChatMessage(
+                    role=item["role"],
+                    content=item["content"],
+                    timestamp=datetime.fromisoformat(item["timestamp"]),
+                    tools_used=item.get("tools_used", []),
+                )
+            )
+        return memory
@@ -0,0 +1,266 @@
+# utils/metrics.py
+"""
+Prometheus 메트릭 (/metrics)
+
+- 요청 경로 메트릭은 완료된 요청 trace(utils.tracing)에서 집계한다. 파이프라인에 별도 계측을 넣지 않고
+  이미 기록되는 span(단계, llm, qdrant.search)과 trace 속성(path)을 그대로 사용한다.
+  - fda_requests_total{entry, path}: 요청 수 (path: direct / react_agent / cache / error)
+  - fda_request_duration_seconds{entry}, fda_stage_duration_seconds{stage}
+  - fda_llm_calls_total{model, stage}, fda_llm_tokens_total{model, type}
+    (ReAct 에이전트 내부 LLM 호출은 llama-index가 직접 하므로 제외, 툴 호출 수는 fda_react_tool_calls_total)
+  - fda_qdrant_search_duration_seconds{collection}
+- 스크랩 시점 값은 등록된 stats 함수(세션 저장소, 캐시, 디스패처, 스레드 풀)에서 읽는다.
+
+prometheus_client가 없거나 FDA_METRICS=0이면 get_metrics()가 None을 반환한다.
+"""
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from utils import tracing
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 요청/단계 지연 히스토그램 버킷(초): 규칙 라우팅(ms) ~ ReAct 폴백(수십 초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+SEARCH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# fda_stage_duration_seconds로 집계하는 span 이름
+STAGES = {
+    "route",
+    "fast_route",
+    "analyze",
+    "extract_product",
+    "augment",
+    "classify",
+    "decompose",
+    "search",
+    "embed",
+    "merge",
+    "rerank",
+    "sufficiency",
+    "gap_fill",
+    "search_many",
+    "react_agent",
+    "generation",
+}
+
+
+class PipelineMetrics:
+    """요청 trace → Prometheus 카운터/히스토그램 + 스크랩 시점 stats 게이지"""
+
+    def __init__(self, registry=None):
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        self.registry = registry or REGISTRY
+        self.requests = Counter(
+            "fda_requests",
+            "Chat requests by entry point and answer path",
+            ["entry", "path"],
+            registry=self.registry,
+        )
+        self.request_duration = Histogram(
+            "fda_request_duration_seconds",
+            "End-to-end chat pipeline latency",
+            ["entry"],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.stage_duration = Histogram(
+            "fda_stage_duration_seconds",
+            "Pipeline stage latency",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry,
+        )
+        self.llm_calls = Counter(
+            "fda_llm_calls",
+            "LLM calls by model and pipeline stage",
+            ["model", "stage"],
+            registry=self.registry,
+        )
+        self.llm_tokens = Counter(
+            "fda_llm_tokens",
+            "LLM tokens by model (prompt / completion, tiktoken estimate)",
+            ["model", "type"],
+            registry=self.registry,
+        )
+        self.search_duration = Histogram(
+            "fda_qdrant_search_duration_seconds",
+            "Qdrant search latency per collection",
+            ["collection"],
+            buckets=SEARCH_BUCKETS,
+            registry=self.registry,
+        )
+        self.tool_calls = Counter(
+            "fda_react_tool_calls",
+            "Tool calls made by the ReAct fallback agent",
+            registry=self.registry,
+        )
+        self._stats = _StatsCollector()
+        self.registry.register(self._stats)
+
+    def bind_stats(self, **sources: Callable[[], Dict]):
+        """스크랩 시점에 읽을 stats 함수 등록 (sessions, caches, dispatcher, pools)"""
+        self._stats.sources.update(sources)
+
+    def observe_trace(self, trace: "tracing.Trace"):
+        """완료된 요청 trace 하나를 집계 (tracing listener)"""
+        entry = trace.name
+        self.requests.labels(entry, trace.attrs.get("path", "unknown")).inc()
+        if trace.end is not None:
+            self.request_duration.labels(entry).observe(trace.end - trace.start)
+
+        names = {span.span_id: span.name for span in trace.spans}
+        for span in trace.spans:
+            seconds = span.duration_ms / 1000
+            if span.name in STAGES:
+                self.stage_duration.labels(span.name).observe(seconds)
+            if span.name == "qdrant.search":
+                self.search_duration.labels(
+                    span.attrs.get("collection", "unknown")
+                ).observe(seconds)
+            elif span.name == "react_agent":
+                self.tool_calls.inc(span.attrs.get("tool_calls", 0))
+            if span.name == "llm" or (
+                span.name == "generation" and "model" in span.attrs
+            ):
+                model = str(span.attrs.get("model", "unknown"))
+                stage = (
+                    "generation"
+                    if span.name == "generation"
+                    else names.get(span.parent_id, "unknown")
+                )
+                self.llm_calls.labels(model, stage).inc()
+                for kind in ("prompt", "completion"):
+                    tokens = span.attrs.get(f"{kind}_tokens")
+                    if tokens:
+                        self.llm_tokens.labels(model, kind).inc(tokens)
+
+    def render(self):
+        """(본문, Content-Type)"""
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+
+class _StatsCollector:
+    """기존 stats() 딕셔너리를 스크랩 시점에 게이지/카운터로 변환"""
+
+    def __init__(self):
+        self.sources: Dict[str, Callable[[], Dict]] = {}
+
+    def describe(self):
+        # 스크랩 전에 값을 읽지 않도록 빈 목록 (등록 시 collect() 호출 방지)
+        return []
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        sessions = self._read("sessions")
+        if sessions:
+            yield GaugeMetricFamily(
+                "fda_sessions",
+                "Project sessions held in memory",
+                value=sessions.get("sessions", 0),
+            )
+            yield GaugeMetricFamily(
+                "fda_sessions_max",
+                "Session store capacity",
+                value=sessions.get("max_sessions", 0),
+            )
+            evictions = CounterMetricFamily(
+                "fda_session_removals",
+                "Sessions removed from memory",
+                labels=["reason"],
+            )
+            for reason in ("evictions", "expirations", "spills"):
+                evictions.add_metric([reason], sessions.get(reason, 0))
+            yield evictions
+
+        caches = self._read("caches")
+        if caches:
+            hits = CounterMetricFamily("fda_cache_hits", "Cache hits", labels=["cache"])
+            misses = CounterMetricFamily(
+                "fda_cache_misses", "Cache misses", labels=["cache"]
+            )
+            for name, stats in _flatten_caches(caches):
+                hits.add_metric([name], stats.get("hits", 0))
+                misses.add_metric([name], stats.get("misses", 0))
+            yield hits
+            yield misses
+
+        dispatcher = self._read("dispatcher")
+        if dispatcher:
+            for key in ("pending", "running", "queued"):
+                yield GaugeMetricFamily(
+                    f"fda_dispatcher_{key}",
+                    f"Chat dispatcher {key} requests",
+                    value=dispatcher.get(key, 0),
+                )
+            yield CounterMetricFamily(
+                "fda_dispatcher_rejected",
+                "Chat requests rejected with 503",
+                value=dispatcher.get("rejected", 0),
+            )
+
+        pools = self._read("pools")
+        if pools:
+            depth = GaugeMetricFamily(
+                "fda_thread_pool_queue_depth",
+                "Tasks waiting in a thread pool",
+                labels=["pool"],
+            )
+            for name, executor in pools.items():
+                if executor is not None:
+                    depth.add_metric([name], executor._work_queue.qsize())
+            yield depth
+
+    def _read(self, name: str) -> Optional[Dict]:
+        source = self.sources.get(name)
+        if source is None:
+            return None
+        try:
+            return source()
+        except Exception as e:
+            logger.warning("⚠️ 메트릭 수집 실패 (%s): %s", name, e)
+            return None
+
+
+def _flatten_caches(caches: Dict, prefix: str = ""):
+    """hits/misses가 있는 캐시 통계만 평탄화
+
+    {"embedding": {"memory": {...}, "disk": {...}}} → ("embedding_memory", {...}), ...
+    """
+    for name, stats in caches.items():
+        if not isinstance(stats, dict):
+            continue
+        label = f"{prefix}{name}"
+        if "hits" in stats and "misses" in stats:
+            yield label, stats
+        yield from _flatten_caches(stats, f"{label}_")
+
+
+_metrics: Optional[PipelineMetrics] = None
+_metrics_lock = threading.Lock()
+_metrics_failed = False
+
+
+def get_metrics() -> Optional[PipelineMetrics]:
+    """프로세스 전역 메트릭 (최초 호출 시 생성하고 tracing listener로 등록, 비활성화 시 None)"""
+    global _metrics, _metrics_failed
+    if _metrics is None and not _metrics_failed:
+        with _metrics_lock:
+            if _metrics is None and not _metrics_failed:
+                if os.getenv("FDA_METRICS", "1") == "0":
+                    _metrics_failed = True
+                    return None
+                try:
+                    _metrics = PipelineMetrics()
+                except ImportError:
+                    logger.warning("⚠️ prometheus_client가 없어 /metrics 비활성화")
+                    _metrics_failed = True
+                    return None
+                tracing.add_listener(_metrics.observe_trace)
+    return _metrics
@@ -1,88 +1,511 @@
 # utils/orchestrator.py
 import asyncio
-from typing import List, Dict, Any
+import logging
+import os
+from typing import List, Dict, Any, Tuple
 import time
 from utils.qdrant_client import QdrantService
 from concurrent.futures import ThreadPoolExecutor
-import threading
 from utils.collection_strategy import generate_optimized_query, smart_collection_selection, COLLECTION_STRATEGY
+from utils.bm25_index import BM25Store, contains_identifier, identifier_tokens
+from utils.dedup import collapse_near_duplicates
+from utils import tracing
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 컬렉션 검색 방식
+# - batch: 컬렉션별로 쿼리를 묶어 search_batch 한 번 (동기: 스레드 풀, 비동기: asyncio.gather)
+# - threads: 쿼리마다 search 한 번 (이전 방식, 스레드별 이벤트 루프 없이)
+SEARCH_MODE = os.getenv("FDA_SEARCH_MODE", "batch")
+SEARCH_TIMEOUT = 10  # 컬렉션별 검색 타임아웃(초)
+
+# 검색 결과 소스
+# - dense: Qdrant 밀집 벡터 검색만
+# - hybrid: 밀집 검색 + payload로 만든 로컬 BM25 인덱스, merge_and_rank에서 RRF로 융합
+RETRIEVAL_MODE = os.getenv("FDA_RETRIEVAL_MODE", "dense")
+RRF_K = 60  # RRF 상수 (순위 1/(k + rank))
+BM25_LIMIT = 5  # 컬렉션별 BM25 후보 수
+
+# 컬렉션 간 근사 중복 청크 병합 (FDA_DEDUP=0이면 비활성화)
+DEDUP_ENABLED = os.getenv("FDA_DEDUP", "1") != "0"
+DEDUP_DISTANCE = int(os.getenv("FDA_DEDUP_DISTANCE", "8"))  # SimHash 해밍 거리 상한
 
 class SimpleOrchestrator:
     """순수 검색 전용 오케스트레이터 - 책임 분리"""
-    
-    def __init__(self):
-        self.qdrant_service = QdrantService()
+
+    def __init__(
+        self,
+        qdrant_service: QdrantService = None,
+        search_mode: str = None,
+        retrieval_mode: str = None,
+    ):
+        self.qdrant_service = qdrant_service or QdrantService()
+        self.search_mode = search_mode or SEARCH_MODE
+        self.retrieval_mode = retrieval_mode or RETRIEVAL_MODE
+        self.dedup_distance = DEDUP_DISTANCE if DEDUP_ENABLED else None
         # 스레드 풀 생성
         self.executor = ThreadPoolExecutor(max_workers=10)
-    
-    def _search_collection_sync(self, collection: str, query: str, limit: int = 5):
-        """동기식 검색 (스레드에서 실행용)"""
-        try:
-            # 새 이벤트 루프 생성 (각 스레드별로)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(
-                    self.qdrant_service.search_collection(collection, query, limit)
-                )
-                return result
-            finally:
-                loop.close()
-        except Exception as e:
-            print(f"Error in {collection}: {e}")
-            return []
-    
+        # 하이브리드 모드: 컬렉션별 BM25 인덱스 (처음 필요할 때 백그라운드 생성)
+        self.bm25 = None
+        if self.retrieval_mode == "hybrid":
+            self.bm25 = BM25Store(
+                self.qdrant_service,
+                refresh_interval=float(os.getenv("FDA_BM25_REFRESH", "3600")),
+            )
+            self.bm25.warm(list(COLLECTION_STRATEGY))
+
+    def _prepare_queries(
+        self, query: str, collections: List[str], decomposition: dict = None
+    ) -> List[str]:
+        """컬렉션별 최적화된 쿼리 생성 + 로깅 (collections 순서)"""
+        optimized_queries = self._generate_optimized_queries(
+            collections, decomposition, query
+        )
+        self._log_optimized_queries(optimized_queries)
+        return [optimized_queries.get(collection, query) for collection in collections]
+
+    def _group_by_collection(
+        self, collections: List[str], collection_queries: List[str]
+    ) -> Dict[str, List[str]]:
+        """search_batch 요청 단위로 묶기: 컬렉션 → 고유 쿼리 목록"""
+        grouped: Dict[str, List[str]] = {}
+        for collection, collection_query in zip(collections, collection_queries):
+            queries = grouped.setdefault(collection, [])
+            if collection_query not in queries:
+                queries.append(collection_query)
+        return grouped
+
+    def _sparse_candidates(
+        self, query: str, collections: List[str]
+    ) -> Dict[str, List[Tuple]]:
+        """컬렉션별 BM25 후보 [(포인트 id, BM25 점수)] (인덱스가 준비된 컬렉션만)"""
+        if self.bm25 is None:
+            return {}
+        candidates = {}
+        for collection in dict.fromkeys(collections):
+            hits = self.bm25.search(collection, query, BM25_LIMIT)
+            if hits:
+                candidates[collection] = hits
+        if candidates:
+            logger.debug(
+                "🔤 BM25 후보: %s",
+                ", ".join(f"{c} {len(h)}개" for c, h in candidates.items()),
+            )
+        return candidates
+
+    @staticmethod
+    def _attach_bm25(points: list, hits: List[Tuple]) -> List[Tuple]:
+        """밀집 점수를 매긴 BM25 후보를 BM25 순위대로 [(포인트, BM25 점수)]"""
+        by_id = {point.id: point for point in points or []}
+        return [
+            (by_id[point_id], score) for point_id, score in hits if point_id in by_id
+        ]
+
+    def _submit(self, span_name: str, collection: str, fn, *args):
+        """스레드 풀 제출 (요청 trace 컨텍스트를 넘기고 컬렉션별 span 기록)"""
+
+        def run():
+            with tracing.span(span_name, collection=collection):
+                return fn(*args)
+
+        return self.executor.submit(tracing.bind(run))
+
+    def _use_batch(self, collection_queries: List[str], vectors: dict) -> bool:
+        # 배치 임베딩이 실패했으면 쿼리별 검색(개별 임베딩)으로 폴백
+        return self.search_mode == "batch" and all(
+            q in vectors for q in collection_queries
+        )
+
+    @tracing.traced("search")
     def parallel_search(self, query: str, collections: List[str], decomposition: dict = None) -> Dict[str, Any]:
         """순수 검색 기능: 컬렉션별 최적화된 쿼리로 병렬 검색 실행"""
         start_time = time.time()
         
         # 컬렉션별 최적화된 쿼리 생성 (query 파라미터 전달)
-        optimized_queries = self._generate_optimized_queries(collections, decomposition, query)
+        collection_queries = self._prepare_queries(query, collections, decomposition)
+        vectors, embedding = self._embed_queries(collection_queries)
         
-        # 🔍 각 컬렉션별 쿼리 로깅
-        print("🔍 컬렉션별 최적화된 검색 쿼리:")
-        for collection, collection_query in optimized_queries.items():
-            print(f"  {collection}: {collection_query[:80]}...")  # 80자만 출력
+        # (컬렉션, 쿼리) → 결과 future
+        futures: Dict[Tuple[str, str], Any] = {}
+        if self._use_batch(collection_queries, vectors):
+            for collection, queries in self._group_by_collection(
+                collections, collection_queries
+            ).items():
+                future = self._submit(
+                    "qdrant.search",
+                    collection,
+                    self.qdrant_service.search_batch,
+                    collection,
+                    [vectors[q] for q in queries],
+                    5,
+                )
+                for index, collection_query in enumerate(queries):
+                    futures[(collection, collection_query)] = (future, index)
+        else:
+            for collection, collection_query in zip(collections, collection_queries):
+                future = self._submit(
+                    "qdrant.search",
+                    collection,
+                    self.qdrant_service.search_collection,
+                    collection,
+                    collection_query,
+                    5,
+                    vectors.get(collection_query),
+                )
+                futures[(collection, collection_query)] = (future, None)
         
-        futures = []
-        for collection in collections:
-            # 각 컬렉션에 맞는 쿼리 사용
-            collection_query = optimized_queries.get(collection, query)
-            future = self.executor.submit(
-                self._search_collection_sync,
-                collection,
-                collection_query,
-                5
-            )
-            futures.append((collection, future))
+        # 하이브리드: BM25 후보의 밀집 점수를 같은 쿼리 벡터로 계산 (밀집 검색과 동시에)
+        sparse = self._sparse_candidates(query, collections)
+        rescore_futures = {}
+        for collection, collection_query in zip(collections, collection_queries):
+            if (
+                collection in sparse
+                and collection_query in vectors
+                and collection not in rescore_futures
+            ):
+                rescore_futures[collection] = self._submit(
+                    "bm25.rescore",
+                    collection,
+                    self.qdrant_service.score_points,
+                    collection,
+                    vectors[collection_query],
+                    [point_id for point_id, _ in sparse[collection]],
+                )
         
         # 결과 수집
         combined = {
             "search_time": time.time() - start_time,
-            "results_by_collection": {}
+            "search_mode": (
+                self.search_mode
+                if self._use_batch(collection_queries, vectors)
+                else "threads"
+            ),
+            "results_by_collection": {},
+            "embedding": embedding,
         }
         
-        print("📊 컬렉션별 검색 결과:")
-        for collection, future in futures:
+        for collection, collection_query in zip(collections, collection_queries):
+            future, index = futures[(collection, collection_query)]
             try:
-                result = future.result(timeout=10)  # 10초 타임아웃
+                result = future.result(timeout=SEARCH_TIMEOUT)
+                if index is not None:
+                    result = result[index]
                 combined["results_by_collection"][collection] = result
-                
-                # 📊 검색 결과 점수 분포 확인
-                if result:
-                    scores = [r.score for r in result]
-                    print(f"  {collection}: {len(result)}개 결과, 점수: {[f'{s:.3f}' for s in scores[:3]]}")
-                else:
-                    print(f"  {collection}: 0개 결과")
+                self._log_collection_result(collection, result)
                     
             except Exception as e:
-                print(f"Error getting result for {collection}: {e}")
+                logger.warning("Error getting result for %s: %s", collection, e)
+                combined["results_by_collection"][collection] = []
+
+        if self.bm25 is not None:
+            combined["identifiers"] = identifier_tokens(query)
+            combined["sparse_by_collection"] = {}
+            for collection, future in rescore_futures.items():
+                try:
+                    points = future.result(timeout=SEARCH_TIMEOUT)
+                except Exception as e:
+                    logger.warning(
+                        "Error scoring BM25 candidates for %s: %s", collection, e
+                    )
+                    points = []
+                combined["sparse_by_collection"][collection] = self._attach_bm25(
+                    points, sparse[collection]
+                )
+
+        combined["search_time"] = time.time() - start_time
+        return combined
+
+    @tracing.traced("search")
+    async def aparallel_search(
+        self, query: str, collections: List[str], decomposition: dict = None
+    ) -> Dict[str, Any]:
+        """parallel_search의 비동기 버전: 스레드 없이 asyncio.gather로 동시 검색"""
+        start_time = time.time()
+
+        collection_queries = self._prepare_queries(query, collections, decomposition)
+        vectors, embedding = await self._aembed_queries(collection_queries)
+        use_batch = self._use_batch(collection_queries, vectors)
+
+        async def search_group(collection: str, queries: List[str]):
+            try:
+                if use_batch:
+                    coro = self.qdrant_service.asearch_batch(
+                        collection, [vectors[q] for q in queries], 5
+                    )
+                else:
+                    # threads 모드: 쿼리별 개별 검색
+                    coro = asyncio.gather(
+                        *[
+                            self.qdrant_service.asearch_collection(
+                                collection, q, 5, vectors.get(q)
+                            )
+                            for q in queries
+                        ]
+                    )
+                with tracing.span(
+                    "qdrant.search", collection=collection, queries=len(queries)
+                ):
+                    return await asyncio.wait_for(coro, timeout=SEARCH_TIMEOUT)
+            except Exception as e:
+                logger.warning("Error getting result for %s: %s", collection, e)
+                return None
+
+        async def rescore(collection: str, collection_query: str):
+            try:
+                with tracing.span("bm25.rescore", collection=collection):
+                    return await asyncio.wait_for(
+                        self.qdrant_service.ascore_points(
+                            collection,
+                            vectors[collection_query],
+                            [point_id for point_id, _ in sparse[collection]],
+                        ),
+                        timeout=SEARCH_TIMEOUT,
+                    )
+            except Exception as e:
+                logger.warning(
+                    "Error scoring BM25 candidates for %s: %s", collection, e
+                )
+                return []
+
+        grouped = self._group_by_collection(collections, collection_queries)
+        # BM25 점수 계산은 문서 수에 비례하는 CPU 작업이라 이벤트 루프 밖에서 실행
+        sparse = {}
+        if self.bm25 is not None:
+            sparse = await asyncio.to_thread(
+                tracing.bind(self._sparse_candidates), query, collections
+            )
+        rescore_targets = {}
+        for collection, collection_query in zip(collections, collection_queries):
+            if collection in sparse and collection_query in vectors:
+                rescore_targets.setdefault(collection, collection_query)
+
+        results = await asyncio.gather(
+            *[
+                search_group(collection, queries)
+                for collection, queries in grouped.items()
+            ],
+            *[
+                rescore(collection, collection_query)
+                for collection, collection_query in rescore_targets.items()
+            ],
+        )
+        group_results, rescored = results[: len(grouped)], results[len(grouped) :]
+        by_query = {}
+        for (collection, queries), results in zip(grouped.items(), group_results):
+            for index, collection_query in enumerate(queries):
+                by_query[(collection, collection_query)] = (
+                    None if results is None else results[index]
+                )
+
+        combined = {
+            "search_mode": self.search_mode if use_batch else "threads",
+            "results_by_collection": {},
+            "embedding": embedding,
+        }
+        for collection, collection_query in zip(collections, collection_queries):
+            result = by_query[(collection, collection_query)]
+            if result is None:
                 combined["results_by_collection"][collection] = []
-                print(f"  {collection}: 오류 발생")
+                continue
+            combined["results_by_collection"][collection] = result
+            self._log_collection_result(collection, result)
+
+        if self.bm25 is not None:
+            combined["identifiers"] = identifier_tokens(query)
+            combined["sparse_by_collection"] = {
+                collection: self._attach_bm25(points, sparse[collection])
+                for collection, points in zip(rescore_targets, rescored)
+            }
         
         combined["search_time"] = time.time() - start_time
         return combined
     
+    @staticmethod
+    def _merge_points(batches: List[list]) -> list:
+        """같은 컬렉션의 여러 쿼리 결과를 포인트 id별 최고 점수로 합쳐 점수순 정렬"""
+        best = {}
+        for points in batches:
+            for point in points or []:
+                if point.id not in best or point.score > best[point.id].score:
+                    best[point.id] = point
+        return sorted(best.values(), key=lambda p: p.score, reverse=True)
+
+    @tracing.traced("search_many")
+    def search_many(
+        self, requests: List[Tuple[str, str]], timeout: float = SEARCH_TIMEOUT
+    ) -> Dict[str, Any]:
+        """(컬렉션, 쿼리) 목록을 한 번에 임베딩하고 컬렉션별 search_batch를 동시에 실행 (보강 검색용)
+
+        timeout이 지나도 끝나지 않은 컬렉션은 결과에서 제외한다.
+        """
+        start_time = time.time()
+        collections = [collection for collection, _ in requests]
+        queries = [collection_query for _, collection_query in requests]
+        vectors, _ = self._embed_queries(queries)
+
+        futures = {}
+        for collection, collection_queries in self._group_by_collection(
+            collections, queries
+        ).items():
+            collection_vectors = [
+                vectors[q] for q in collection_queries if q in vectors
+            ]
+            if collection_vectors:
+                futures[collection] = self._submit(
+                    "qdrant.search",
+                    collection,
+                    self.qdrant_service.search_batch,
+                    collection,
+                    collection_vectors,
+                    5,
+                )
+
+        results_by_collection = {}
+        deadline = start_time + timeout
+        for collection, future in futures.items():
+            try:
+                batches = future.result(timeout=max(deadline - time.time(), 0))
+            except Exception as e:
+                logger.warning(
+                    "⚠️ 보강 검색 제외 (%s): %s", collection, str(e) or "시간 초과"
+                )
+                continue
+            results_by_collection[collection] = self._merge_points(batches)
+        return {
+            "results_by_collection": results_by_collection,
+            "search_time": time.time() - start_time,
+        }
+
+    @tracing.traced("search_many")
+    async def asearch_many(
+        self, requests: List[Tuple[str, str]], timeout: float = SEARCH_TIMEOUT
+    ) -> Dict[str, Any]:
+        """search_many의 비동기 버전"""
+        start_time = time.time()
+        collections = [collection for collection, _ in requests]
+        queries = [collection_query for _, collection_query in requests]
+        vectors, _ = await self._aembed_queries(queries)
+
+        async def search_group(collection: str, collection_queries: List[str]):
+            collection_vectors = [
+                vectors[q] for q in collection_queries if q in vectors
+            ]
+            if not collection_vectors:
+                return None
+            try:
+                remaining = max(start_time + timeout - time.time(), 0)
+                with tracing.span(
+                    "qdrant.search",
+                    collection=collection,
+                    queries=len(collection_vectors),
+                ):
+                    return await asyncio.wait_for(
+                        self.qdrant_service.asearch_batch(
+                            collection, collection_vectors, 5
+                        ),
+                        timeout=remaining,
+                    )
+            except Exception as e:
+                logger.warning(
+                    "⚠️ 보강 검색 제외 (%s): %s", collection, str(e) or "시간 초과"
+                )
+                return None
+
+        grouped = self._group_by_collection(collections, queries)
+        batches = await asyncio.gather(
+            *[search_group(c, qs) for c, qs in grouped.items()]
+        )
+        results_by_collection = {
+            collection: self._merge_points(result)
+            for collection, result in zip(grouped, batches)
+            if result is not None
+        }
+        return {
+            "results_by_collection": results_by_collection,
+            "search_time": time.time() - start_time,
+        }
+
+    @tracing.traced("embed")
+    def _embed_queries(
+        self, collection_queries: List[str]
+    ) -> Tuple[dict, Dict[str, Any]]:
+        """모든 컬렉션 쿼리를 한 번에 임베딩 (동일 문자열은 한 번만)"""
+        embed_start = time.time()
+        try:
+            vectors, batch = self.qdrant_service.embed_many(collection_queries)
+        except Exception as e:
+            logger.warning("⚠️ 배치 임베딩 실패 - 컬렉션별 임베딩으로 폴백: %s", e)
+            vectors, batch = {}, None
+        return vectors, self._embedding_summary(
+            collection_queries, batch, time.time() - embed_start
+        )
+
+    @tracing.traced("embed")
+    async def _aembed_queries(
+        self, collection_queries: List[str]
+    ) -> Tuple[dict, Dict[str, Any]]:
+        """_embed_queries의 비동기 버전"""
+        embed_start = time.time()
+        try:
+            vectors, batch = await self.qdrant_service.aembed_many(collection_queries)
+        except Exception as e:
+            logger.warning("⚠️ 배치 임베딩 실패 - 컬렉션별 임베딩으로 폴백: %s", e)
+            vectors, batch = {}, None
+        return vectors, self._embedding_summary(
+            collection_queries, batch, time.time() - embed_start
+        )
+
+    def _embedding_summary(
+        self, queries: List[str], batch: dict, elapsed: float
+    ) -> Dict[str, Any]:
+        """배치 임베딩 결과 요약 (컬렉션별 개별 호출 대비 절약한 호출 수)"""
+        if batch is None:
+            # 배치 실패: 각 검색이 개별 임베딩
+            batch = {
+                "texts": len(queries),
+                "unique_texts": len(set(queries)),
+                "cache_hits": 0,
+                "api_calls": len(queries),
+                "calls_saved": 0,
+            }
+        summary = dict(batch, time=elapsed)
+        tracing.annotate(
+            queries=summary["texts"],
+            api_calls=summary["api_calls"],
+            cache_hits=summary["cache_hits"],
+        )
+        logger.debug(
+            "🧮 임베딩: 쿼리 %d개 (고유 %d개, 캐시 %d개) → API 호출 %d회 (%.0fms)",
+            summary["texts"],
+            summary["unique_texts"],
+            summary["cache_hits"],
+            summary["api_calls"],
+            elapsed * 1000,
+        )
+        return summary
+
+    def _log_optimized_queries(self, optimized_queries: dict):
+        # 🔍 각 컬렉션별 쿼리 로깅 (DEBUG에서만 문자열 생성)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔍 컬렉션별 최적화된 검색 쿼리:\n%s",
+                "\n".join(
+                    f"  {collection}: {collection_query[:80]}..."
+                    for collection, collection_query in optimized_queries.items()
+                ),
+            )
+
+    def _log_collection_result(self, collection: str, result: list):
+        # 📊 검색 결과 점수 분포 확인
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📊 %s: %d개 결과, 점수: %s",
+                collection,
+                len(result),
+                [f"{r.score:.3f}" for r in result[:3]],
+            )
+
     def _generate_optimized_queries(self, collections: List[str], decomposition: dict = None, raw_query: str = None) -> dict:
         """컬렉션별 최적화된 쿼리 생성 (전략 문서 기반)"""
         queries = {}
@@ -109,6 +532,26 @@ class SimpleOrchestrator:
         
         return queries
     
+    @staticmethod
+    def _fuse(dense: list, sparse: List[Tuple]) -> List[Dict]:
+        """RRF: 밀집 순위와 BM25 순위의 1/(k + rank)를 포인트 id별로 합산"""
+        fused = {}
+        ranked_lists = [
+            ([(point, None) for point in dense], "dense"),
+            (sparse, "bm25"),
+        ]
+        for ranked, source in ranked_lists:
+            for rank, (point, bm25) in enumerate(ranked, start=1):
+                entry = fused.setdefault(
+                    point.id, {"point": point, "rrf": 0.0, "bm25": None, "sources": []}
+                )
+                entry["rrf"] += 1 / (RRF_K + rank)
+                entry["sources"].append(source)
+                if bm25 is not None:
+                    entry["bm25"] = bm25
+        return sorted(fused.values(), key=lambda e: e["rrf"], reverse=True)
+
+    @tracing.traced("merge")
     def merge_and_rank(self, parallel_results: dict) -> List[Dict]:
         """순수 검색 기능: 병렬 검색 결과를 병합하고 랭킹"""
         MIN_SCORE = 0.60  # 조정 가능
@@ -116,18 +559,35 @@ class SimpleOrchestrator:
         
         final = []
         collection_stats = {}
-        
+        # 하이브리드 모드: BM25 후보와 RRF로 융합, 식별자가 정확히 일치하면 점수 미달이어도 선발
+        sparse_by_collection = parallel_results.get("sparse_by_collection")
+        identifiers = parallel_results.get("identifiers", [])
+
         for collection, results in parallel_results['results_by_collection'].items():
             # 점수 필터링
-            qualified = [r for r in results if r.score >= MIN_SCORE]
+            if sparse_by_collection is None:
+                qualified = [{"point": r} for r in results if r.score >= MIN_SCORE]
+            else:
+                qualified = []
+                for entry in self._fuse(
+                    results, sparse_by_collection.get(collection, [])
+                ):
+                    payload = entry["point"].payload
+                    entry["exact_match"] = contains_identifier(
+                        f"{payload.get('title', '')} {payload.get('text', '')}",
+                        identifiers,
+                    )
+                    if entry["point"].score >= MIN_SCORE or entry["exact_match"]:
+                        qualified.append(entry)
             selected = qualified[:QUOTA_PER_COLLECTION]
             
             # 컬렉션 메타정보 가져오기
             collection_info = COLLECTION_STRATEGY.get(collection, {})
             
             # 선택된 항목들을 프론트엔드용 형태로 변환
-            for item in selected:
-                final.append({
+            for entry in selected:
+                item = entry["point"]
+                doc = {
                     "collection": collection,
                     "collection_role": collection_info.get('role', ''),
                     "collection_desc": collection_info.get('description', ''),
@@ -135,29 +595,79 @@ class SimpleOrchestrator:
                     "text": item.payload.get("text", "")[:10000],  # ⭐ 5000 → 10000자로 증가
                     "title": item.payload.get("title", ""),
                     "url": item.payload.get("url", "")
-                })
+                }
+                if sparse_by_collection is not None:
+                    doc.update(
+                        {
+                            "rrf_score": entry["rrf"],
+                            "bm25_score": entry["bm25"],
+                            "exact_match": entry["exact_match"],
+                            "retrieval": "+".join(entry["sources"]),
+                        }
+                    )
+                final.append(doc)
             
             collection_stats[collection] = {
-                'total': len(results),
-                'qualified': len(qualified),
-                'selected': len(selected),
-                'scores': [r.score for r in selected]
+                "total": len(results),
+                "qualified": len(qualified),
+                "selected": len(selected),
+                "scores": [entry["point"].score for entry in selected],
             }
-        
+            if sparse_by_collection is not None:
+                collection_stats[collection]["bm25_only"] = sum(
+                    1 for e in selected if e["sources"] == ["bm25"]
+                )
+
         # 디버깅 로그
-        print(f"\n📊 균등 랭킹 결과 (최소 점수: {MIN_SCORE})")
-        for coll, stats in collection_stats.items():
-            print(f"  {coll}: {stats['selected']}개 선발 (점수: {stats['scores']})")
-        print(f"📌 총 {len(final)}개, 컬렉션 {len(collection_stats)}개\n")
+        if logger.isEnabledFor(logging.DEBUG):
+
+            def describe(coll: str, stats: Dict) -> str:
+                scores = [round(s, 3) for s in stats["scores"]]
+                bm25 = ""
+                if "bm25_only" in stats:
+                    bm25 = f", BM25 전용 {stats['bm25_only']}개"
+                return f"  {coll}: {stats['selected']}개 선발 (점수: {scores}{bm25})"
+
+            logger.debug(
+                "📊 균등 랭킹 결과 (최소 점수: %s): 총 %d개, 컬렉션 %d개\n%s",
+                MIN_SCORE,
+                len(final),
+                len(collection_stats),
+                "\n".join(describe(c, s) for c, s in collection_stats.items()),
+            )
+
+        sort_key = "score" if sparse_by_collection is None else "rrf_score"
+        ranked = sorted(final, key=lambda x: x[sort_key], reverse=True)
         
-        return sorted(final, key=lambda x: x['score'], reverse=True)
+        # 컬렉션 간 근사 중복은 점수가 가장 높은 청크 하나로 병합 (출처는 duplicates에 보존)
+        if self.dedup_distance is not None:
+            ranked, collapsed = collapse_near_duplicates(ranked, self.dedup_distance)
+            if collapsed:
+                logger.debug("🧬 근사 중복 %d개 병합 → %d개", collapsed, len(ranked))
+        return ranked
     
     
     def determine_collections(self, decomposition: dict) -> List[str]:
         """순수 검색 기능: 제품 특성에 따른 컬렉션 선택"""
         return smart_collection_selection(decomposition)
     
+    def close(self):
+        """스레드 풀과 동기 커넥션 정리"""
+        self.executor.shutdown(wait=True)
+        if self.bm25 is not None:
+            self.bm25.close()
+        if hasattr(self.qdrant_service, "close"):
+            self.qdrant_service.close()
+
+    async def aclose(self):
+        """서버 종료 시 스레드 풀과 모든 커넥션 정리"""
+        self.executor.shutdown(wait=True)
+        if self.bm25 is not None:
+            self.bm25.close()
+        if hasattr(self.qdrant_service, "aclose"):
+            await self.qdrant_service.aclose()
+
     def __del__(self):
         """소멸자에서 스레드 풀 정리"""
         if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=False)
\ No newline at end of file
+            self.executor.shutdown(wait=False)
@@ -1,32 +1,188 @@
 # utils/qdrant_client.py
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, SearchRequest
-from openai import OpenAI
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    Filter,
+    HasIdCondition,
+    PointStruct,
+    SearchRequest,
+    VectorParams,
+)
+from openai import OpenAI, AsyncOpenAI
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple
 import asyncio
+import threading
+import time
+import uuid
+
+import httpx
+
+from utils.embedding_cache import get_embedding_cache
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 컬렉션 데이터 리비전 저장소 (컬렉션마다 포인트 하나, payload에 revision/updated_at)
+# points_count는 같은 수의 포인트를 교체하는 upsert를 감지하지 못하므로, 적재 후 mark_collection_updated()로 올린다
+VERSION_COLLECTION = os.getenv("FDA_VERSION_COLLECTION", "fda_data_versions")
+
+
+def _version_point_id(collection: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"fda-data-version/{collection}"))
+
+
+def http_limits() -> httpx.Limits:
+    """Qdrant/OpenAI 클라이언트 공용 커넥션 풀 설정 (keep-alive 재사용)"""
+    return httpx.Limits(
+        max_connections=int(os.getenv("FDA_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("FDA_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("FDA_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+
 
 class QdrantService:
-    def __init__(self):
-        self.qdrant_client = QdrantClient(
+
+    def __init__(
+        self,
+        qdrant_client: QdrantClient = None,
+        async_qdrant_client: AsyncQdrantClient = None,
+    ):
+        # 프로세스 수명 동안 재사용하는 클라이언트 (keep-alive 커넥션 풀)
+        # qdrant-client는 localhost면 keep-alive를 끄므로 limits를 명시적으로 전달
+        self.qdrant_client = qdrant_client or QdrantClient(
             url=os.getenv("QDRANT_URL"),
             api_key=os.getenv("QDRANT_API_KEY"),
-            timeout=60
+            timeout=60,
+            limits=http_limits(),
         )
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
-    async def get_embedding(self, text: str) -> List[float]:
+        self.openai_client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.Client(limits=http_limits(), timeout=60),
+        )
+
+        # 비동기 파이프라인(achat)용 클라이언트 (서버 이벤트 루프에서 사용)
+        self.async_qdrant_client = async_qdrant_client or AsyncQdrantClient(
+            url=os.getenv("QDRANT_URL"),
+            api_key=os.getenv("QDRANT_API_KEY"),
+            timeout=60,
+            limits=http_limits(),
+        )
+        self.async_openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(limits=http_limits(), timeout=60),
+        )
+
+        # 공유 임베딩 캐시 (메모리 LRU + 선택적 디스크)
+        self.embedding_cache = get_embedding_cache()
+
+        # 배치 임베딩 통계 (컬렉션별 개별 호출 대비 절약한 API 호출 수)
+        self._stats_lock = threading.Lock()
+        self.embedding_stats = {
+            "batches": 0,
+            "texts": 0,
+            "unique_texts": 0,
+            "cache_hits": 0,
+            "api_calls": 0,
+            "calls_saved": 0,
+        }
+
+    def close(self):
+        """동기 클라이언트 커넥션 정리"""
+        for client in (self.qdrant_client, self.openai_client):
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning("Error closing %s: %s", type(client).__name__, e)
+
+    async def aclose(self):
+        """비동기 클라이언트까지 포함해 모든 커넥션 정리 (서버 종료 시)"""
+        for client in (self.async_qdrant_client, self.async_openai_client):
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("Error closing %s: %s", type(client).__name__, e)
+        self.close()
+
+    def _record_batch(
+        self, texts: List[str], unique: List[str], missing: List[str]
+    ) -> Dict[str, int]:
+        api_calls = 1 if missing else 0
+        batch = {
+            "texts": len(texts),
+            "unique_texts": len(unique),
+            "cache_hits": len(unique) - len(missing),
+            "api_calls": api_calls,
+            "calls_saved": len(texts) - api_calls,
+        }
+        with self._stats_lock:
+            self.embedding_stats["batches"] += 1
+            for key, value in batch.items():
+                self.embedding_stats[key] += value
+        return batch
+
+    def embed_many(
+        self, texts: List[str]
+    ) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+        """여러 텍스트를 중복 제거 + 캐시 조회 후, 나머지만 한 번의 embeddings.create 호출로 임베딩
+
+        Returns:
+            (텍스트 → 벡터, 배치 통계)
+        """
+        unique = list(dict.fromkeys(texts))
+        vectors, missing = self.embedding_cache.get_many(EMBEDDING_MODEL, unique)
+        if missing:
+            response = self.openai_client.embeddings.create(
+                input=missing, model=EMBEDDING_MODEL
+            )
+            fetched = {
+                text: item.embedding for text, item in zip(missing, response.data)
+            }
+            self.embedding_cache.put_many(EMBEDDING_MODEL, fetched)
+            vectors.update(fetched)
+        return vectors, self._record_batch(texts, unique, missing)
+
+    async def aembed_many(
+        self, texts: List[str]
+    ) -> Tuple[Dict[str, List[float]], Dict[str, int]]:
+        """embed_many의 비동기 버전"""
+        unique = list(dict.fromkeys(texts))
+        vectors, missing = self.embedding_cache.get_many(EMBEDDING_MODEL, unique)
+        if missing:
+            response = await self.async_openai_client.embeddings.create(
+                input=missing, model=EMBEDDING_MODEL
+            )
+            fetched = {
+                text: item.embedding for text, item in zip(missing, response.data)
+            }
+            self.embedding_cache.put_many(EMBEDDING_MODEL, fetched)
+            vectors.update(fetched)
+        return vectors, self._record_batch(texts, unique, missing)
+
+    def get_embedding(self, text: str) -> List[float]:
         """텍스트를 임베딩으로 변환"""
+        cached = self.embedding_cache.get(EMBEDDING_MODEL, text)
+        if cached is not None:
+            return cached
         response = self.openai_client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small"
+            input=text, model=EMBEDDING_MODEL
         )
-        return response.data[0].embedding
-    
-    async def search_collection(self, collection_name: str, query: str, limit: int = 5):
-        """단일 컬렉션에서 검색"""
+        embedding = response.data[0].embedding
+        self.embedding_cache.put(EMBEDDING_MODEL, text, embedding)
+        return embedding
+
+    def search_collection(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 5,
+        query_vector: Optional[List[float]] = None,
+    ):
+        """단일 컬렉션에서 검색 (query_vector가 있으면 임베딩 생략)"""
         try:
-            query_embedding = await self.get_embedding(query)
+            query_embedding = query_vector or self.get_embedding(query)
             
             search_result = self.qdrant_client.search(
                 collection_name=collection_name,
@@ -35,16 +191,228 @@ class QdrantService:
             )
             return search_result
         except Exception as e:
-            print(f"Error searching {collection_name}: {e}")
+            logger.warning("Error searching %s: %s", collection_name, e)
             return []
     
+    async def aget_embedding(self, text: str) -> List[float]:
+        """텍스트를 임베딩으로 변환 (논블로킹)"""
+        cached = self.embedding_cache.get(EMBEDDING_MODEL, text)
+        if cached is not None:
+            return cached
+        response = await self.async_openai_client.embeddings.create(
+            input=text, model=EMBEDDING_MODEL
+        )
+        embedding = response.data[0].embedding
+        self.embedding_cache.put(EMBEDDING_MODEL, text, embedding)
+        return embedding
+
+    async def asearch_collection(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 5,
+        query_vector: Optional[List[float]] = None,
+    ):
+        """단일 컬렉션에서 검색 (논블로킹, query_vector가 있으면 임베딩 생략)"""
+        try:
+            query_embedding = query_vector or await self.aget_embedding(query)
+
+            return await self.async_qdrant_client.search(
+                collection_name=collection_name,
+                query_vector=query_embedding,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.warning("Error searching %s: %s", collection_name, e)
+            return []
+
+    def search_batch(
+        self, collection_name: str, query_vectors: List[List[float]], limit: int = 5
+    ):
+        """한 컬렉션에 여러 쿼리 벡터를 한 번의 요청으로 검색 (쿼리별 결과 목록)"""
+        try:
+            return self.qdrant_client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(vector=vector, limit=limit, with_payload=True)
+                    for vector in query_vectors
+                ],
+            )
+        except Exception as e:
+            logger.warning("Error searching %s: %s", collection_name, e)
+            return [[] for _ in query_vectors]
+
+    async def asearch_batch(
+        self, collection_name: str, query_vectors: List[List[float]], limit: int = 5
+    ):
+        """search_batch의 비동기 버전"""
+        try:
+            return await self.async_qdrant_client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(vector=vector, limit=limit, with_payload=True)
+                    for vector in query_vectors
+                ],
+            )
+        except Exception as e:
+            logger.warning("Error searching %s: %s", collection_name, e)
+            return [[] for _ in query_vectors]
+
+    def scroll_payloads(self, collection_name: str, batch_size: int = 512):
+        """컬렉션의 모든 (포인트 id, payload) 순회 - BM25 인덱스 생성용 (벡터 제외)"""
+        offset = None
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for point in points:
+                yield point.id, point.payload or {}
+            if offset is None:
+                break
+
+    def _id_search_request(self, query_vector: List[float], ids: List) -> SearchRequest:
+        return SearchRequest(
+            vector=query_vector,
+            filter=Filter(must=[HasIdCondition(has_id=list(ids))]),
+            limit=len(ids),
+            with_payload=True,
+        )
+
+    def score_points(self, collection_name: str, query_vector: List[float], ids: List):
+        """지정한 포인트들만 쿼리 벡터로 점수 계산 (BM25 후보의 밀집 유사도)"""
+        if not ids:
+            return []
+        try:
+            return self.qdrant_client.search_batch(
+                collection_name=collection_name,
+                requests=[self._id_search_request(query_vector, ids)],
+            )[0]
+        except Exception as e:
+            logger.warning("Error scoring points in %s: %s", collection_name, e)
+            return []
+
+    async def ascore_points(
+        self, collection_name: str, query_vector: List[float], ids: List
+    ):
+        """score_points의 비동기 버전"""
+        if not ids:
+            return []
+        try:
+            return (
+                await self.async_qdrant_client.search_batch(
+                    collection_name=collection_name,
+                    requests=[self._id_search_request(query_vector, ids)],
+                )
+            )[0]
+        except Exception as e:
+            logger.warning("Error scoring points in %s: %s", collection_name, e)
+            return []
+
+    def collection_versions(
+        self, collections: List[str]
+    ) -> Dict[str, Tuple[Optional[str], Optional[int]]]:
+        """컬렉션 데이터 버전 (리비전, points_count) - 답변 캐시 무효화용 (조회 실패 항목은 None)"""
+        revisions = self._revisions(collections)
+        versions = {}
+        for collection in collections:
+            try:
+                points_count = self.qdrant_client.get_collection(
+                    collection
+                ).points_count
+            except Exception as e:
+                logger.warning("Error reading %s info: %s", collection, e)
+                points_count = None
+            versions[collection] = (revisions.get(collection), points_count)
+        return versions
+
+    async def acollection_versions(
+        self, collections: List[str]
+    ) -> Dict[str, Tuple[Optional[str], Optional[int]]]:
+        """collection_versions의 비동기 버전"""
+
+        async def points_count(collection: str):
+            try:
+                return (
+                    await self.async_qdrant_client.get_collection(collection)
+                ).points_count
+            except Exception as e:
+                logger.warning("Error reading %s info: %s", collection, e)
+                return None
+
+        revisions, *counts = await asyncio.gather(
+            self._arevisions(collections), *[points_count(c) for c in collections]
+        )
+        return {c: (revisions.get(c), count) for c, count in zip(collections, counts)}
+
+    def _revisions(self, collections: List[str]) -> Dict[str, str]:
+        """리비전 저장소에서 컬렉션별 revision 조회 (저장소/항목이 없으면 빠짐)"""
+        try:
+            points = self.qdrant_client.retrieve(
+                VERSION_COLLECTION,
+                ids=[_version_point_id(c) for c in collections],
+                with_payload=True,
+            )
+        except Exception as e:
+            logger.debug("Data revisions unavailable (%s): %s", VERSION_COLLECTION, e)
+            return {}
+        return {p.payload["collection"]: p.payload["revision"] for p in points}
+
+    async def _arevisions(self, collections: List[str]) -> Dict[str, str]:
+        """_revisions의 비동기 버전"""
+        try:
+            points = await self.async_qdrant_client.retrieve(
+                VERSION_COLLECTION,
+                ids=[_version_point_id(c) for c in collections],
+                with_payload=True,
+            )
+        except Exception as e:
+            logger.debug("Data revisions unavailable (%s): %s", VERSION_COLLECTION, e)
+            return {}
+        return {p.payload["collection"]: p.payload["revision"] for p in points}
+
+    def mark_collection_updated(
+        self, collection: str, revision: Optional[str] = None
+    ) -> str:
+        """데이터 적재(upsert/삭제) 후 호출: 컬렉션 리비전을 올려 캐시된 답변을 무효화"""
+        if not self.qdrant_client.collection_exists(VERSION_COLLECTION):
+            self.qdrant_client.create_collection(
+                VERSION_COLLECTION,
+                vectors_config=VectorParams(size=1, distance=Distance.DOT),
+            )
+        revision = revision or uuid.uuid4().hex
+        self.qdrant_client.upsert(
+            VERSION_COLLECTION,
+            points=[
+                PointStruct(
+                    id=_version_point_id(collection),
+                    vector=[1.0],
+                    payload={
+                        "collection": collection,
+                        "revision": revision,
+                        "updated_at": time.time(),
+                    },
+                )
+            ],
+        )
+        return revision
+
     async def search_multiple_collections(self, query: str, collections: List[str], limit: int = 3):
-        """여러 컬렉션에서 검색"""
+        """여러 컬렉션에서 검색 (임베딩 1회, 컬렉션 검색은 동시에)"""
+        query_embedding = await self.aget_embedding(query)
+        batches = await asyncio.gather(
+            *[
+                self.asearch_batch(collection, [query_embedding], limit)
+                for collection in collections
+            ]
+        )
+
         all_results = []
-        
-        for collection in collections:
-            results = await self.search_collection(collection, query, limit)
-            for result in results:
+        for collection, batch in zip(collections, batches):
+            for result in batch[0]:
                 result.collection = collection  # 어느 컬렉션에서 온 결과인지 표시
                 all_results.append(result)
         
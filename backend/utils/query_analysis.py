@@ -0,0 +1,121 @@
+# utils/query_analysis.py
+"""
+통합 질문 분석: 제품명 추출 + 쿼리 증강 + 질문 분류를 한 번의 LLM 호출(JSON)로 처리
+"""
+import json
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class QueryAnalysis(BaseModel):
+    """통합 분석 LLM 응답 스키마"""
+
+    product_name: Optional[str] = None
+    augmented_query: str = ""
+    category: str = "OTHER"
+    collections: List[str] = Field(default_factory=list)
+    reason: str = ""
+
+    @field_validator("product_name", mode="before")
+    @classmethod
+    def _normalize_product(cls, value):
+        # "None", "", null 모두 제품 없음으로 처리
+        if value is None:
+            return None
+        value = str(value).strip()
+        if not value or value.lower() in ("none", "null", "n/a"):
+            return None
+        return value
+
+    @field_validator("augmented_query", "category", "reason", mode="before")
+    @classmethod
+    def _strip_text(cls, value):
+        return str(value).strip() if value is not None else ""
+
+    @field_validator("collections", mode="before")
+    @classmethod
+    def _normalize_collections(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = [value]
+        return [str(v).strip().lower() for v in value]
+
+
+def build_query_analysis_prompt(query: str, classify: bool = True) -> str:
+    """통합 분석 프롬프트 (classify=False: 로컬 분류기가 컬렉션을 정했으므로 제품명/증강 쿼리만 요청)"""
+    if not classify:
+        return (
+            _PROMPT_HEADER
+            + _PRODUCT_AND_QUERY
+            + f"""
+Return ONLY valid JSON in this format without any extra text:
+{{
+  "product_name": "name" or null,
+  "augmented_query": "english search query"
+}}
+
+Question: "{query}"
+"""
+        )
+    return (
+        _PROMPT_HEADER
+        + _PRODUCT_AND_QUERY
+        + f"""3. category: one of DEFINITION, PROCEDURE, COMPLIANCE, PRODUCT, ENFORCEMENT, OTHER
+4. collections: the 2-4 most relevant collections, most important first, never empty:
+   - guidance (guidance documents, policy interpretations, FAQs, labeling)
+   - ecfr (21 CFR regulations, CFR numbers)
+   - gras (GRAS notices, ingredient safety, additive status)
+   - dwpe (Import Alerts, detention without physical examination)
+   - fsvp (Foreign Supplier Verification Program, importer responsibilities)
+   - rpm (Regulatory Procedures Manual, only for procedural import handling)
+   - usc (21 U.S.C. legal authority, penalties)
+5. reason: short Korean explanation for logging
+
+Return ONLY valid JSON in this format without any extra text:
+{{
+  "product_name": "name" or null,
+  "augmented_query": "english search query",
+  "category": "...",
+  "collections": ["collection_name", ...],
+  "reason": "..."
+}}
+
+Question: "{query}"
+"""  # noqa: E501
+    )
+
+
+_PROMPT_HEADER = """
+You analyze user questions for an FDA food-export regulation assistant.
+Do ALL of the following for the question below and answer with ONE JSON object.
+
+"""
+
+_PRODUCT_AND_QUERY = """1. product_name: the FOOD PRODUCT name in the question, or null for a general question
+   (about regulations, procedures, concepts).
+   - Examples of products: "김치", "새우튀김", "냉동만두", "chicken nuggets"
+   - Examples of NOT products: "HACCP", "FDA", "규정", "절차", "라벨링"
+2. augmented_query: the question rewritten as an ENGLISH search query for an FDA regulation
+   database: translate key terms, add synonyms and regulatory terms.
+   - "비용이 얼마나 드나요?" → "costs payment fees supervision relabeling expenses"
+   - "어떤 절차가 필요한가요?" → "procedures process requirements steps documentation"
+"""  # noqa: E501
+
+
+def parse_query_analysis(text: str) -> QueryAnalysis:
+    """LLM 응답을 스키마로 검증 (실패 시 ValueError / ValidationError)"""
+    raw = text.strip()
+
+    # 코드 블록 제거
+    if "```" in raw:
+        raw = raw.split("```")[1]
+        if raw.lower().startswith("json"):
+            raw = raw[4:]
+        raw = raw.strip()
+
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"Query analysis is not a JSON object: {raw[:100]}")
+    return QueryAnalysis.model_validate(data)
@@ -0,0 +1,186 @@
+# utils/reranker.py
+"""
+로컬 CrossEncoder 재순위화 (merge_and_rank 이후 선택 단계)
+
+merge_and_rank는 컬렉션별 상위 5개씩 최대 수십 개의 청크(각 최대 10,000자)를 넘기는데,
+질문-문서 쌍을 함께 보는 CrossEncoder로 다시 점수를 매겨 상위 top_k개만 답변 프롬프트에 보낸다.
+
+- sentence-transformers가 없거나 모델 로드에 실패하면 비활성화 (원래 순서 그대로)
+- 모델은 백그라운드에서 로드, 로드 전 요청은 재순위화 없이 통과
+- 후보 상한(candidates)과 문서 앞부분(max_chars)만 점수 계산, 배치 추론
+- (모델, 질문, 문서) 점수는 LRU 캐시에 보관
+- 지연 예산(budget_ms)을 넘기면 남은 배치를 건너뛰고 원래 순서 그대로 반환
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from utils.cache import LRUCache
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 한국어 질문 + 영문 FDA 문서를 함께 다루는 다국어 MS MARCO CrossEncoder
+DEFAULT_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+
+def _doc_key(doc: Dict, max_chars: int) -> str:
+    head = f"{doc.get('collection', '')}\n{doc.get('url', '')}\n{doc.get('title', '')}"
+    text = f"{head}\n{doc.get('text', '')[:max_chars]}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class CrossEncoderReranker:
+    """merge_and_rank 결과를 CrossEncoder 점수로 재정렬하고 상위 top_k개만 남긴다"""
+
+    def __init__(
+        self,
+        model_name: str = None,
+        top_k: int = None,
+        candidates: int = None,
+        batch_size: int = None,
+        max_chars: int = None,
+        budget_ms: float = None,
+        cache_size: int = None,
+        model=None,
+    ):
+        self.model_name = model_name or os.getenv("FDA_RERANK_MODEL", DEFAULT_MODEL)
+        self.top_k = top_k or int(os.getenv("FDA_RERANK_TOP_K", "6"))
+        self.candidates = candidates or int(os.getenv("FDA_RERANK_CANDIDATES", "20"))
+        self.batch_size = batch_size or int(os.getenv("FDA_RERANK_BATCH", "16"))
+        self.max_chars = max_chars or int(os.getenv("FDA_RERANK_MAX_CHARS", "2000"))
+        self.budget_ms = (
+            budget_ms
+            if budget_ms is not None
+            else float(os.getenv("FDA_RERANK_BUDGET_MS", "800"))
+        )
+        self.cache = LRUCache(
+            max_entries=cache_size or int(os.getenv("FDA_RERANK_CACHE_SIZE", "20000"))
+        )
+
+        self._model = model
+        self._failed = False
+        self._lock = threading.Lock()
+        self._loader = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fda-rerank"
+        )
+        self._loading = None
+        self._stats = {
+            "reranked": 0,
+            "not_ready": 0,
+            "over_budget": 0,
+            "scored_pairs": 0,
+            "total_ms": 0.0,
+        }
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def warm(self):
+        """모델 로드를 백그라운드에서 시작 (서버 시작 시)"""
+        with self._lock:
+            if self._model is None and not self._failed and self._loading is None:
+                self._loading = self._loader.submit(self._load)
+
+    def _load(self):
+        start = time.time()
+        try:
+            from sentence_transformers import CrossEncoder
+
+            model = CrossEncoder(self.model_name, device="cpu", max_length=512)
+            with self._lock:
+                self._model = model
+            logger.info(
+                "🎯 재순위화 모델 로드: %s (%.1f초)", self.model_name, time.time() - start
+            )
+        except Exception as e:
+            with self._lock:
+                self._failed = True
+            logger.warning("⚠️ 재순위화 비활성화 (%s): %s", self.model_name, e)
+
+    def _count(self, key: str, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _passage(self, doc: Dict) -> str:
+        title = doc.get("title", "")
+        text = doc.get("text", "")[: self.max_chars]
+        return f"{title}\n{text}" if title else text
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        """상위 top_k개 (각 항목에 rerank_score 추가), 모델 미준비/예산 초과 시 results 그대로"""
+        if len(results) <= 1:
+            return results
+        if self._model is None:
+            self.warm()
+            self._count("not_ready")
+            return results
+
+        start = time.perf_counter()
+        candidates = results[: self.candidates]
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        keys = [
+            (self.model_name, query_hash, _doc_key(doc, self.max_chars))
+            for doc in candidates
+        ]
+        scores = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        for offset in range(0, len(missing), self.batch_size):
+            if (time.perf_counter() - start) * 1000 > self.budget_ms:
+                logger.warning("⏱️ 재순위화 예산 초과 (%.0fms) - 원래 순서 사용", self.budget_ms)
+                self._count("over_budget")
+                return results
+            batch = missing[offset : offset + self.batch_size]
+            pairs = [(query, self._passage(candidates[i])) for i in batch]
+            for i, score in zip(
+                batch, self._model.predict(pairs, batch_size=self.batch_size)
+            ):
+                scores[i] = float(score)
+                self.cache.set(keys[i], scores[i])
+            self._count("scored_pairs", len(batch))
+
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)[
+            : self.top_k
+        ]
+        reranked = [dict(candidates[i], rerank_score=scores[i]) for i in order]
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self._count("reranked")
+        self._count("total_ms", elapsed)
+        logger.debug(
+            "🎯 재순위화: %d개 → %d개 (신규 %d쌍, %.0fms)",
+            len(candidates),
+            len(reranked),
+            len(missing),
+            elapsed,
+        )
+        return reranked
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["model"] = self.model_name
+            stats["ready"] = self._model is not None
+            stats["failed"] = self._failed
+            stats["mean_ms"] = (
+                stats["total_ms"] / stats["reranked"] if stats["reranked"] else 0.0
+            )
+        stats["cache"] = self.cache.stats()
+        return stats
+
+    def close(self):
+        self._loader.shutdown(wait=False)
+
+
+def load_reranker() -> Optional[CrossEncoderReranker]:
+    """FDA_RERANK=1이면 재순위화기 생성 후 모델 로드 시작, 아니면 None"""
+    if os.getenv("FDA_RERANK", "0") != "1":
+        return None
+    reranker = CrossEncoderReranker()
+    reranker.warm()
+    return reranker
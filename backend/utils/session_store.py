@@ -0,0 +1,201 @@
+# utils/session_store.py
+"""
+프로젝트별 세션 저장소 (LRU 퇴출 + 유휴 TTL + 최대 세션 수 + 디스크 스필)
+
+요청 처리 중인 세션(acquire ~ release)은 퇴출/만료 대상에서 제외한다. 처리 중에 스필하면
+진행 중인 턴이 빠진 상태가 저장되고, 다음 요청이 그 오래된 상태로 복원되기 때문이다.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class SessionStore:
+    """project_id → 세션(FDAAgent) 매핑을 크기 제한과 유휴 만료로 관리"""
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        max_sessions: int = 500,
+        idle_ttl: float = 3600,
+        spill_dir: Optional[str] = None,
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        # project_id → (session, last_access), 오래된 순서 유지
+        self._sessions: "OrderedDict[int, tuple]" = OrderedDict()
+        self._in_use: Dict[int, int] = {}  # project_id → 처리 중인 요청 수
+        self._lock = threading.RLock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "spills": 0,
+            "rehydrations": 0,
+        }
+
+    def __contains__(self, project_id: int) -> bool:
+        with self._lock:
+            return project_id in self._sessions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def get(self, project_id: int):
+        """메모리에 있는 세션 반환 (없으면 None, 생성하지 않음)"""
+        with self._lock:
+            entry = self._sessions.get(project_id)
+            if entry is None:
+                return None
+            self._touch(project_id, entry[0])
+            return entry[0]
+
+    def get_or_create(self, project_id: int):
+        """세션 조회, 없으면 디스크에서 복원하거나 새로 생성"""
+        with self._lock:
+            self._expire_idle()
+
+            entry = self._sessions.get(project_id)
+            if entry is not None:
+                self._counters["hits"] += 1
+                self._touch(project_id, entry[0])
+                return entry[0]
+
+            self._counters["misses"] += 1
+            session = self.factory()
+            self._counters["created"] += 1
+
+            state = self._load_spill(project_id)
+            if state is not None:
+                try:
+                    session.restore_state(state)
+                    self._counters["rehydrations"] += 1
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(
+                        "Session rehydration failed for %s: %s", project_id, e
+                    )
+
+            self._touch(project_id, session)
+            self._evict_overflow(keep=project_id)
+            return session
+
+    def acquire(self, project_id: int):
+        """요청 처리용 세션 조회/생성 (release() 전까지 퇴출/만료하지 않음)"""
+        with self._lock:
+            session = self.get_or_create(project_id)
+            self._in_use[project_id] = self._in_use.get(project_id, 0) + 1
+            return session
+
+    def release(self, project_id: int):
+        """acquire() 짝. 마지막 요청이 끝난 시각을 유휴 기준으로 삼고 밀린 퇴출을 처리"""
+        with self._lock:
+            count = self._in_use.get(project_id, 0) - 1
+            if count > 0:
+                self._in_use[project_id] = count
+                return
+            self._in_use.pop(project_id, None)
+            entry = self._sessions.get(project_id)
+            if entry is not None:
+                self._touch(project_id, entry[0])
+            self._evict_overflow()
+
+    def remove(self, project_id: int):
+        """세션 및 디스크에 스필된 대화 삭제"""
+        with self._lock:
+            self._sessions.pop(project_id, None)
+            path = self._spill_path(project_id)
+            if path and os.path.exists(path):
+                os.remove(path)
+
+    def stats(self) -> Dict:
+        """컨테이너 사이징용 카운터"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "idle_ttl": self.idle_ttl,
+                "spill_enabled": bool(self.spill_dir),
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                **self._counters,
+            }
+
+    def _touch(self, project_id: int, session):
+        self._sessions[project_id] = (session, time.monotonic())
+        self._sessions.move_to_end(project_id)
+
+    def _expire_idle(self):
+        """유휴 TTL이 지난 세션 정리 (가장 오래된 것부터)"""
+        if not self.idle_ttl:
+            return
+        deadline = time.monotonic() - self.idle_ttl
+        for project_id, (session, last_access) in list(self._sessions.items()):
+            if last_access > deadline:
+                break
+            if project_id in self._in_use:
+                continue
+            del self._sessions[project_id]
+            self._spill(project_id, session)
+            self._counters["expirations"] += 1
+
+    def _evict_overflow(self, keep: Optional[int] = None):
+        """최대 세션 수 초과 시 LRU 퇴출 (처리 중인 세션뿐이면 release 때까지 일시 초과 허용)"""
+        overflow = len(self._sessions) - self.max_sessions
+        if overflow <= 0:
+            return
+        for project_id, (session, _) in list(self._sessions.items()):
+            if overflow <= 0:
+                break
+            if project_id in self._in_use or project_id == keep:
+                continue
+            del self._sessions[project_id]
+            self._spill(project_id, session)
+            self._counters["evictions"] += 1
+            overflow -= 1
+
+    def _spill_path(self, project_id: int) -> Optional[str]:
+        if not self.spill_dir:
+            return None
+        return os.path.join(self.spill_dir, f"{project_id}.json")
+
+    def _spill(self, project_id: int, session):
+        """퇴출되는 세션의 대화 상태(대화 메모리 + ReAct 채팅 기록)를 디스크에 저장"""
+        path = self._spill_path(project_id)
+        if not path or not session.has_state():
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(session.export_state(), f, ensure_ascii=False)
+            self._counters["spills"] += 1
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Session spill failed for %s: %s", project_id, e)
+
+    def _load_spill(self, project_id: int) -> Optional[Dict]:
+        path = self._spill_path(project_id)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            if "memory" not in state:
+                state = {"memory": state}  # 이전 형식: ConversationMemory.to_dict()만 저장
+            os.remove(path)
+            return state
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Session rehydration failed for %s: %s", project_id, e)
+            return None
@@ -1,164 +1,330 @@
 # utils/tools.py
-from llama_index.core.tools import QueryEngineTool
+"""
+ReAct 에이전트용 FDA 컬렉션 툴
+
+- retrieval (기본, FDA_TOOL_MODE): 툴이 검색된 청크 원문을 잘라서(id 포함) 그대로 돌려준다.
+  기존 QueryEngineTool은 툴 호출마다 gpt-4o-mini가 검색 결과를 요약하고, 그 요약을 ReAct LLM이
+  다시 정리해 에이전트 경로 LLM 호출이 두 배였다. 검색은 공유 오케스트레이터의 search_many
+  (임베딩 캐시 + search_batch)를 쓰고, multi_search 툴로 여러 컬렉션을 한 번에 병렬 검색한다.
+- synthesis: 기존 방식 (컬렉션별 index.as_query_engine, 툴마다 LLM 요약)
+"""
+import os
+from typing import Dict, List, Tuple
+
+from llama_index.core.tools import FunctionTool, QueryEngineTool
 from llama_index.core import VectorStoreIndex
 from qdrant_client import QdrantClient
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from llama_index.core import StorageContext
-from llama_index.embeddings.openai import OpenAIEmbedding
+from utils.embedding_cache import CachedOpenAIEmbedding
+from utils.qdrant_client import http_limits
+from utils import tracing
+from utils.log import get_logger
 from llama_index.llms.openai import OpenAI
-import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def create_fda_tools():
-    """FDA 컬렉션별 QueryEngineTool 생성 (강화된 description)"""
-    
-    client = QdrantClient(
-        url=os.getenv("QDRANT_URL"),
-        api_key=os.getenv("QDRANT_API_KEY")
-    )
-    
-    embed_model = OpenAIEmbedding(
-        model="text-embedding-3-small",
-        dimensions=1536
-    )
-    
-    llm = OpenAI(model="gpt-4o-mini", temperature=0)
-    
-    # 실제 존재하는 컬렉션 목록
-    actual_collections = ['dwpe', 'ecfr', 'fsvp', 'gras', 'guidance', 'usc'] # RPM 일시적으로 제외
-    
-    tools = []
-    
-    for collection_name in actual_collections:
-        try:
-            vector_store = QdrantVectorStore(
-                client=client,
-                collection_name=collection_name
-            )
-            storage_context = StorageContext.from_defaults(vector_store=vector_store)
-            index = VectorStoreIndex.from_vector_store(
-                vector_store,
-                storage_context=storage_context,
-                embed_model=embed_model
-            )
-            query_engine = index.as_query_engine(
-                llm=llm,
-                similarity_top_k=5
-            )
-            
-            # 컬렉션별 강화된 description
-            if collection_name == "gras":
-                description = """Search GRAS (Generally Recognized As Safe) database.
-                
+logger = get_logger(__name__)
+
+# 실제 존재하는 컬렉션 목록
+actual_collections = [
+    "dwpe",
+    "ecfr",
+    "fsvp",
+    "gras",
+    "guidance",
+    "usc",
+]  # RPM 일시적으로 제외
+
+TOOL_MODE = os.getenv("FDA_TOOL_MODE", "retrieval")
+TOOL_TOP_K = int(os.getenv("FDA_TOOL_TOP_K", "5"))
+TOOL_CHUNK_CHARS = int(os.getenv("FDA_TOOL_CHUNK_CHARS", "600"))  # 청크당 툴 출력 길이
+TOOL_MULTI_SEARCH = os.getenv("FDA_TOOL_MULTI_SEARCH", "1") != "0"
+TOOL_TIMEOUT = float(os.getenv("FDA_TOOL_TIMEOUT", "10"))
+
+MULTI_SEARCH_DESCRIPTION = """Search several FDA collections IN PARALLEL with one call.
+
+**Prefer this tool over separate per-collection calls** when the question needs more than one source
+(e.g. CFR regulation + Import Alert + labeling + FSVP).
+
+**Arguments:**
+- searches: list of "collection: english query" strings, e.g.
+  ["ecfr: 21 CFR 101 food labeling", "dwpe: Import Alert kimchi Korea", "fsvp: importer verification"]
+- Collections: {collections}
+
+**Queries must be in ENGLISH.**
+"""  # noqa: E501
+
+
+def _tool_description(collection_name: str) -> str:
+    """컬렉션별 강화된 description"""
+    if collection_name == "gras":
+        return """Search GRAS (Generally Recognized As Safe) database.
+
 **Use this tool for:**
 - Keywords: "GRN", "GRAS", "물질", "첨가물", "substance", "approved", "withdrawn"
 - Food ingredient safety, additive approval status
-                
+
 **Query must be in ENGLISH. Translate Korean:**
 - "대두" → "soy soybean"
 - "음료" → "beverage drink"
 - "승인된" → "approved no objection"
-                """
-                
-            elif collection_name == "ecfr":
-                description = """Search 21 CFR (Code of Federal Regulations).
-                
+        """
+
+    elif collection_name == "ecfr":
+        return """Search 21 CFR (Code of Federal Regulations).
+
 **Use this tool for:**
 - Keywords: "CFR", "21 CFR", "규정", "제조", "HACCP", "regulation"
 - Manufacturing standards, CGMP, food safety regulations
-                
+
 **Query must be in ENGLISH:**
 - "냉동식품" → "frozen food"
 - "HACCP" → "HACCP hazard analysis critical control"
-                
+
 **For CFR numbers, add topic:** "21 CFR 73.1" → "21 CFR 73.1 color additive diluents"
-                """
-                
-            elif collection_name == "dwpe":
-                description = """Search Import Alert and detention database (DWPE).
-                
+        """
+
+    elif collection_name == "dwpe":
+        return """Search Import Alert and detention database (DWPE).
+
 **Use this tool for:**
 - Keywords: "Import Alert", "Red List", "수입 거부", "detention"
 - Country-specific violations, automatic detention
-                
+
 **Query must be in ENGLISH with synonyms:**
 - "해산물" → "fish fishery seafood shellfish aquatic marine"
 - "중국" → "China Chinese"
 - "수입 거부" → "import alert detention refusal"
-                """
-                
-            elif collection_name == "rpm":
-                description = """Search Regulatory Procedures Manual (RPM).
-                
+        """
+
+    elif collection_name == "rpm":
+        return """Search Regulatory Procedures Manual (RPM).
+
 **Use this tool for:**
 - Keywords: "Chapter", "Section", "RPM", "절차", "procedure", "personal", "relabeling"
 - Import procedures, detention processes, personal importation
-                
+
 **CRITICAL: Query must be in ENGLISH:**
 - "개인용 수입" → "personal importation personal use"
 - "절차" → "procedures process"
 - "검사 거부" → "refusal entry detention"
 - "relabeling 비용" → "relabeling supervision costs"
-                
+
 **For Section IDs:** "Chapter 9 Section 9-1-6" → "Chapter 9 Section 9-1-6 relabeling supervision"
-                """
-                
-            elif collection_name == "usc":
-                description = """Search 21 USC (United States Code) legal provisions.
-                
+        """
+
+    elif collection_name == "usc":
+        return """Search 21 USC (United States Code) legal provisions.
+
 **Use this tool for:**
 - Keywords: "21 USC", "U.S.C", "법률", "처벌", "penalties", "misbranding"
 - Legal definitions, prohibited acts, penalties
-                
+
 **DO NOT use for RPM Chapters/Sections!**
-                
+
 **Query must be in ENGLISH:**
 - "부정표시" → "misbranding false labeling"
 - "처벌" → "penalties violations sanctions"
-                """
-                
-            elif collection_name == "fsvp":
-                description = """Search Foreign Supplier Verification Program (FSVP) guidance.
-                
+        """
+
+    elif collection_name == "fsvp":
+        return """Search Foreign Supplier Verification Program (FSVP) guidance.
+
 **Use this tool for:**
 - Keywords: "FSVP", "수입자", "검증", "supplier verification", "importer"
 - Importer responsibilities, foreign supplier verification, FSVP compliance
-                
+
 **Query must be in ENGLISH:**
 - "수입자 의무" → "importer responsibilities verification requirements"
 - "검증 절차" → "verification procedures audit requirements"
-                
+
 **Covers:** 21 CFR 1.500-1.514, exemptions, recordkeeping
-                """
-                
-            elif collection_name == "guidance":
-                description = """Search FDA Guidance Documents and CPG.
-                
+        """
+
+    elif collection_name == "guidance":
+        return """Search FDA Guidance Documents and CPG.
+
 **Use this tool for:**
 - Keywords: "Guidance", "CPG", "가이드", "라벨링", "labeling", "allergen"
 - Policy interpretations, compliance recommendations, labeling requirements
-                
+
 **Query must be in ENGLISH:**
 - "라벨링 요구사항" → "labeling requirements"
 - "알레르기 표시" → "allergen declaration labeling"
-                
+
 **Can search by:** CPG document number (e.g., 'CPG 500.200')
-                """
-            
-            else:
-                description = f"Search {collection_name} collection"
+        """
+
+    else:
+        return f"Search {collection_name} collection"
+
+
+def _format_points(collection: str, points: list) -> str:
+    """검색 포인트를 ReAct 관찰(observation)용 짧은 텍스트로 변환 (요약 LLM 없음)"""
+    if not points:
+        return f"[{collection}] 결과 없음"
+    lines = []
+    for point in points[:TOOL_TOP_K]:
+        payload = point.payload or {}
+        text = " ".join(payload.get("text", "").split())
+        if len(text) > TOOL_CHUNK_CHARS:
+            text = text[:TOOL_CHUNK_CHARS] + "..."
+        lines.append(
+            f"[{collection}:{point.id}] ({point.score:.2f}) "
+            f"{payload.get('title', '')}\n{text}"
+        )
+    return "\n\n".join(lines)
+
+
+def _format_many(found: Dict, requests: List[Tuple[str, str]]) -> str:
+    collections = list(dict.fromkeys(collection for collection, _ in requests))
+    results_by_collection = found["results_by_collection"]
+    return "\n\n".join(
+        _format_points(collection, results_by_collection.get(collection, []))
+        for collection in collections
+    )
+
+
+def _parse_searches(
+    searches: List[str], default_query: str = ""
+) -> List[Tuple[str, str]]:
+    """["collection: query", ...] → [(컬렉션, 쿼리)] (알 수 없는 컬렉션은 제외)"""
+    requests = []
+    for search in searches or []:
+        collection, _, query = str(search).partition(":")
+        collection = collection.strip().lower()
+        query = query.strip() or default_query
+        if collection in actual_collections and query:
+            requests.append((collection, query))
+    return requests
+
+
+def _retrieval_tool(orchestrator, collection_name: str) -> FunctionTool:
+    """컬렉션 하나를 검색해 청크 원문을 돌려주는 툴"""
+
+    def search(query: str) -> str:
+        requests = [(collection_name, query)]
+        with tracing.span("tool", tool=collection_name):
+            return _format_many(
+                orchestrator.search_many(requests, timeout=TOOL_TIMEOUT), requests
+            )
+
+    async def asearch(query: str) -> str:
+        requests = [(collection_name, query)]
+        with tracing.span("tool", tool=collection_name):
+            return _format_many(
+                await orchestrator.asearch_many(requests, timeout=TOOL_TIMEOUT),
+                requests,
+            )
+
+    return FunctionTool.from_defaults(
+        fn=search,
+        async_fn=asearch,
+        name=collection_name,
+        description=_tool_description(collection_name),
+    )
+
+
+def _multi_search_tool(orchestrator) -> FunctionTool:
+    """여러 (컬렉션, 쿼리)를 한 번의 임베딩 + 컬렉션별 search_batch로 병렬 검색하는 툴"""
+
+    def multi_search(searches: List[str]) -> str:
+        requests = _parse_searches(searches)
+        if not requests:
+            return (
+                "searches 형식 오류: 'collection: query' "
+                f"(collection ∈ {actual_collections})"
+            )
+        with tracing.span("tool", tool="multi_search", searches=len(requests)):
+            return _format_many(
+                orchestrator.search_many(requests, timeout=TOOL_TIMEOUT), requests
+            )
+
+    async def amulti_search(searches: List[str]) -> str:
+        requests = _parse_searches(searches)
+        if not requests:
+            return (
+                "searches 형식 오류: 'collection: query' "
+                f"(collection ∈ {actual_collections})"
+            )
+        with tracing.span("tool", tool="multi_search", searches=len(requests)):
+            return _format_many(
+                await orchestrator.asearch_many(requests, timeout=TOOL_TIMEOUT),
+                requests,
+            )
+
+    return FunctionTool.from_defaults(
+        fn=multi_search,
+        async_fn=amulti_search,
+        name="multi_search",
+        description=MULTI_SEARCH_DESCRIPTION.format(
+            collections=", ".join(actual_collections)
+        ),
+    )
+
+
+def create_retrieval_tools(orchestrator) -> list:
+    """요약 LLM 없이 검색 청크를 그대로 돌려주는 툴 (컬렉션별 + multi_search)"""
+    tools = [
+        _retrieval_tool(orchestrator, collection_name)
+        for collection_name in actual_collections
+    ]
+    if TOOL_MULTI_SEARCH:
+        tools.append(_multi_search_tool(orchestrator))
+    return tools
+
+
+def create_fda_tools(orchestrator=None, mode: str = None):
+    """FDA 컬렉션별 툴 생성 (retrieval 모드는 orchestrator 필요)"""
+    mode = mode or TOOL_MODE
+    if mode == "retrieval" and orchestrator is not None:
+        return create_retrieval_tools(orchestrator)
+    return create_query_engine_tools()
+
+
+def create_query_engine_tools():
+    """FDA 컬렉션별 QueryEngineTool 생성 (강화된 description, 툴마다 gpt-4o-mini 요약)"""
+
+    client = QdrantClient(
+        url=os.getenv("QDRANT_URL"),
+        api_key=os.getenv("QDRANT_API_KEY"),
+        limits=http_limits(),  # keep-alive 커넥션 재사용
+    )
+
+    embed_model = CachedOpenAIEmbedding(model="text-embedding-3-small", dimensions=1536)
+
+    llm = OpenAI(model="gpt-4o-mini", temperature=0)
+
+    tools = []
+
+    for collection_name in actual_collections:
+        try:
+            vector_store = QdrantVectorStore(
+                client=client,
+                collection_name=collection_name
+            )
+            storage_context = StorageContext.from_defaults(vector_store=vector_store)
+            index = VectorStoreIndex.from_vector_store(
+                vector_store,
+                storage_context=storage_context,
+                embed_model=embed_model
+            )
+            query_engine = index.as_query_engine(
+                llm=llm,
+                similarity_top_k=5
+            )
             
             tool = QueryEngineTool.from_defaults(
                 query_engine=query_engine,
                 name=collection_name,
-                description=description
+                description=_tool_description(collection_name),
             )
             tools.append(tool)
             
         except Exception as e:
-            print(f"Warning: Could not create tool for {collection_name}: {e}")
+            logger.warning("Could not create tool for %s: %s", collection_name, e)
             continue
     
-    return tools
\ No newline at end of file
+    return tools
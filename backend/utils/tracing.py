@@ -0,0 +1,412 @@
+# utils/tracing.py
+"""
+요청별 단계 span 추적 (제품 추출, 분해, 증강, 분류, 임베딩, 컬렉션별 검색, 병합, 충분성, ReAct, 답변 생성)
+
+- 현재 trace와 부모 span은 contextvars로 전달한다. asyncio 태스크는 컨텍스트를 자동으로 복사하고,
+  스레드 풀에 넘기는 함수는 bind()로 감싸야 같은 trace에 붙는다.
+- trace가 없으면 span()/annotate()는 contextvar 조회 한 번만 하고 아무것도 기록하지 않는다.
+- 요청이 끝나면 설정된 sink로 내보낸다
+  - FDA_TRACE_PATH: 한 줄에 trace 하나씩 JSON Lines로 추가
+  - FDA_TRACE_OTEL=1: OpenTelemetry span으로 재생 (opentelemetry-sdk 필요,
+    OTLP exporter가 설치돼 있으면 OTEL_EXPORTER_OTLP_* 설정으로 전송, 없으면 콘솔 출력)
+
+FDA_TRACE=1이거나 listener(예: Prometheus 메트릭)가 등록돼 있으면 모든 요청을,
+아니면 collect(debug=True)로 요청한 경우(API의 debug_timings)만 기록한다.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from utils import log
+
+logger = log.get_logger(__name__)
+
+TRACE_ENABLED = os.getenv("FDA_TRACE", "0") == "1"
+TRACE_PATH = os.getenv("FDA_TRACE_PATH") or None
+TRACE_OTEL = os.getenv("FDA_TRACE_OTEL", "0") == "1"
+
+
+class Span:
+    """시작/종료 시각(perf_counter)과 속성을 가진 단계 하나"""
+
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attrs", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end = None
+        self.attrs = attrs
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+
+class _NoopSpan:
+    """trace가 없을 때 돌려주는 빈 span"""
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Trace:
+    """요청 하나의 span 목록 (여러 스레드/태스크에서 추가)"""
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attrs = attrs
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API debug_timings / JSON sink 형식 (시작 시각은 요청 시작 기준 ms)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "timestamp": self.wall_start,
+            "duration_ms": round(
+                ((self.end or time.perf_counter()) - self.start) * 1000, 2
+            ),
+            "attrs": self.attrs,
+            "spans": [
+                {
+                    "id": s.span_id,
+                    "parent": s.parent_id,
+                    "name": s.name,
+                    "start_ms": round((s.start - self.start) * 1000, 2),
+                    "duration_ms": round(s.duration_ms, 2),
+                    **({"error": s.error} if s.error else {}),
+                    **s.attrs,
+                }
+                for s in spans
+            ],
+        }
+
+
+class Collector:
+    """API 핸들러가 요청 trace를 돌려받는 통로 (debug=True면 FDA_TRACE=0이어도 기록)"""
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.trace: Optional[Trace] = None
+
+
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "fda_trace", default=None
+)
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "fda_span", default=None
+)
+_collector: contextvars.ContextVar[Optional[Collector]] = contextvars.ContextVar(
+    "fda_trace_collector", default=None
+)
+
+# 요청이 끝날 때마다 trace를 받는 함수 (메트릭 집계 등)
+_listeners: List[Callable[[Trace], None]] = []
+
+
+def add_listener(fn: Callable[[Trace], None]):
+    """완료된 요청 trace를 받을 함수 등록 (등록되면 모든 요청을 기록)"""
+    _listeners.append(fn)
+
+
+def active() -> bool:
+    return _trace.get() is not None
+
+
+@contextmanager
+def collect(debug: bool = False):
+    """요청 처리 구간을 감싸 에이전트가 만든 trace를 Collector.trace로 받는다"""
+    collector = Collector(debug)
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        if _reset_failed(_collector, token):
+            _collector.set(None)
+
+
+def _reset_failed(var: contextvars.ContextVar, token) -> bool:
+    """비동기 제너레이터가 다른 컨텍스트에서 정리될 때 reset이 실패하면 True"""
+    try:
+        var.reset(token)
+        return False
+    except ValueError:
+        return True
+
+
+@contextmanager
+def request(name: str, **attrs):
+    """요청 루트 trace (이미 trace 안이거나 기록 대상이 아니면 None)"""
+    collector = _collector.get()
+    if _trace.get() is not None or not (
+        TRACE_ENABLED or _listeners or (collector is not None and collector.debug)
+    ):
+        yield None
+        return
+    request_id = log.request_id()
+    if request_id is not None:
+        attrs.setdefault("request_id", request_id)  # 로그와 trace 연결
+    trace = Trace(name, attrs)
+    if collector is not None:
+        collector.trace = trace
+    trace_token, span_token = _trace.set(trace), _current.set(None)
+    try:
+        yield trace
+    finally:
+        trace.end = time.perf_counter()
+        if _reset_failed(_trace, trace_token):
+            _trace.set(None)
+        if _reset_failed(_current, span_token):
+            _current.set(None)
+        export(trace)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """현재 trace에 단계 span 추가 (trace가 없으면 no-op)"""
+    trace = _trace.get()
+    if trace is None:
+        yield _NOOP
+        return
+    parent = _current.get()
+    current = Span(name, parent.span_id if parent is not None else None, attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        trace.add(current)
+        if _reset_failed(_current, token):
+            _current.set(parent)
+
+
+def traced(name: str):
+    """함수/코루틴 함수 실행 구간을 span으로 기록하는 데코레이터"""
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _trace.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _trace.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def traced_request(name: str):
+    """요청 진입점(chat/achat/astream_chat)을 루트 trace로 감싸는 데코레이터"""
+
+    def decorator(fn):
+        if inspect.isasyncgenfunction(fn):
+
+            @functools.wraps(fn)
+            async def agen_wrapper(*args, **kwargs):
+                with request(name):
+                    async for item in fn(*args, **kwargs):
+                        yield item
+
+            return agen_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with request(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with request(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def annotate(**attrs):
+    """현재 span(span 밖이면 요청 trace)에 속성 추가 (trace가 없으면 no-op)"""
+    trace = _trace.get()
+    if trace is None:
+        return
+    current = _current.get()
+    if current is not None:
+        current.set(**attrs)
+    else:
+        trace.attrs.update(attrs)
+
+
+def annotate_tokens(prompt: str, completion: str = None, **attrs):
+    """현재 span에 프롬프트/응답 토큰 수 기록 (trace가 있을 때만 토큰 계산)"""
+    if _trace.get() is None:
+        return
+    from utils.context_builder import get_token_counter
+
+    counter = get_token_counter()
+    attrs["prompt_tokens"] = counter.count(prompt)
+    if completion is not None:
+        attrs["completion_tokens"] = counter.count(completion)
+    annotate(**attrs)
+
+
+def bind(fn):
+    """스레드 풀에 넘길 함수를 현재 컨텍스트(trace, 부모 span)에 묶는다"""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+# ---------------------------------------------------------------------------
+# sink
+# ---------------------------------------------------------------------------
+
+_sink_lock = threading.Lock()
+_otel_tracer = None
+_otel_failed = False
+
+
+def export(trace: Trace):
+    """요청 trace를 listener와 설정된 sink(JSON Lines, OpenTelemetry)로 내보낸다
+
+    실패해도 요청에는 영향 없음.
+    """
+    for listener in _listeners:
+        try:
+            listener(trace)
+        except Exception as e:
+            logger.warning("⚠️ trace listener 실패: %s", e)
+    if TRACE_PATH:
+        try:
+            line = json.dumps(trace.to_dict(), ensure_ascii=False, default=str)
+            with _sink_lock, open(TRACE_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except Exception as e:
+            logger.warning("⚠️ trace 저장 실패: %s", e)
+    if TRACE_OTEL:
+        _export_otel(trace)
+
+
+def _get_otel_tracer():
+    global _otel_tracer, _otel_failed
+    if _otel_tracer is not None or _otel_failed:
+        return _otel_tracer
+    with _sink_lock:
+        if _otel_tracer is not None or _otel_failed:
+            return _otel_tracer
+        try:
+            from opentelemetry import trace as otel_trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import (
+                BatchSpanProcessor,
+                ConsoleSpanExporter,
+            )
+
+            provider = otel_trace.get_tracer_provider()
+            if not isinstance(provider, TracerProvider):
+                # opentelemetry-instrument 등으로 이미 설정된 provider가 없으면 직접 구성
+                try:
+                    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                        OTLPSpanExporter,
+                    )
+
+                    exporter = OTLPSpanExporter()
+                except ImportError:
+                    exporter = ConsoleSpanExporter()
+                provider = TracerProvider(
+                    resource=Resource.create(
+                        {"service.name": os.getenv("OTEL_SERVICE_NAME", "fda-backend")}
+                    )
+                )
+                provider.add_span_processor(BatchSpanProcessor(exporter))
+                otel_trace.set_tracer_provider(provider)
+            _otel_tracer = provider.get_tracer("fda-agent")
+        except Exception as e:
+            logger.warning("⚠️ OpenTelemetry 내보내기 비활성화: %s", e)
+            _otel_failed = True
+    return _otel_tracer
+
+
+def _export_otel(trace: Trace):
+    """기록된 span을 실제 시작/종료 시각으로 OpenTelemetry span으로 재생"""
+    tracer = _get_otel_tracer()
+    if tracer is None:
+        return
+    from opentelemetry import trace as otel_trace
+
+    def to_ns(perf: float) -> int:
+        return int((trace.wall_start + (perf - trace.start)) * 1e9)
+
+    def attributes(attrs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            k: v if isinstance(v, (str, bool, int, float)) else str(v)
+            for k, v in attrs.items()
+        }
+
+    try:
+        root = tracer.start_span(
+            trace.name,
+            start_time=to_ns(trace.start),
+            attributes=attributes(trace.attrs),
+        )
+        contexts = {None: otel_trace.set_span_in_context(root)}
+        for s in sorted(trace.spans, key=lambda s: s.start):
+            otel_span = tracer.start_span(
+                s.name,
+                context=contexts.get(s.parent_id, contexts[None]),
+                start_time=to_ns(s.start),
+                attributes=attributes(s.attrs),
+            )
+            if s.error:
+                otel_span.set_status(
+                    otel_trace.Status(otel_trace.StatusCode.ERROR, s.error)
+                )
+            contexts[s.span_id] = otel_trace.set_span_in_context(otel_span)
+            otel_span.end(end_time=to_ns(s.end or trace.end))
+        root.end(end_time=to_ns(trace.end or time.perf_counter()))
+    except Exception as e:
+        logger.warning("⚠️ OpenTelemetry 내보내기 실패: %s", e)
@@ -98,6 +98,25 @@ const CitationsList = ({ citations }) => {
                     {citation.title}
                   </span>
                 )}
+
+                {/* 같은 내용으로 병합된 다른 컬렉션 문서 */}
+                {citation.also_in && citation.also_in.length > 0 && (
+                  <div className="mt-1 flex flex-wrap items-center gap-1 text-xs text-gray-500">
+                    <span>동일 내용:</span>
+                    {citation.also_in.map((duplicate, i) => (
+                      <a
+                        key={i}
+                        href={duplicate.url || undefined}
+                        target="_blank"
+                        rel="noopener noreferrer"
+                        title={duplicate.title}
+                        className={`px-1.5 py-0.5 rounded-full ${getCollectionBadgeColor(duplicate.collection)}`}
+                      >
+                        {duplicate.collection}
+                      </a>
+                    ))}
+                  </div>
+                )}
               </div>
             </div>
           ))}